@@ -0,0 +1,288 @@
+# This will work if ran from the root folder
+# Joel Khayat and Allan Pariente
+"""
+Solves a batch of grids with one solver, over several processes.
+
+The grids are given as files (.in text grids or .bin binary grids), folders (every .in file of the folder) or glob patterns.
+Each result is written as a JSON line (file, solver, status, score, pairs, elapsed, cached, ...) as soon as its grid is solved, whatever the order of the grids.
+With a cache (a SQLite file, see SolutionCache), a grid which has already been solved by the same solver is not solved again.
+With bounds, the lower bound and the greedy upper bound of bounds.py are computed first: the optimality gap (score - lower bound) is reported,
+and an exact solver is not run when both bounds are equal (the greedy solution is then optimal).
+Each grid has a timeout, and an error on a grid is recorded in its result (status "timeout", "error: ..." or "crashed: ...") without stopping the other grids.
+
+The grids are sent by chunks to worker processes, which send back each result as soon as it is known. The timeout uses SIGALRM in the worker
+(not available on Windows), which stops the Python code of a solver. A long call to a compiled library (numpy, scipy) is only interrupted when
+it returns, so the main process also kills a worker which has not answered KILL_DELAY seconds after the timeout. A worker which dies
+(out of memory, segmentation fault, ...) does not stop the batch either: its current grid is recorded as "crashed", and the rest of its chunk
+is given to a new worker.
+
+Usage examples (from the root folder):
+    python code/batch_solve.py input --solver greedy
+    python code/batch_solve.py "grids/*.bin" --solver min_cost_matching --workers 8 --timeout 30 --output results.jsonl
+    python code/batch_solve.py input --cache solutions.sqlite --bounds
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from grid import Grid
+from solver import SOLVERS, EXACT_SOLVERS
+from solution_cache import SolutionCache
+from bounds import score_bounds
+
+# The caches opened by the current process (a SQLite connection cannot be shared between processes)
+CACHES = {}
+
+# Delay (in seconds) after the timeout of a grid before its worker is killed by the main process
+KILL_DELAY = 2.0
+
+class GridTimeout(Exception):
+    "raised in a worker when the solver exceeds the timeout of a grid"
+
+def raise_timeout(signum, frame):
+    raise GridTimeout()
+
+def find_grid_files(paths):
+    """
+    Parameters:
+    -----------
+    paths: list[str]
+        Grid files, folders or glob patterns
+
+    Output:
+    -------
+    list[str]
+        The grid files, without duplicates (a folder gives its .in files, sorted)
+    """
+    file_names = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_names += sorted(glob.glob(os.path.join(path, "*.in")))
+        elif os.path.isfile(path):
+            file_names.append(path)
+        else:
+            file_names += sorted(glob.glob(path))
+    return list(dict.fromkeys(file_names))
+
+def load_grid(file_name):
+    "reads a binary grid (.bin) or a text grid with its values"
+    if file_name.endswith(".bin"):
+        return Grid.grid_from_binary_file(file_name)
+    return Grid.grid_from_file(file_name, read_values=True)
+
+def open_cache(path):
+    "returns the SolutionCache of the current process for the database path"
+    if path not in CACHES:
+        CACHES[path] = SolutionCache(path)
+    return CACHES[path]
+
+def solve_grid(grid, solver_name, result, bounds=False):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+    solver_name: str
+        A key of SOLVERS
+    result: dict
+        The result of the grid, whose keys lower_bound, gap and skipped are updated when bounds is True
+    bounds: bool
+        Whether to compute the bounds of the score first
+
+    Output:
+    -------
+    tuple (pairs, score)
+    """
+    if not bounds:
+        return SOLVERS[solver_name](grid).run()
+    lower, upper, greedy_pairs = score_bounds(grid)
+    result["lower_bound"] = lower
+    if lower == upper and solver_name in EXACT_SOLVERS:
+        result["skipped"] = True
+        return greedy_pairs, upper
+    return SOLVERS[solver_name](grid).run()
+
+def new_result(file_name, solver_name, status="ok"):
+    "returns the result of a grid which has not been solved yet (see solve_file)"
+    return {"file": file_name, "solver": solver_name, "status": status, "score": None, "pairs": None, "elapsed": None, "cached": False,
+            "lower_bound": None, "gap": None, "skipped": False}
+
+def solve_file(file_name, solver_name, timeout=None, cache_path=None, bounds=False):
+    """
+    Parameters:
+    -----------
+    file_name: str
+    solver_name: str
+        A key of SOLVERS
+    timeout: float
+        Maximum time (in seconds) to read and solve the grid (None: no timeout)
+    cache_path: str
+        The SQLite database of a SolutionCache (None: no cache)
+    bounds: bool
+        Whether to compute the bounds of the score before solving (see solve_grid)
+
+    Output:
+    -------
+    dict
+        The result, with the keys file, solver, status ("ok", "timeout" or "error: ...", and "crashed: ..." in batch_solve), score, pairs (number of pairs), elapsed (in seconds),
+        cached (True if the solution comes from the cache), and with bounds lower_bound, gap (score - lower_bound) and skipped
+        (True if the exact solver was not run because the greedy solution is optimal)
+    """
+    result = new_result(file_name, solver_name)
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    start_time = time.perf_counter()
+    try:
+        previous_handler = signal.signal(signal.SIGALRM, raise_timeout) if use_alarm else None
+        try:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            grid = load_grid(file_name)
+            if cache_path is None:
+                pairs, score = solve_grid(grid, solver_name, result, bounds)
+            else:
+                cache = open_cache(cache_path)
+                key = cache.key(grid, solver_name) # before the solver, which may remove cells of the grid
+                solution = cache.get(grid, solver_name, key)
+                result["cached"] = solution is not None
+                if solution is None:
+                    solution = solve_grid(grid, solver_name, result, bounds)
+                    cache.put(grid, solver_name, *solution, key)
+                pairs, score = solution
+            result["score"], result["pairs"] = int(score), len(pairs)
+            if result["lower_bound"] is not None:
+                result["gap"] = result["score"] - result["lower_bound"]
+        finally:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+    except GridTimeout:
+        result["status"] = "timeout"
+    except Exception as error:
+        result["status"] = f"error: {error}"
+    result["elapsed"] = time.perf_counter() - start_time
+    return result
+
+def solve_chunk(file_names, connection, options):
+    "solves the grids one after the other (in a worker process), and sends each result through connection"
+    for file_name in file_names:
+        connection.send(solve_file(file_name, **options))
+    connection.close()
+
+def batch_solve(file_names, solver_name, workers=None, chunksize=None, timeout=None, cache_path=None, bounds=False, context=None):
+    """
+    Parameters:
+    -----------
+    file_names: list[str]
+    solver_name: str
+        A key of SOLVERS
+    workers: int
+        Number of processes (default: number of CPUs)
+    chunksize: int
+        Number of grids sent at once to a process (default: about 4 chunks per process)
+    timeout: float
+        Timeout of each grid, in seconds
+    cache_path: str
+        The SQLite database of a SolutionCache shared by the processes (None: no cache)
+    bounds: bool
+        Whether to compute the bounds of the score before solving (see solve_grid)
+    context: multiprocessing context
+        The context which starts the worker processes (default: the default start method of multiprocessing)
+
+    Output:
+    -------
+    Generator of the results of solve_file, in the order in which the grids are solved.
+    A grid whose worker died has the status "crashed: exit code ...", and a grid whose worker had to be killed has the status "timeout".
+    """
+    context = context or multiprocessing.get_context()
+    workers = workers or os.cpu_count() or 1
+    chunksize = chunksize or max(1, len(file_names) // (4 * workers))
+    options = {"solver_name": solver_name, "timeout": timeout, "cache_path": cache_path, "bounds": bounds}
+    chunks = deque(file_names[start:start + chunksize] for start in range(0, len(file_names), chunksize))
+    running = {} # for each receiver of a worker: [process, the grids of its chunk which are not solved yet, deadline of its current grid]
+
+    def stop(receiver, status):
+        "stops the worker of receiver, gives the end of its chunk to a new worker, and returns the result of its current grid"
+        process, remaining, _ = running.pop(receiver)
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+        file_name = remaining.popleft()
+        if remaining:
+            chunks.appendleft(list(remaining))
+        return new_result(file_name, solver_name, status if status != "crashed" else f"crashed: exit code {process.exitcode}")
+
+    try:
+        while chunks or running:
+            while chunks and len(running) < workers:
+                receiver, sender = context.Pipe(duplex=False)
+                chunk = chunks.popleft()
+                process = context.Process(target=solve_chunk, args=(chunk, sender, options))
+                process.start()
+                sender.close()
+                running[receiver] = [process, deque(chunk), None if timeout is None else time.monotonic() + timeout + KILL_DELAY]
+
+            deadlines = [worker[2] for worker in running.values() if worker[2] is not None]
+            wait_time = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            for receiver in wait(list(running), wait_time):
+                try:
+                    result = receiver.recv()
+                except EOFError: # the worker died without sending the result of its current grid
+                    yield stop(receiver, "crashed")
+                    continue
+                process, remaining, _ = running[receiver]
+                remaining.popleft()
+                yield result
+                if remaining:
+                    running[receiver][2] = None if timeout is None else time.monotonic() + timeout + KILL_DELAY
+                else:
+                    del running[receiver]
+                    process.join()
+                    receiver.close()
+
+            now = time.monotonic()
+            for receiver in [receiver for receiver, worker in running.items() if worker[2] is not None and worker[2] <= now]:
+                yield stop(receiver, "timeout")
+    finally:
+        # the generator may be closed before the end
+        for process, _, _ in running.values():
+            if process.is_alive():
+                process.kill()
+            process.join()
+
+def main():
+    parser = argparse.ArgumentParser(description="Solves a batch of grids over several processes, and writes the results as JSON lines.")
+    parser.add_argument("paths", nargs="+", help="grid files (.in or .bin), folders or glob patterns")
+    parser.add_argument("--solver", default="min_cost_matching", choices=list(SOLVERS))
+    parser.add_argument("--workers", type=int, help="number of processes (default: number of CPUs)")
+    parser.add_argument("--chunksize", type=int, help="number of grids sent at once to a process")
+    parser.add_argument("--timeout", type=float, help="timeout of each grid, in seconds")
+    parser.add_argument("--cache", help="SQLite file of the solution cache (default: no cache)")
+    parser.add_argument("--bounds", action="store_true", help="compute the bounds of the score first, and skip the exact solvers when the greedy solution is optimal")
+    parser.add_argument("--output", help="JSON lines file of the results (default: standard output)")
+    args = parser.parse_args()
+
+    file_names = find_grid_files(args.paths)
+    output = open(args.output, "w") if args.output else sys.stdout
+    statuses, cache_hits = {}, 0
+    try:
+        for result in batch_solve(file_names, args.solver, args.workers, args.chunksize, args.timeout, args.cache, args.bounds):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            status = result["status"].split(":")[0]
+            statuses[status] = statuses.get(status, 0) + 1
+            cache_hits += result["cached"]
+    finally:
+        if args.output:
+            output.close()
+    print(f"{len(file_names)} grids:", ", ".join(f"{count} {status}" for status, count in statuses.items()), file=sys.stderr)
+    if args.cache:
+        print(f"{cache_hits} cache hits, {len(file_names) - cache_hits} misses", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
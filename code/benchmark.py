@@ -0,0 +1,211 @@
+# This will work if ran from the root folder
+# Joel Khayat and Allan Pariente
+"""
+Benchmark of the solvers over the grids of the input/ folder.
+
+For each solver and each grid, the wall time, the peak memory (measured with tracemalloc) and the score are recorded, and written to a JSON or CSV file.
+Each run is done in a separate process, so that a solver which does not finish before its timeout (for instance the dense Ford-Fulkerson or Hungarian
+algorithms on the 100x200 grids) is stopped cleanly, and a solver which crashes (out of memory, ...) is recorded as such. The peak memory is measured
+in a second run, as tracemalloc slows down the solvers. The results can be compared with a previous run (the baseline) to detect regressions.
+
+Usage examples (from the root folder):
+    python code/benchmark.py --output bench.json
+    python code/benchmark.py --solvers greedy min_cost_matching --grids input/grid1*.in --baseline bench.json --threshold 0.2
+    python code/benchmark.py --solvers hungarian_scipy --profile profile.jsonl (time of each phase of the solves, see profiling.py)
+"""
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import time
+import tracemalloc
+from grid import Grid
+from solver import SOLVERS
+import profiling
+
+# Default timeouts (in seconds) of each solver, the dense ones cannot finish on the largest grids
+DEFAULT_TIMEOUTS = {
+    "greedy": 60,
+    "max_matching": 120,
+    "hungarian": 120,
+    "hungarian_scipy": 120,
+    "min_cost_matching": 60,
+}
+
+FIELDS = ["solver", "grid", "n", "m", "status", "time", "peak_memory", "score"]
+
+def run_solver(solver_name, file_name, measure_memory, connection, profile=None):
+    """
+    Parameters:
+    -----------
+    solver_name: str
+    file_name: str
+    measure_memory: bool
+    connection: multiprocessing.connection.Connection
+    profile: str
+        A JSON lines file to which the profiling report of the solver is appended (None: no profiling)
+
+    Runs the solver on the grid (in a child process) and sends the result through connection. With measure_memory, the time is slowed down by tracemalloc.
+    """
+    result = {"solver": solver_name, "grid": file_name, "n": None, "m": None, "status": "ok", "time": None, "peak_memory": None, "score": None}
+    try:
+        grid = Grid.grid_from_file(file_name, read_values=True)
+        result["n"], result["m"] = grid.n, grid.m
+        if profile is not None:
+            profiling.enable(sink=profile, measure_memory=False)
+        if measure_memory:
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        pairs, score = SOLVERS[solver_name](grid).run()
+        result["time"] = time.perf_counter() - start_time
+        if measure_memory:
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        result["score"] = int(score)
+    except Exception as error:
+        result["status"] = f"error: {error}"
+    connection.send(result)
+    connection.close()
+
+def run_in_process(solver_name, file_name, timeout, measure_memory=False, profile=None, context=None):
+    """
+    Runs run_solver in a child process (started by the multiprocessing context, default: the default one), and returns its result: the status is "timeout" if the solver does not finish before timeout (in seconds),
+    and "crashed: exit code ..." if the process dies without sending its result.
+    """
+    context = context or multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=run_solver, args=(solver_name, file_name, measure_memory, sender, profile))
+    process.start()
+    sender.close()
+    result = {"solver": solver_name, "grid": file_name, "n": None, "m": None, "status": "timeout", "time": None, "peak_memory": None, "score": None}
+    if receiver.poll(timeout): # also True when the process has died (the pipe is closed)
+        try:
+            result = receiver.recv()
+        except EOFError:
+            process.join()
+            result["status"] = f"crashed: exit code {process.exitcode}"
+    process.terminate()
+    process.join()
+    receiver.close()
+    return result
+
+def benchmark(solver_names, file_names, timeouts, measure_memory=True, profile=None, context=None):
+    """
+    Parameters:
+    -----------
+    solver_names: list[str]
+    file_names: list[str]
+    timeouts: dict[str, float]
+        The timeout (in seconds) of each solver
+    measure_memory: bool
+        Whether to measure the peak memory, in a second run of each successful solve (tracemalloc slows down the solvers)
+    profile: str
+        A JSON lines file to which the profiling reports of the solvers are appended (None: no profiling)
+    context: multiprocessing context
+        The context which starts the child processes (default: the default start method of multiprocessing)
+
+    Output:
+    -------
+    list[dict]
+        One result per solver and grid, with the keys of FIELDS. The status is "ok", "timeout", "error: ..." or "crashed: ..."
+    """
+    results = []
+    for file_name in file_names:
+        for solver_name in solver_names:
+            result = run_in_process(solver_name, file_name, timeouts[solver_name], profile=profile, context=context)
+            if measure_memory and result["status"] == "ok":
+                result["peak_memory"] = run_in_process(solver_name, file_name, timeouts[solver_name], measure_memory=True, context=context)["peak_memory"]
+            print(f"{solver_name:<20}{file_name:<20}{result['status']:<10}{format_number(result['time'], '.4f'):>10}{format_number(result['score'], 'd'):>10}", flush=True)
+            results.append(result)
+    return results
+
+def format_number(number, format_spec):
+    "formats a number, or returns '-' if it is None"
+    return "-" if number is None else format(number, format_spec)
+
+def write_results(results, file_name):
+    "writes the results in a JSON file, or a CSV file if file_name ends with .csv"
+    with open(file_name, "w", newline="") as file:
+        if file_name.endswith(".csv"):
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        else:
+            json.dump(results, file, indent=1)
+
+def read_results(file_name):
+    "reads results written by write_results"
+    with open(file_name, "r", newline="") as file:
+        if file_name.endswith(".csv"):
+            results = list(csv.DictReader(file))
+            for result in results:
+                for key in ["n", "m", "score"]:
+                    result[key] = int(result[key]) if result[key] else None
+                for key in ["time", "peak_memory"]:
+                    result[key] = float(result[key]) if result[key] else None
+            return results
+        return json.load(file)
+
+def compare(results, baseline, threshold, min_delta=0.01):
+    """
+    Parameters:
+    -----------
+    results: list[dict]
+    baseline: list[dict]
+    threshold: float
+        The relative slowdown above which a run is flagged (0.2 means 20% slower than the baseline)
+    min_delta: float
+        Slowdowns of less than min_delta seconds are ignored (measurement noise)
+
+    Output:
+    -------
+    list[str]
+        The description of the regressions: slower runs, different scores, and runs that do not succeed anymore.
+    """
+    baseline = {(result["solver"], result["grid"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        key = (result["solver"], result["grid"])
+        if key not in baseline or baseline[key]["status"] != "ok":
+            continue
+        reference = baseline[key]
+        if result["status"] != "ok":
+            regressions.append(f"{key[0]} on {key[1]}: {result['status']} (baseline ok)")
+        elif result["score"] != reference["score"]:
+            regressions.append(f"{key[0]} on {key[1]}: score {result['score']} instead of {reference['score']}")
+        elif result["time"] > reference["time"] * (1 + threshold) and result["time"] - reference["time"] > min_delta:
+            regressions.append(f"{key[0]} on {key[1]}: {result['time']:.4f}s instead of {reference['time']:.4f}s")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the solvers over the grids.")
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("--grids", nargs="+", default=sorted(glob.glob("input/grid*.in")), help="grid files (default: input/grid*.in)")
+    parser.add_argument("--timeout", type=float, help="timeout (in seconds) of every solver, instead of the default ones")
+    parser.add_argument("--solver-timeout", nargs="+", default=[], metavar="SOLVER=SECONDS", help="timeout of some solvers")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure the peak memory (faster)")
+    parser.add_argument("--output", help="file (.json or .csv) where the results are written")
+    parser.add_argument("--baseline", help="results of a previous run (.json or .csv) to compare with")
+    parser.add_argument("--profile", help="JSON lines file where the profiling report of each solve is appended")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown flagged as a regression (default: 0.2)")
+    args = parser.parse_args()
+
+    timeouts = {name: args.timeout or DEFAULT_TIMEOUTS.get(name, 60) for name in SOLVERS}
+    for option in args.solver_timeout:
+        name, seconds = option.split("=")
+        timeouts[name] = float(seconds)
+
+    results = benchmark(args.solvers, args.grids, timeouts, measure_memory=not args.no_memory, profile=args.profile)
+    if args.output:
+        write_results(results, args.output)
+    if args.baseline:
+        regressions = compare(results, read_results(args.baseline), args.threshold)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        if regressions:
+            raise SystemExit(1)
+        print("No regression")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# This will work if ran from the root folder
+# Joel Khayat and Allan Pariente
+"""
+Benchmark of the construction of the graph of SolverMaxMatching: the former quadratic construction (each pair of nodes tested against all_pairs)
+is compared with the current one (a single call to all_pairs_flat, the nodes being computed from the flat indices of the cells).
+
+Usage: python code/benchmark_max_matching.py [grid files]
+"""
+import sys
+import time
+from grid import Grid
+from solver import SolverMaxMatching
+from ford_fulkerson_algo import Graph
+
+def old_construction(grid):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+
+    Output:
+    -------
+    Graph
+
+    The former construction of SolverMaxMatching.__init__, kept as a reference: O(N² · P).
+    """
+    nodes = [(-1,-1)] + [(i,j) for j in range(grid.m) for i in range(grid.n)] + [(grid.n, grid.m)]
+    edges = []
+    for i in range(1,len(nodes)-1):
+        if (nodes[i][0] + nodes[i][1])%2 == 0:
+            edges.append((0,i,1))
+        else:
+            edges.append((i,len(nodes)-1,1))
+    for i in range(1,len(nodes)-1):
+        for j in range(1,len(nodes)-1):
+            if (nodes[i],nodes[j]) in grid.all_pairs():
+                if (nodes[i][0] + nodes[i][1])%2 == 0:
+                    edges.append((i,j,1))
+                if (nodes[j][0] + nodes[j][1])%2 == 0:
+                    edges.append((j,i,1))
+    return Graph(len(nodes), edges)
+
+def timing(function, grid):
+    "returns the time (in seconds) taken by function(grid)"
+    start_time = time.perf_counter()
+    function(grid)
+    return time.perf_counter() - start_time
+
+if __name__ == "__main__":
+    file_names = sys.argv[1:] or ["input/grid02.in", "input/grid04.in", "input/grid05.in", "input/grid11.in"]
+    print(f"{'grid':<20}{'size':>10}{'old (s)':>12}{'new (s)':>12}{'speedup':>10}")
+    for file_name in file_names:
+        grid = Grid.grid_from_file(file_name, read_values=True)
+        old_time = timing(old_construction, grid)
+        new_time = timing(SolverMaxMatching, grid)
+        print(f"{file_name:<20}{f'{grid.n}x{grid.m}':>10}{old_time:>12.4f}{new_time:>12.4f}{old_time/new_time:>10.0f}")
@@ -0,0 +1,87 @@
+# Joel Khayat and Allan Pariente
+import numpy as np
+from grid import pairs_from_flat
+
+class BipartiteProblem:
+    """
+    Attributes:
+    -----------
+    grid: Grid
+    even_cells: np.ndarray[int]
+        The flat indices i*m + j of the even cells (i + j even) which are in a pair: the rows of the problem
+    odd_cells: np.ndarray[int]
+        The flat indices of the odd cells which are in a pair: the columns of the problem
+    rows, columns: np.ndarray[int]
+        The row and the column of each pair of Grid.all_pairs (the edges of the bipartite graph)
+    costs: np.ndarray[int]
+        The cost of each edge: choosing the pair changes the score by |value1 - value2| - value1 - value2
+
+    The bipartite matching problem of a grid (the even cells against the odd cells), built at once with NumPy from Grid.all_pairs_flat,
+    as a dense cost matrix (for SolverHungarian and linear_sum_assignment) or as a sparse matrix (for min_weight_full_bipartite_matching).
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        pairs = grid.all_pairs_flat().astype(np.int64)
+        first_is_even = (pairs[:, 0] // grid.m + pairs[:, 0] % grid.m) % 2 == 0
+        even = np.where(first_is_even, pairs[:, 0], pairs[:, 1])
+        odd = np.where(first_is_even, pairs[:, 1], pairs[:, 0])
+        self.even_cells, self.rows = np.unique(even, return_inverse=True)
+        self.odd_cells, self.columns = np.unique(odd, return_inverse=True)
+        values = grid.value_array.ravel().astype(np.int64)
+        self.costs = np.abs(values[even] - values[odd]) - values[even] - values[odd]
+
+    @property
+    def shape(self):
+        return len(self.even_cells), len(self.odd_cells)
+
+    def dense_matrix(self):
+        """
+        Returns the cost matrix of shape (number of even cells, number of odd cells), where the pairs which do not exist cost 0 (as not choosing them).
+        """
+        cost_matrix = np.zeros(self.shape, dtype=np.int64)
+        cost_matrix[self.rows, self.columns] = self.costs
+        return cost_matrix
+
+    def sparse_matrix(self):
+        """
+        Returns a sparse matrix for min_weight_full_bipartite_matching, of shape (number of even cells, number of odd cells + number of even cells).
+        Each row i has a dummy column (number of odd cells + i), which means that the even cell stays unmatched, so that every row can be matched.
+        As every row is matched exactly once, the same constant is added to all the weights to make them positive (the zero weights would be missing edges).
+        """
+        from scipy.sparse import csr_matrix # scipy is not needed by the dense matrix
+        num_rows, num_columns = self.shape
+        shift = 1 - min(0, self.costs.min(initial=0))
+        rows = np.concatenate([self.rows, np.arange(num_rows)])
+        columns = np.concatenate([self.columns, num_columns + np.arange(num_rows)])
+        weights = np.concatenate([self.costs, np.zeros(num_rows, dtype=np.int64)]) + shift
+        return csr_matrix((weights, (rows, columns)), shape=(num_rows, num_columns + num_rows))
+
+    def flat_pairs(self, row_indices, column_indices):
+        """
+        Parameters:
+        -----------
+        row_indices, column_indices: np.ndarray[int]
+            An assignment (as returned by linear_sum_assignment), which may use dummy columns or pairs which do not exist
+
+        Output:
+        -------
+        np.ndarray[int]
+            Array of shape (k, 2): the flat indices (even cell, odd cell) of the pairs of the assignment which exist and have a non zero cost
+        """
+        row_indices, column_indices = np.asarray(row_indices, dtype=np.int64), np.asarray(column_indices, dtype=np.int64)
+        num_columns = self.shape[1]
+        real = column_indices < num_columns # not a dummy column
+        row_indices, column_indices = row_indices[real], column_indices[real]
+        if len(self.costs) == 0 or len(row_indices) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        # the cost of each chosen pair, found by a binary search in the sorted edges (0 if the pair does not exist)
+        edges = self.rows * num_columns + self.columns
+        order = np.argsort(edges)
+        chosen = row_indices * num_columns + column_indices
+        position = np.minimum(np.searchsorted(edges[order], chosen), len(edges) - 1)
+        costs = np.where(edges[order][position] == chosen, self.costs[order][position], 0)
+        return np.stack([self.even_cells[row_indices[costs != 0]], self.odd_cells[column_indices[costs != 0]]], axis=1)
+
+    def pairs(self, row_indices, column_indices):
+        "same as flat_pairs, but returns the pairs ((even cell), (odd cell)) as tuples"
+        return pairs_from_flat(self.flat_pairs(row_indices, column_indices), self.grid.m)
@@ -0,0 +1,160 @@
+# Joel Khayat and Allan Pariente
+"""
+Cheap bounds on the best score of a grid, computed before an exact solve (a few hundred passes over the pairs, with NumPy).
+
+Taking a pair ((i1, j1), (i2, j2)) changes the score by |value1 - value2| - value1 - value2, so the best score is the sum of the values of the free cells
+minus the weight of a maximum weight matching, where the weight of a pair is its gain value1 + value2 - |value1 - value2| = 2 min(value1, value2)
+(the costs of SolverHungarian). The relaxation is the dual of the matching problem: if each cell c has a weight y[c] >= 0 with y[c1] + y[c2] >= gain
+for each pair, every matching weighs at most sum(y), which gives a lower bound on the score. As the grid is bipartite (each pair has exactly one cell with i + j even), such weights
+are found in linear time: the largest gain of the pairs of each even cell (0 for the odd cells), or the values of the odd cells and then, for the even
+cells, the smallest weights which cover their pairs (and the same with even and odd exchanged).
+These covers are loose on the large grids (on grid21, a lower bound of 752 for a best score of 1686), so they are then improved by a subgradient method
+on the Lagrangian relaxation of the constraint "each odd cell is in one pair at most": for prices p[c] >= 0 of the odd cells, each even cell takes
+the pair of largest gain - p, and the sum of these reduced gains plus sum(p) bounds the matching (it is the dual weights above, with y = p on the
+odd cells). The prices of the odd cells chosen twice increase, those of the odd cells chosen by no even cell decrease. As the matching problem is
+bipartite, its relaxation is exact, and a few hundred steps are usually enough to reach the best score within a few units.
+Any solution, for instance the one of SolverGreedy, gives an upper bound. When both are equal, the greedy solution is optimal, and the exact solvers
+can be skipped (see batch_solve). This only happens when the greedy solution is optimal, which is common on the small grids but not on the large ones,
+where the bounds are still useful to report the optimality gap.
+"""
+import numpy as np
+from grid import Grid
+from solver import SolverGreedy
+
+# Maximum number of steps of the subgradient method of matching_gain_bound
+ROUNDS = 300
+
+def covering_weights(cells, gains, other_weights, num_cells):
+    """
+    Returns the smallest weights y >= 0 of cells (indexed by flat index) such that y[cells[k]] + other_weights[k] >= gains[k] for each pair k.
+    """
+    weights = np.zeros(num_cells, dtype=np.int64)
+    np.maximum.at(weights, cells, gains - other_weights)
+    return weights
+
+def lagrangian_gain_bound(even_cells, odd_cells, gains, num_cells, rounds=ROUNDS, target=0):
+    """
+    Parameters:
+    -----------
+    even_cells, odd_cells: np.ndarray[int]
+        The even cell and the odd cell (flat indices) of each pair
+    gains: np.ndarray[int]
+        The gain of each pair
+    num_cells: int
+    rounds: int
+        Maximum number of steps of the subgradient method
+    target: int
+        The gain of a known matching: the method stops when the bound proves it optimal, and it is used to choose the steps
+
+    Output:
+    -------
+    float
+        The smallest value of the Lagrangian relaxation (see the docstring of the module) found in rounds steps, an upper bound on the total gain
+    """
+    order = np.argsort(even_cells, kind="stable")
+    even_cells, odd_cells, gains = even_cells[order], odd_cells[order], gains[order].astype(np.float64)
+    starts = np.flatnonzero(np.r_[True, even_cells[1:] != even_cells[:-1]])
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(even_cells)]))
+    prices = np.zeros(num_cells)
+    best, step_scale, stalled = np.inf, 2.0, 0
+    for _ in range(rounds):
+        reduced_gains = gains - prices[odd_cells]
+        largest = np.maximum.reduceat(reduced_gains, starts)
+        bound = np.maximum(largest, 0).sum() + prices.sum()
+        if bound < best - 1e-9:
+            best, stalled = bound, 0
+        else:
+            stalled += 1
+            if stalled >= 5: # the steps are too large
+                step_scale, stalled = step_scale / 2, 0
+        if np.floor(best + 1e-6 * max(1.0, best)) <= target or step_scale < 1e-3:
+            break
+        # the odd cell chosen by each even cell with a positive reduced gain
+        chosen = np.flatnonzero((reduced_gains == largest[segment]) & (largest[segment] > 0))
+        chosen = chosen[np.unique(segment[chosen], return_index=True)[1]]
+        gradient = 1.0 - np.bincount(odd_cells[chosen], minlength=num_cells)
+        gradient[(prices <= 0) & (gradient > 0)] = 0 # the prices stay non negative
+        norm = (gradient ** 2).sum()
+        if norm == 0: # each odd cell is chosen once at most: the bound is the best matching
+            break
+        prices = np.maximum(0, prices - step_scale * (bound - target) / norm * gradient)
+    return best
+
+def matching_gain_bound(grid, rounds=ROUNDS, target=0):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+    rounds: int
+        Maximum number of steps of the subgradient method (0: only the covers)
+    target: int
+        The gain of a known matching, if any (see lagrangian_gain_bound)
+
+    Output:
+    -------
+    int
+        An upper bound on the total gain of the pairs of any solution
+    """
+    pairs = grid.all_pairs_flat().astype(np.intp)
+    if len(pairs) == 0:
+        return 0
+    values = grid.value_array.ravel().astype(np.int64)
+    num_cells = grid.n * grid.m
+    gains = 2 * np.minimum(values[pairs[:, 0]], values[pairs[:, 1]])
+    rows, columns = np.divmod(pairs[:, 0], grid.m)
+    first_is_even = (rows + columns) % 2 == 0
+    even_cells = np.where(first_is_even, pairs[:, 0], pairs[:, 1])
+    odd_cells = np.where(first_is_even, pairs[:, 1], pairs[:, 0])
+
+    bounds = []
+    for cells, other_cells in [(even_cells, odd_cells), (odd_cells, even_cells)]:
+        # only the cells of one side have a weight
+        bounds.append(int(covering_weights(cells, gains, 0, num_cells).sum()))
+        # the cells of the other side weigh their value, then the weights of each side are lowered as much as possible
+        other_weights = values[other_cells]
+        weights = covering_weights(cells, gains, other_weights, num_cells)
+        other_weights = covering_weights(other_cells, gains, weights[cells], num_cells)
+        bounds.append(int(weights.sum() + other_weights.sum()))
+    if rounds > 0:
+        # the gains are integers, the tolerance covers the rounding errors of the sums of floats
+        bound = lagrangian_gain_bound(even_cells, odd_cells, gains, num_cells, rounds, target)
+        bounds.append(int(np.floor(bound + 1e-6 * max(1.0, bound))))
+    return min(bounds)
+
+def free_value(grid):
+    "returns the sum of the values of the cells which are not black and not removed (the score when no pair is taken)"
+    return int(grid.value_array[~grid.forbidden_mask()].sum(dtype=np.int64))
+
+def lower_bound(grid, rounds=ROUNDS, score=None):
+    """
+    Returns a lower bound on the best score of the grid. With the score of a known solution, the subgradient method stops as soon as it proves
+    this solution optimal.
+    """
+    free = free_value(grid)
+    target = 0 if score is None else free - score
+    return free - matching_gain_bound(grid, rounds, target)
+
+def greedy_solution(grid):
+    "returns the solution (pairs, score) of SolverGreedy, computed on a copy of the grid (the grid is not modified)"
+    copy = Grid(grid.n, grid.m, grid.color_array, grid.value_array)
+    copy.removed = list(grid.removed)
+    return SolverGreedy(copy).run()
+
+def score_bounds(grid):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+
+    Output:
+    -------
+    tuple (lower, upper, pairs)
+      lower: int
+        A lower bound on the best score
+      upper: int
+        The score of the greedy solution, an upper bound on the best score
+      pairs: list[tuple[tuple[int]]]
+        The greedy solution, which is optimal if lower == upper
+    """
+    pairs, upper = greedy_solution(grid)
+    return lower_bound(grid, score=int(upper)), int(upper), pairs
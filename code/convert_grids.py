@@ -0,0 +1,62 @@
+# This will work if ran from the root folder
+# Joel Khayat and Allan Pariente
+"""
+Converts grid files between the text format (.in, read by Grid.grid_from_file) and the binary format (.bin, read by Grid.grid_from_binary_file).
+
+Usage examples (from the root folder):
+    python code/convert_grids.py input/*.in --to binary --output-dir input/binary
+    python code/convert_grids.py input/binary/*.bin --to text --output-dir /tmp/grids
+"""
+import argparse
+import os
+from grid import Grid
+
+def read_text_grid(file_name):
+    "reads a text grid, with its values if the file contains them (otherwise all values are 1)"
+    try:
+        return Grid.grid_from_file(file_name, read_values=True)
+    except Exception as error:
+        if str(error) != "Format incorrect":
+            raise
+        return Grid.grid_from_file(file_name, read_values=False)
+
+def convert(file_name, to, output_dir=None):
+    """
+    Parameters: 
+    -----------
+    file_name: str
+        The grid file to convert
+    to: str
+        "binary" or "text"
+    output_dir: str
+        The folder of the converted file (default: the folder of file_name)
+
+    Output: 
+    -------
+    str
+        The name of the converted file: same name with the extension .bin (binary) or .in (text)
+    """
+    root = os.path.splitext(os.path.basename(file_name))[0]
+    output_dir = os.path.dirname(file_name) if output_dir is None else output_dir
+    if to == "binary":
+        output_name = os.path.join(output_dir, root + ".bin")
+        read_text_grid(file_name).write_to_binary_file(output_name)
+    else:
+        output_name = os.path.join(output_dir, root + ".in")
+        Grid.grid_from_binary_file(file_name).write_to_file(output_name)
+    return output_name
+
+def main():
+    parser = argparse.ArgumentParser(description="Converts grid files between the text and the binary formats.")
+    parser.add_argument("files", nargs="+", help="grid files to convert")
+    parser.add_argument("--to", choices=["binary", "text"], required=True)
+    parser.add_argument("--output-dir", help="folder of the converted files (default: next to the original files)")
+    args = parser.parse_args()
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for file_name in args.files:
+        print(file_name, "->", convert(file_name, args.to, args.output_dir))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Joel Khayat and Allan Pariente
+"""
+Decomposition of a grid into independent subgrids.
+
+Black cells, removed cells and incompatible colors split the graph of the pairs (Grid.all_pairs) into connected components:
+a pair never links two components, so each component can be solved separately (and in parallel) and the results merged.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from grid import Grid
+
+def component_labels(grid):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+
+    Output:
+    -------
+    labels: np.ndarray[int]
+        Array of shape (n, m): labels[i, j] is the component of the cell (i, j), or -1 if the cell is in no pair
+    num_components: int
+    """
+    from scipy.sparse import coo_matrix # scipy is only imported when a grid is decomposed
+    from scipy.sparse.csgraph import connected_components
+    pairs = grid.all_pairs_flat()
+    num_cells = grid.n * grid.m
+    graph = coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])), shape=(num_cells, num_cells))
+    num_labels, labels = connected_components(graph, directed=False)
+
+    # the cells which are in no pair are components of size 1, they are labelled -1
+    sizes = np.bincount(labels, minlength=num_labels)
+    new_labels = np.full(num_labels, -1)
+    kept = sizes >= 2
+    new_labels[kept] = np.arange(kept.sum())
+    return new_labels[labels].reshape(grid.n, grid.m), int(kept.sum())
+
+def split_grid(grid, min_cells=1):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+    min_cells: int
+        The components are grouped (by order of their first line) in batches of at least min_cells cells, so that the many small components
+        do not cost one subgrid (and one solver) each. With min_cells=1, each component is alone in its subgrid.
+
+    Output:
+    -------
+    subgrids: list[tuple]
+        For each batch of components (largest first), a tuple (i0, j0, subgrid_color, subgrid_value): the subgrid is the bounding box of the batch,
+        whose top left cell is (i0, j0) in grid, and where the cells outside the batch are black.
+    isolated_score: int
+        The sum of the values of the cells which are not black, not removed and in no pair (they can only stay unmatched).
+    """
+    labels, num_components = component_labels(grid)
+    isolated = (labels == -1) & ~grid.forbidden_mask()
+    isolated_score = int(grid.value_array[isolated].sum(dtype=np.int64))
+    if num_components == 0:
+        return [], isolated_score
+
+    # the cells of each component, sorted by component
+    cells = np.flatnonzero(labels.ravel() != -1)
+    cell_labels = labels.ravel()[cells]
+    order = np.argsort(cell_labels, kind="stable")
+    cells, cell_labels = cells[order], cell_labels[order]
+    starts = np.searchsorted(cell_labels, np.arange(num_components))
+    sizes = np.diff(np.append(starts, len(cells)))
+    first_lines = np.minimum.reduceat(cells // grid.m, starts)
+
+    # grouping the components in batches, by order of their first line
+    batch_of_component = np.empty(num_components, dtype=np.int64)
+    batch, batch_size = 0, 0
+    for component in np.argsort(first_lines, kind="stable").tolist():
+        batch_of_component[component] = batch
+        batch_size += sizes[component]
+        if batch_size >= min_cells:
+            batch, batch_size = batch + 1, 0
+    num_batches = batch + (batch_size > 0)
+
+    cell_batches = batch_of_component[cell_labels]
+    order = np.argsort(cell_batches, kind="stable")
+    cells, cell_batches = cells[order], cell_batches[order]
+    bounds = np.searchsorted(cell_batches, np.arange(num_batches + 1))
+
+    subgrids = []
+    for batch in range(num_batches):
+        batch_cells = cells[bounds[batch]:bounds[batch + 1]]
+        rows, columns = batch_cells // grid.m, batch_cells % grid.m
+        i0, i1, j0, j1 = rows.min(), rows.max() + 1, columns.min(), columns.max() + 1
+        color = np.full((i1 - i0, j1 - j0), 4, dtype=np.int8)
+        color[rows - i0, columns - j0] = grid.color_array[rows, columns]
+        subgrids.append((int(i0), int(j0), color, np.array(grid.value_array[i0:i1, j0:j1])))
+    subgrids.sort(key=lambda subgrid: -subgrid[2].size)
+    return subgrids, isolated_score
+
+def solve_subgrid(solver_class, color, value):
+    """
+    Parameters:
+    -----------
+    solver_class: class
+        A solver class (or any function which takes a grid and returns a solver)
+    color, value: np.ndarray
+        The subgrid
+
+    Output:
+    -------
+    tuple (pairs, score) of the solver on the subgrid
+    """
+    n, m = color.shape
+    pairs, score = solver_class(Grid(n, m, color, value)).run()
+    return pairs, int(score)
+
+def solve_by_components(grid, solver_class, max_workers=None):
+    """
+    Solves each component of the grid separately with solver_class, and merges the pairs and the scores.
+
+    Parameters:
+    -----------
+    grid: Grid
+    solver_class: class
+        A solver class (or any picklable function which takes a grid and returns a solver)
+    max_workers: int
+        Number of processes of the ProcessPoolExecutor (default: number of CPUs). With 1, or in a daemonic process (a worker of a multiprocessing.Pool,
+        which cannot have children), the components are solved in the current process.
+
+    Output:
+    -------
+    tuple (pairs, score)
+      pairs: list[tuple[tuple[int]]]
+      score: int
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if multiprocessing.current_process().daemon:
+        max_workers = 1
+    subgrids, score = split_grid(grid, min_cells=max(1000, grid.n * grid.m // (4 * max_workers)))
+    arguments = ([solver_class] * len(subgrids), [subgrid[2] for subgrid in subgrids], [subgrid[3] for subgrid in subgrids])
+
+    if max_workers == 1 or len(subgrids) <= 1:
+        results = map(solve_subgrid, *arguments)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(solve_subgrid, *arguments))
+
+    pairs = []
+    for (i0, j0, color, value), (subgrid_pairs, subgrid_score) in zip(subgrids, results):
+        pairs += [((i1 + i0, j1 + j0), (i2 + i0, j2 + j0)) for (i1, j1), (i2, j2) in subgrid_pairs]
+        score += subgrid_score
+    return pairs, score
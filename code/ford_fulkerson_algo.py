@@ -1,11 +1,12 @@
 # Joel Khayat and Allan Pariente
-import numpy as np
+from collections import deque
 
 class Graph:
     """
     Attributes: 
     -----------
-    adjency: np.array
+    adjency: list[dict[int, int]]
+        adjency[u][v] is the residual capacity of the edge u -> v. Only the edges of the graph and their reversed edges are stored, so the memory is O(V+E).
 
     Graph class.
     """
@@ -16,11 +17,27 @@ class Graph:
         numNodes: int
         edges: list[(int, int, int)]
 
-        Defines the adjency matrix of the graph.
+        Defines the adjency lists of the residual graph.
         """
-        self.adjency = np.zeros((numNodes, numNodes))
+        self.adjency = [dict() for node in range(numNodes)]
         for edge in edges:
-            self.adjency[edge[0], edge[1]] = edge[2]
+            self.adjency[edge[0]][edge[1]] = edge[2]
+            self.adjency[edge[1]].setdefault(edge[0], 0) # reversed edge, to be able to cancel some flow
+
+    def capacity(self, u, v):
+        """
+        Parameters:
+        -----------
+        u: int
+        v: int
+
+        Output:
+        -------
+        int
+
+        Returns the residual capacity of the edge u -> v (0 if there is no such edge).
+        """
+        return self.adjency[u].get(v, 0)
 
     def bfs(self, source, target, parent):
         """
@@ -37,12 +54,12 @@ class Graph:
         Returns True if there is a path from source to target in the graph, using breadth-first algorithm, False otherwise, and updates the parent list (to remind the path), using side effect.
         """
         visited = [False] * len(self.adjency)
-        queue = [source]
+        queue = deque([source])
         visited[source] = True
         while queue:
-            nodeQueue = queue.pop(0)
-            for node in range(len(self.adjency[nodeQueue])):
-                if visited[node] == False and self.adjency[nodeQueue][node] > 0:
+            nodeQueue = queue.popleft()
+            for node, capacity in self.adjency[nodeQueue].items():
+                if visited[node] == False and capacity > 0:
                     queue.append(node)
                     visited[node] = True
                     parent[node] = nodeQueue
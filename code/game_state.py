@@ -0,0 +1,89 @@
+# Joel Khayat and Allan Pariente
+"""
+Incremental state of a game, for the player mode and the step-by-step replays.
+
+The pairs of the grid are computed once. Then each played pair updates the score, the set of the available pairs and the number of moves left
+in O(1): a cell is in at most 4 pairs, so only the pairs of its neighbours are removed, instead of computing all the pairs again.
+"""
+import numpy as np
+
+class GameState:
+    """
+    Attributes:
+    -----------
+    grid: Grid
+    pairs: list[tuple[tuple[int]]]
+        The pairs played, in order
+    score: int
+        The current score: the costs of the pairs played plus the values of the cells which are not black and not removed
+    available: set[tuple[tuple[int]]]
+        The pairs which can still be played, in the format of Grid.all_pairs
+    pairs_of_cell: dict[tuple[int], list[tuple[tuple[int]]]]
+        pairs_of_cell[cell] is the list of the pairs of Grid.all_pairs which contain cell
+    """
+
+    def __init__(self, grid):
+        """
+        Parameters:
+        -----------
+        grid: Grid
+            The grid, whose removed cells are taken into account. The pairs played are added to grid.removed
+        """
+        self.grid = grid
+        self.pairs = []
+        self.score = int(grid.value_array[~grid.forbidden_mask()].sum(dtype=np.int64))
+        self.available = set(grid.all_pairs())
+        self.pairs_of_cell = {}
+        for pair in self.available:
+            self.pairs_of_cell.setdefault(pair[0], []).append(pair)
+            self.pairs_of_cell.setdefault(pair[1], []).append(pair)
+
+    @property
+    def moves_left(self):
+        "number of pairs which can still be played"
+        return len(self.available)
+
+    def is_over(self):
+        "returns True if no pair can be played anymore"
+        return not self.available
+
+    def find_pair(self, cell1, cell2):
+        """
+        Returns the pair (in the format of Grid.all_pairs) made of cell1 and cell2 if it can be played, None otherwise.
+        """
+        if (cell1, cell2) in self.available:
+            return (cell1, cell2)
+        if (cell2, cell1) in self.available:
+            return (cell2, cell1)
+        return None
+
+    def can_match(self, cell1, cell2):
+        "returns True if the pair (cell1, cell2) can be played"
+        return self.find_pair(cell1, cell2) is not None
+
+    def play(self, cell1, cell2):
+        """
+        Parameters:
+        -----------
+        cell1, cell2: tuple[int]
+
+        Output:
+        -------
+        bool
+            True if the pair has been played, False if it cannot be played (nothing changes then)
+
+        Plays the pair (cell1, cell2): the two cells are removed from the grid, and the score and the available pairs are updated.
+        """
+        pair = self.find_pair(cell1, cell2)
+        if pair is None:
+            return False
+        for cell in pair:
+            for other_pair in self.pairs_of_cell.get(cell, []):
+                self.available.discard(other_pair)
+            self.grid.removed.append(cell)
+        # Python integers, so that the score stays exact whatever the values (the array is int32)
+        value1 = int(self.grid.value_array[cell1[0], cell1[1]])
+        value2 = int(self.grid.value_array[cell2[0], cell2[1]])
+        self.score += abs(value1 - value2) - value1 - value2
+        self.pairs.append((cell1, cell2))
+        return True
@@ -1,16 +1,106 @@
 # Joel Khayat & Allan Pariente
 import pygame
 import time
-from solver import SolverGreedy, SolverMaxMatching, SolverHungarian, PlayerGame
+from solver import SOLVERS, Solver
+from game_state import GameState
 from grid import Grid
+from grid_renderer import LOGO_FILE
+
+class PlayerGame(Solver):
+    "class to allow player to play the game with a graphical interface"
+
+    def __init__(self, grid):
+        super().__init__(grid)
+        self.grid = grid
+        self.running = True  #  if the game is running
+
+    def button(self, screen, text, x, y, button_size, font_text, button_color, button_text_color):
+        # create a button with text and display on screen
+        rect = pygame.Rect(x, y, button_size[0], button_size[1])
+        pygame.draw.rect(screen, button_color, rect)
+        text_surface = font_text.render(text, True, button_text_color)
+        text_rect = text_surface.get_rect(center=rect.center)
+        screen.blit(text_surface, text_rect)
+        pygame.display.update()
+        return rect
+
+    def run_game(self):
+        "manage the game in player mode"
+
+        # message to display in player mode
+        bot = "Player Mode - Click on two cells to match them. Click 'z' to deselect all cells."
+        state = GameState(self.grid)  # score and available pairs, updated after each pair
+        self.pairs = state.pairs
+        pygame.font.init()
+        self.grid.plotStep(bot)  # display all the grid with the message
+
+        while self.running:
+            # handle events in the window
+            for event in pygame.event.get():
+                bot = "Player Mode - Click on two cells to match them. Click 'z' to deselect all cells."
+                if event.type == pygame.QUIT:
+                    # close the window of the game
+                    self.running = False
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_f:
+                        # close the game when 'f' is pressed
+                        self.running = False
+                    if event.key == pygame.K_z:
+                        # deselect all cells when 'z' pressed
+                        self.grid.selected_cells = []
+                        self.grid.plotStep(bot)
+
+                if event.type == pygame.MOUSEBUTTONDOWN:
+
+                    # cell selection with one mouse click, the cell is computed from the position of the click
+                    cell = self.grid.renderer.cell_at(event.pos)
+                    if cell is None:
+                        continue
+
+                    # check if the clicked cell is OK for selection
+                    if cell and cell not in self.grid.selected_cells and (not self.grid.is_forbidden(cell[0], cell[1]) or self.grid.color[cell[0]][cell[1]] == 4):
+                        self.grid.selected_cells.append(cell)  # add the cell to the selected list
+                        self.grid.plotStep(bot)  # update the grid display
+
+                        if len(self.grid.selected_cells) == 2:
+                            # if two cells are selected, check if they can be matched
+                            cell1, cell2 = self.grid.selected_cells
+                            if state.play(cell1, cell2):
+                                # the cells can be matched, they have been removed from the grid
+                                self.grid.plotStep(bot)
+                                pygame.time.wait(500)  # wait a bit
+                                self.grid.plot_removed.append(cell1)
+                                self.grid.plot_removed.append(cell2)
+                                self.grid.plotStep(bot)
+                            else:
+                                # if the cells cannot be matched, show a message
+                                bot += "\nThe selected cells cannot be matched."
+                            # reset selection
+                            self.grid.selected_cells = []
+                            self.grid.plotStep(bot)
+
+            # if there are no more pairs then end the game
+            if state.is_over():
+                pygame.quit()
+                return self.pairs, state.score
+
+        pygame.quit()
 
 class PlotResolution():
     "class plotting the graphic representation of the resolution"
 
-    def __init__(self, grid):
+    def __init__(self, grid, cache=None):
         self.grid = grid
+        self.cache = cache  # SolutionCache (optional), so that a solver is not run again on the same grid
         self.running = True  # if window is running
 
+    def solve(self, solver_name):
+        # solution of the solver on the grid, taken from the cache if possible
+        if self.cache is not None:
+            return self.cache.solve(self.grid, solver_name)
+        return SOLVERS[solver_name](self.grid).run()
+
     def button(self, screen, text, x, y, button_size, font_text, button_color, button_text_color):
         # create a button with text, and display it on the screen
         rect = pygame.Rect(x, y, button_size[0], button_size[1])  # define button
@@ -44,7 +134,7 @@ class PlotResolution():
         text_list = text.split("\n")  # split the text into lines
 
         # load and resize the logo
-        logo = pygame.image.load("assets\\ensae_logo.png")
+        logo = pygame.image.load(LOGO_FILE)
         logo = pygame.transform.scale(logo, (60, 80))
 
         logo_rect = logo.get_rect()
@@ -96,7 +186,7 @@ class PlotResolution():
         text_list = text.split("\n")  # split the text into lines
 
         # load and resize the logo
-        logo = pygame.image.load("assets\\ensae_logo.png")
+        logo = pygame.image.load(LOGO_FILE)
         logo = pygame.transform.scale(logo, (60, 80))
 
         logo_rect = logo.get_rect()
@@ -148,13 +238,13 @@ class PlotResolution():
         # choose the solver based on the button clicked
         if bot_name == "Greedy":
             bot = "Greedy algorithm: at each step, the algorithm chooses \nthe pair with the smallest cost with the highest values."
-            list_pairs, score = SolverGreedy(self.grid).run()
+            list_pairs, score = self.solve("greedy")
         elif bot_name == "FordFulkerson":
             bot = "Matching algorithm using the Ford-Fulkerson algorithm to \ndetermine the best path to choose in an equivalent flow problem."
-            list_pairs, score = SolverMaxMatching(self.grid).run()
+            list_pairs, score = self.solve("max_matching")
         elif bot_name == "Hungarian":
             bot = "Matching algorithm using the Hungarian algorithm to \ndetermine a matching in a bipartite graph (represented by a square matrix)."
-            list_pairs, score = SolverHungarian(self.grid).run()
+            list_pairs, score = self.solve("hungarian")
 
         pygame.font.init()
         self.grid.plotStep(bot)  # display the grid with the solver description
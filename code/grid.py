@@ -4,7 +4,292 @@
 """
 This is the grid module. It contains the Grid class and its associated methods.
 """
-import pygame
+import os
+import struct
+import warnings
+from array import array
+from collections.abc import MutableSequence, Sequence
+import numpy as np
+
+# COLOR_COMPATIBILITY[c1, c2] is True if a cell of color c1 can be taken with a cell of color c2
+# (white goes with every color except black, blue and red go together, red, blue and green go with themselves)
+COLOR_COMPATIBILITY = np.array([
+    # w      r      b      g      k
+    [True,  True,  True,  True,  False], # w
+    [True,  True,  True,  False, False], # r
+    [True,  True,  True,  False, False], # b
+    [True,  False, False, True,  False], # g
+    [False, False, False, False, False], # k
+])
+
+# Binary format of the grids: a header (BINARY_HEADER: magic number, n, m, dtype of the values), then the color plane (n*m int8),
+# padded to a multiple of 8 bytes, then the value plane (n*m values of the given dtype), both in row-major order
+BINARY_MAGIC = b"GRID"
+BINARY_HEADER = struct.Struct("<4sII8s4x") # 24 bytes
+
+def pairs_to_flat(pairs, m):
+    """
+    Parameters:
+    -----------
+    pairs: list[tuple[tuple[int]]]
+        Pairs in the format ((i1, j1), (i2, j2))
+    m: int
+        Number of columns of the grid
+
+    Output:
+    -------
+    np.ndarray[int32]
+        Array of shape (k, 2) of the flat indices (i1*m + j1, i2*m + j2) of the pairs
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2, 2)
+    return (pairs[:, :, 0] * m + pairs[:, :, 1]).astype(np.int32)
+
+def pairs_from_flat(pairs, m):
+    """
+    Parameters:
+    -----------
+    pairs: np.ndarray[int]
+        Array of shape (k, 2) of the flat indices of the cells of the pairs
+    m: int
+        Number of columns of the grid
+
+    Output:
+    -------
+    list[tuple[tuple[int]]]
+        The pairs in the format ((i1, j1), (i2, j2))
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    output = []
+    # converted by blocks, so that the temporary lists of integers stay small
+    for start in range(0, len(pairs), 1 << 12):
+        rows, columns = np.divmod(pairs[start:start + (1 << 12)], m)
+        output.extend(((i1, j1), (i2, j2)) for i1, i2, j1, j2 in np.concatenate([rows, columns], axis=1).tolist())
+    return output
+
+class CellList(MutableSequence):
+    """
+    A list of cells of a grid.
+
+    It behaves as a list of tuples (i, j), but the cells are stored as flat indices i*m + j in an array('i') (4 bytes per cell instead of
+    a tuple of two ints), so that large lists of cells stay small. The cells are converted to tuples only when they are read.
+
+    Attributes:
+    -----------
+    n, m: int
+        The size of the grid
+    ids: array.array
+        The flat indices of the cells
+    """
+
+    def __init__(self, n, m, cells=()):
+        self.n, self.m = n, m
+        self.ids = array("i")
+        self.extend(cells)
+
+    def flat(self, cell):
+        "returns the flat index of the cell (i, j)"
+        i, j = cell
+        return i * self.m + j
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [divmod(flat, self.m) for flat in self.ids[index]]
+        return divmod(self.ids[index], self.m)
+
+    def __iter__(self):
+        m = self.m
+        return (divmod(flat, m) for flat in self.ids)
+
+    def __contains__(self, cell):
+        i, j = cell
+        return 0 <= i < self.n and 0 <= j < self.m and i * self.m + j in self.ids
+
+    def __eq__(self, other):
+        if isinstance(other, CellList):
+            return self.m == other.m and self.ids == other.ids
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def added(self, ids):
+        "called with the flat indices of the cells which have been added"
+        pass
+
+    def discarded(self, ids):
+        "called with the flat indices of the cells which have been taken out of the list"
+        pass
+
+    def __setitem__(self, index, cells):
+        old = self.ids[index] if isinstance(index, slice) else array("i", [self.ids[index]])
+        if isinstance(index, slice):
+            self.ids[index] = array("i", [self.flat(cell) for cell in cells])
+        else:
+            self.ids[index] = self.flat(cells)
+        self.discarded(old)
+        self.added(self.ids[index] if isinstance(index, slice) else [self.ids[index]])
+
+    def __delitem__(self, index):
+        old = self.ids[index] if isinstance(index, slice) else array("i", [self.ids[index]])
+        del self.ids[index]
+        self.discarded(old)
+
+    def insert(self, index, cell):
+        flat = self.flat(cell)
+        self.ids.insert(index, flat)
+        self.added([flat])
+
+    def append(self, cell):
+        flat = self.flat(cell)
+        self.ids.append(flat)
+        self.added([flat])
+
+    def extend(self, cells):
+        if isinstance(cells, CellList):
+            self.extend_flat(cells.ids)
+        else:
+            self.extend_flat([self.flat(cell) for cell in cells])
+
+    def extend_flat(self, ids):
+        """
+        Parameters:
+        -----------
+        ids: array.array or np.ndarray[int] or list[int]
+            The flat indices of the cells to add (without building any tuple)
+        """
+        if isinstance(ids, np.ndarray):
+            ids = ids.astype(np.int32).ravel()
+            self.ids.frombytes(ids.tobytes())
+        else:
+            self.ids.extend(ids)
+        self.added(ids)
+
+    def __iadd__(self, cells):
+        self.extend(cells)
+        return self
+
+    def remove(self, cell):
+        flat = self.flat(cell)
+        self.ids.remove(flat)
+        self.discarded([flat])
+
+    def pop(self, index=-1):
+        flat = self.ids.pop(index)
+        self.discarded([flat])
+        return divmod(flat, self.m)
+
+    def clear(self):
+        old = self.ids
+        self.ids = array("i")
+        self.discarded(old)
+
+    def copy(self):
+        return type(self)(self.n, self.m, self)
+
+    def flat_array(self):
+        "returns the flat indices of the cells as an np.ndarray[int32] (a copy)"
+        return np.frombuffer(self.ids, dtype=np.int32).copy() if len(self.ids) else np.zeros(0, dtype=np.int32)
+
+class RemovedCells(CellList):
+    """
+    The list of the cells removed from a grid.
+
+    It behaves as a list of tuples (i, j) (see CellList), but it is mirrored in a boolean mask of shape (n, m), so that the membership test (i, j) in removed is O(1).
+    A cell may be in the list several times, so the number of times each cell is in the list is kept too: taking a cell out of the list is O(1) as well.
+
+    Attributes:
+    -----------
+    mask: np.ndarray[bool]
+        mask[i, j] is True if the cell (i, j) has been removed
+    counts: np.ndarray[int32]
+        counts[i, j] is the number of times the cell (i, j) is in the list
+    """
+
+    def __init__(self, n, m, cells=()):
+        self.mask = np.zeros((n, m), dtype=bool)
+        self.counts = np.zeros((n, m), dtype=np.int32)
+        self.flat_mask, self.flat_counts = self.mask.ravel(), self.counts.ravel() # views of the arrays, indexed by flat index
+        super().__init__(n, m, cells)
+
+    def __contains__(self, cell):
+        i, j = cell
+        return 0 <= i < self.n and 0 <= j < self.m and bool(self.mask[i, j])
+
+    def added(self, ids):
+        if len(ids) == 1: # the cells are usually added one by one, without the overhead of np.add.at
+            flat = int(ids[0])
+            self.flat_counts[flat] += 1
+            self.flat_mask[flat] = True
+            return
+        ids = np.asarray(ids, dtype=np.intp)
+        np.add.at(self.flat_counts, ids, 1)
+        self.flat_mask[ids] = True
+
+    def discarded(self, ids):
+        if len(ids) == 1:
+            flat = int(ids[0])
+            self.flat_counts[flat] -= 1
+            self.flat_mask[flat] = self.flat_counts[flat] > 0
+            return
+        ids = np.asarray(ids, dtype=np.intp)
+        np.subtract.at(self.flat_counts, ids, 1)
+        self.flat_mask[ids] = self.flat_counts[ids] > 0
+
+class ArrayRow(Sequence):
+    """
+    A row of an array seen as a list: row[j] is the Python int array[j] (not a fixed-width NumPy integer), and row[j] = x writes in the array.
+    It is equal to the list of the row.
+    """
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, j):
+        if isinstance(j, slice):
+            return self.array[j].tolist()
+        return self.array[j].item()
+
+    def __setitem__(self, j, value):
+        self.array[j] = value
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, (ArrayRow, np.ndarray)):
+            return np.array_equal(self.array, np.asarray(other))
+        return self.tolist() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def tolist(self):
+        return self.array.tolist()
+
+class ArrayRows(ArrayRow):
+    """
+    The rows of a 2D array seen as a list of lists: rows[i] is an ArrayRow, a view of the row i (not a copy), so that rows[i][j] reads
+    array[i, j] as a Python int and rows[i][j] = x writes in the array. It is equal to the list of lists of the array.
+    """
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [ArrayRow(row) for row in self.array[i]]
+        return ArrayRow(self.array[i])
+
+    def __iter__(self):
+        return (ArrayRow(row) for row in self.array)
 
 class Grid():
     """
@@ -16,14 +301,18 @@ class Grid():
         Number of lines in the grid
     m: int
         Number of columns in the grid
-    color: list[list[int]]
+    color: ArrayRows
         The color of each grid cell: color[i][j] is the color in the cell (i, j), i.e., in the i-th line and j-th column. 
         Note: lines are numbered 0..n-1 and columns are numbered 0..m-1.
-    value: list[list[int]]
+    value: ArrayRows
         The value of each grid cell: value[i][j] is the value in the cell (i, j), i.e., in the i-th line and j-th column. 
         Note: lines are numbered 0..n-1 and columns are numbered 0..m-1.
     colors_list: list[char]
         The list of the colors that can appear on the grid.
+    color_array: np.ndarray[int8]
+        The colors of the grid as an array of shape (n, m). self.color is a view of this array as a list of lists: writing grid.color[i][j] writes in the array.
+    value_array: np.ndarray[int32]
+        The values of the grid as an array of shape (n, m). self.value is a view of this array as a list of lists.
     """
     
 
@@ -37,30 +326,78 @@ class Grid():
             Number of lines in the grid
         m: int
             Number of columns in the grid
-        color: list[list[int]]
+        color: list[list[int]] or np.ndarray
             The grid cells colors. Default is empty (then the grid is created with each cell having color 0, i.e., white).
-        value: list[list[int]]
+        value: list[list[int]] or np.ndarray
             The grid cells values. Default is empty (then the grid is created with each cell having value 1).
         colors_list: list[char]
-        removed: list[tuple[int]]
-            The list of pairs of cells that have been removed from the grid.
+        removed: RemovedCells
+            The list of pairs of cells that have been removed from the grid (mirrored in the boolean mask removed.mask).
+        plot_removed, selected_cells: CellList
+            The cells hidden and selected in the graphical representation
         
         The object created has an attribute colors_list: list[char], which is the mapping between the value of self.color[i][j] and the corresponding color
         """
         self.n = n
         self.m = m
-        if not color: # Syntax not [list]: if color is empty, create a grid with all cells white
-            color = [[0 for j in range(m)] for i in range(n)]            
+        if len(color) == 0: # if color is empty, create a grid with all cells white
+            color = np.zeros((n, m), dtype=np.int8)
         self.color = color
-        if not value:
-            value = [[1 for j in range(m)] for i in range(n)]            
+        if len(value) == 0:
+            value = np.ones((n, m), dtype=np.int32)
         self.value = value
         self.colors_list = ['w', 'r', 'b', 'g', 'k']
         self.removed = [] # list of pairs of cells that have been removed from the grid
         self.plot_removed = [] # cells that should not be displayed in the graphical representation of the resolution of the grid
         self.rect_list = [] # list of the Pygame.Rect cells for the plot
         self.cells_list = [] # list of the cells for the plot
+        self.renderer = None # GridRenderer of plotStep, created at the first call
         self.selected_cells = [] # list of the cells selected by the player
+        # removed, plot_removed and selected_cells are CellList (flat indices), any list of cells assigned to them is converted
+
+    # The arrays are the storage of the grid, color and value are views of them
+    @property
+    def color(self):
+        return ArrayRows(self.color_array)
+
+    @color.setter
+    def color(self, color):
+        self.color_array = np.asarray(color, dtype=np.int8)[:self.n, :self.m]
+
+    @property
+    def value(self):
+        return ArrayRows(self.value_array)
+
+    @value.setter
+    def value(self, value):
+        self.value_array = np.asarray(value, dtype=np.int32)[:self.n, :self.m]
+
+    @property
+    def removed(self):
+        return self._removed
+
+    @removed.setter
+    def removed(self, cells):
+        if cells is not getattr(self, "_removed", None): # removed += cells assigns the same list
+            self._removed = RemovedCells(self.n, self.m, cells)
+
+    @property
+    def plot_removed(self):
+        return self._plot_removed
+
+    @plot_removed.setter
+    def plot_removed(self, cells):
+        if cells is not getattr(self, "_plot_removed", None):
+            self._plot_removed = CellList(self.n, self.m, cells)
+
+    @property
+    def selected_cells(self):
+        return self._selected_cells
+
+    @selected_cells.setter
+    def selected_cells(self, cells):
+        if cells is not getattr(self, "_selected_cells", None):
+            self._selected_cells = CellList(self.n, self.m, cells)
 
     def __str__(self): 
         """
@@ -68,10 +405,10 @@ class Grid():
         """
         output = f"The grid is {self.n} x {self.m}. It has the following colors:\n"
         for i in range(self.n): 
-            output += f"{[self.colors_list[self.color[i][j]] for j in range(self.m)]}\n"
+            output += f"{[self.colors_list[color] for color in self.color_array[i].tolist()]}\n"
         output += f"and the following values:\n"
         for i in range(self.n): 
-            output += f"{self.value[i]}\n"
+            output += f"{self.value_array[i].tolist()}\n"
         return output
 
     def __repr__(self): 
@@ -89,161 +426,24 @@ class Grid():
         Warning : does not work when window is too large
         """
 
-        cell_size = min(100, 500/max(self.n, self.m)) # The grid should not be too large (max 500px)
-        width, height = max(self.m*cell_size, 500), self.n*cell_size + cell_size*5/4 
-        # We choose max(self.m*cell_size, 500) because the text occupates a width of minimum 500px. 
-        # The factor 5/4 is only aestehtic.
-        screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
-        pygame.display.set_caption("Un jeu de paires")
-        
-        colorsDict = {
-            'w': (255, 255, 255),
-            'r': (255, 0, 0),
-            'b': (0, 0, 255),
-            'g': (0, 255, 0),
-            'k': (0, 0, 0)
-        }
-
-        pygame.font.init()
-        font_values = pygame.font.Font(None, int(cell_size/2))
-        font_text = pygame.font.Font(None, 16)
-        
-        # Drawing our grid
-        def draw_grid():
-            screen.fill(colorsDict['k'])
-            for i in range(self.n):
-                for j in range(self.m):
-                    if (i,j) in self.removed:
-                        continue
-                    rect = pygame.Rect(j*cell_size, i*cell_size, cell_size, cell_size)
-                    colorRect = self.colors_list[self.color[i][j]]
-                    pygame.draw.rect(screen, colorsDict[colorRect], rect)
-
-                    value_surface = font_values.render(str(self.value[i][j]), True, (200, 200, 200))
-                    value_rect = value_surface.get_rect(center=rect.center)
-                    screen.blit(value_surface, value_rect)
-            pygame.display.update()
-        
-        draw_grid()
-
-        # Printing a logo and text
-        text = "Programming project - ENSAE Paris Joël Khayat & Allan Parienté.\nPress 'f' or click the cross to close the window."
-        textList = text.split("\n")
-
-        logo = pygame.image.load("assets\\ensae_logo.png")
-        logo = pygame.transform.scale(logo,(int(3*cell_size/4), cell_size))
-
-        logo_rect = logo.get_rect()
-        logo_rect.topleft = (cell_size/8, height - cell_size*9/8)
-
-        # The text has to be printed in several lines
-        for i in range(len(textList)):
-            rect_text = pygame.Rect(cell_size, height - cell_size + i*16, cell_size, cell_size)
-            text_surface = font_text.render(textList[i], True, (200, 200, 200))
-            text_rect = text_surface.get_rect(topleft=rect_text.topleft)
-            screen.blit(text_surface, text_rect)
-        
-        screen.blit(logo, logo_rect)
-        
-        pygame.display.update()
-
-        # Waiting for the user to close the window
-        running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_f:
-                        running = False
-        pygame.quit()
+        # the rendering layer (and pygame) is only imported when a grid is displayed
+        from grid_renderer import plot_grid
+        plot_grid(self)
 
     def plotStep(self, bot_explanation):
+        """
+        Parameters:
+        -----------
+        bot_explanation: str
+            The text displayed below the grid
 
-        cell_size = min(100, 500/max(self.n, self.m)) # The grid should not be too large (max 500px)
-        width, height = max(self.m*cell_size, 500), self.n*cell_size + cell_size*3/2 # We choose max(self.m*cell_size, 500) because the text occupates a width of minimum 500px. The factor 5/4 is only aestehtic.
-        screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
-        pygame.display.set_caption("Un jeu de paires")
-        
-        colorsDict = {
-            'w': (255, 255, 255),
-            'r': (255, 0, 0),
-            'b': (0, 0, 255),
-            'g': (0, 255, 0),
-            'k': (0, 0, 0)
-        }
-
-        pygame.font.init()
-        font_values = pygame.font.Font(None, 52)
-        font_text = pygame.font.Font(None, 16)
-
-        # Here we are drawing our grid
-        def draw_grid():
-            """
-            Draws the grid and updates cells_list by side effect.
-            """
-            screen.fill(colorsDict['k'])
-            for i in range(self.n):
-                for j in range(self.m):
-                    if (i,j) in self.plot_removed:
-                        continue
-                    if (i,j) in self.selected_cells:
-                        rect = pygame.Rect(j*cell_size, i*cell_size, cell_size, cell_size)
-                        colorRect = self.colors_list[self.color[i][j]]
-                        pygame.draw.rect(screen, colorsDict[colorRect], rect)
-
-                        value_surface = font_values.render(str(self.value[i][j]), True, (200, 200, 200))
-                        value_rect = value_surface.get_rect(center=rect.center)
-                        screen.blit(value_surface, value_rect)
-
-                        border_color = (100, 150, 200)
-                        border_thickness = 3
-                        pygame.draw.rect(screen, border_color, rect, border_thickness)
-
-                        self.rect_list.append(rect)
-                        self.cells_list.append((i,j))
-                        
-                    else:
-                        rect = pygame.Rect(j*cell_size, i*cell_size, cell_size, cell_size)
-                        colorRect = self.colors_list[self.color[i][j]]
-                        pygame.draw.rect(screen, colorsDict[colorRect], rect)
-
-                        value_surface = font_values.render(str(self.value[i][j]), True, (200, 200, 200))
-                        value_rect = value_surface.get_rect(center=rect.center)
-                        screen.blit(value_surface, value_rect)
-
-                        self.rect_list.append(rect)
-                        self.cells_list.append((i,j))
-            
-            
-            pygame.display.update()
-        
-
-        draw_grid()
-
-        # Printing a logo and text
-
-        text = bot_explanation + "\n\n" + "Programming project - ENSAE Paris Joël Khayat & Allan Parienté.\nPress 'f' or click the cross to close the window."
-        textList = text.split("\n")
-
-        logo = pygame.image.load("assets\\ensae_logo.png")
-        logo = pygame.transform.scale(logo,(int(3*cell_size/4), cell_size))
-
-        logo_rect = logo.get_rect()
-        logo_rect.topleft = (cell_size/8, height - cell_size*5/4)
-
-        
-        # The text has to be printed in several lines
-        
-        for i in range(len(textList)):
-            rect_text = pygame.Rect(cell_size, height - cell_size*5/4 + i*16, cell_size, cell_size)
-            text_surface = font_text.render(textList[i], True, (200, 200, 200))
-            text_rect = text_surface.get_rect(topleft=rect_text.topleft)
-            screen.blit(text_surface, text_rect)
-        
-        screen.blit(logo, logo_rect)
-        
-        pygame.display.update()
+        Displays the grid, without the cells of plot_removed and with a border around the selected cells.
+        The window is kept by a GridRenderer between the calls, which only redraws the cells that changed since the previous call.
+        """
+        if self.renderer is None or not self.renderer.is_valid():
+            from grid_renderer import GridRenderer
+            self.renderer = GridRenderer(self)
+        self.renderer.render(bot_explanation)
 
     def is_forbidden(self, i, j):
         """
@@ -254,7 +454,30 @@ class Grid():
 
         Returns True if the cell (i, j) is black or already removed and False otherwise
         """
-        return self.color[i][j] == 4 or (i,j) in self.removed
+        return bool(self.color_array[i, j] == 4) or (i,j) in self.removed
+
+    def forbidden_mask(self):
+        """
+        Returns a boolean array of shape (n, m), which is True for the cells that are black or already removed.
+        """
+        return (self.color_array == 4) | self.removed.mask
+
+    def pair_costs(self, pairs):
+        """
+        Returns the costs of several pairs at once.
+
+        Parameters: 
+        -----------
+        pairs: list[tuple[tuple[int]]] or np.ndarray
+            The pairs in the format ((i1, j1), (i2, j2)), or an integer array of shape (k, 4) whose rows are (i1, j1, i2, j2)
+
+        Output: 
+        -----------
+        costs: np.ndarray[int]
+            costs[k] is the cost of the k-th pair
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 4)
+        return np.abs(self.value_array[pairs[:, 0], pairs[:, 1]].astype(np.int64) - self.value_array[pairs[:, 2], pairs[:, 3]])
 
     def cost(self, pair):
         """
@@ -270,45 +493,47 @@ class Grid():
         cost: int
             the cost of the pair defined as the absolute value of the difference between their values
         """
-        return abs(self.value[pair[0][0]][pair[0][1]] - self.value[pair[1][0]][pair[1][1]])
+        (i1, j1), (i2, j2) = pair
+        return abs(int(self.value_array[i1, j1]) - int(self.value_array[i2, j2]))
 
 
-    def all_pairs(self):
+    def all_pairs_flat(self):
         """
-        Returns a list of all pairs of cells that can be taken together. 
+        Returns all pairs of cells that can be taken together, computed at once with NumPy. Each cell (i, j) is represented by its flat index i*m + j.
 
-        Outputs a list of tuples of tuples [(c1, c2), (c1', c2'), ...] where each cell c1 etc. is itself a tuple (i, j)
+        Outputs an integer array of shape (k, 2). The pairs are in the same order as in all_pairs:
+        the first cells are read line by line, and for each of them the pair with (i+1, j) comes before the pair with (i, j+1).
         """
+        allowed = ~self.forbidden_mask()
+        color = self.color_array
+        compatible = COLOR_COMPATIBILITY.ravel() # compatible[5*c1 + c2] is COLOR_COMPATIBILITY[c1, c2]
 
-        def is_color_matching_forbidden(i1, j1, i2, j2):
-            """
-            Parameters:
-            -----------
-            i1, j1, i2, j2: int
-                The coordinates of the two cells
-            
-            Returns True if the colors of the two cells are the same and False otherwise
-            """
+        # both[i, j, 0] (resp. both[i, j, 1]) is True if (i, j) can be taken with (i+1, j) (resp. (i, j+1))
+        both = np.zeros((self.n, self.m, 2), dtype=bool)
+        both[:-1, :, 0] = allowed[:-1, :] & allowed[1:, :] & compatible[5*color[:-1, :] + color[1:, :]]
+        both[:, :-1, 1] = allowed[:, :-1] & allowed[:, 1:] & compatible[5*color[:, :-1] + color[:, 1:]]
 
-            color1 = self.colors_list[self.color[i1][j1]]
-            color2 = self.colors_list[self.color[i2][j2]]
+        k = np.flatnonzero(both).astype(np.int32)
+        first = k >> 1
+        second = first + np.where(k & 1, 1, self.m).astype(np.int32)
+        return np.stack([first, second], axis=1)
 
-            return not (color1 == "w" or color2 == "w" or (color1 == "b" and (color2 in ["b","r"])) or (color2 == "b" and (color1 in ["b","r"])) or (color1 == "r" and color2 == "r") or (color1 == "g" and color2 == "g"))
+    def all_pairs_array(self):
+        """
+        Returns all pairs of cells that can be taken together, computed at once with NumPy.
 
-        pairs = []
-        for i in range(self.n):
-            for j in range(self.m):
-                if self.is_forbidden(i,j):
-                    continue
-                if i < self.n - 1:
-                    if not self.is_forbidden(i+1,j) and not is_color_matching_forbidden(i,j,i+1,j):
-                        pairs.append(((i,j), (i+1,j)))
-                if j < self.m - 1:
-                    if not self.is_forbidden(i,j+1) and not is_color_matching_forbidden(i,j,i,j+1):
-                        pairs.append(((i,j), (i,j+1)))
-                # No need to check for (i-1,j) and (i,j-1) because they were aalready checked before
+        Outputs an integer array of shape (k, 4) whose rows are (i1, j1, i2, j2), in the same order as all_pairs.
+        """
+        pairs = self.all_pairs_flat()
+        return np.stack([pairs[:, 0] // self.m, pairs[:, 0] % self.m, pairs[:, 1] // self.m, pairs[:, 1] % self.m], axis=1)
+
+    def all_pairs(self):
+        """
+        Returns a list of all pairs of cells that can be taken together. 
 
-        return pairs
+        Outputs a list of tuples of tuples [(c1, c2), (c1', c2'), ...] where each cell c1 etc. is itself a tuple (i, j)
+        """
+        return [((i1, j1), (i2, j2)) for i1, j1, i2, j2 in self.all_pairs_array().tolist()]
 
 
     @classmethod
@@ -331,28 +556,135 @@ class Grid():
         grid: Grid
             The grid
         """
-        with open(file_name, "r") as file:
-            n, m = map(int, file.readline().split())
-            color = [[] for i_line in range(n)]
-            for i_line in range(n):
-                line_color = list(map(int, file.readline().split()))
-                if len(line_color) != m: 
-                    raise Exception("Format incorrect")
-                for j in range(m):
-                    if line_color[j] not in range(5):
-                        raise Exception("Invalid color")
-                color[i_line] = line_color
-
-            if read_values:
-                value = [[] for i_line in range(n)]
-                for i_line in range(n):
-                    line_value = list(map(int, file.readline().split()))
-                    if len(line_value) != m: 
-                        raise Exception("Format incorrect")
-                    value[i_line] = line_value
-            else:
-                value = []
-
-            grid = Grid(n, m, color, value)
+        # The whole file is read at once, and each line is parsed by NumPy (blank lines are ignored)
+        with open(file_name, "rb") as file:
+            lines = [line for line in file.read().splitlines() if line.strip()]
+        if not lines:
+            raise Exception("Format incorrect")
+        n, m = map(int, lines[0].split())
+
+        color = Grid.parse_lines(lines[1:n+1], n, m, max_value=4)
+        if read_values:
+            value = Grid.parse_lines(lines[n+1:2*n+1], n, m)
+        else:
+            value = []
+
+        grid = Grid(n, m, color, value)
         return grid
 
+    @staticmethod
+    def parse_lines(lines, n, m, max_value=None):
+        """
+        Parses n lines of m integers at once.
+
+        Parameters: 
+        -----------
+        lines: list[bytes]
+        n, m: int
+        max_value: int
+            If given, the integers must be in range(max_value + 1) (colors)
+
+        Output: 
+        -------
+        array: np.ndarray[int64]
+            An array of shape (n, m)
+
+        Raises "Format incorrect" if a line does not contain m integers, and "Invalid color" if an integer is not in range(max_value + 1),
+        for the first incorrect line (as when the file was read line by line).
+        """
+        if len(lines) != n:
+            raise Exception("Format incorrect")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error") # NumPy only warns when a line contains something else than integers
+            try:
+                rows = [np.fromstring(line, dtype=np.int64, sep=" ") for line in lines]
+            except (ValueError, DeprecationWarning):
+                raise Exception("Format incorrect")
+
+        sizes = np.fromiter(map(len, rows), dtype=np.int64, count=n)
+        first_incorrect_line = np.flatnonzero(sizes != m)[:1].tolist() + [n]
+        first_invalid_line = [n]
+        if max_value is not None and n > 0:
+            integers = np.concatenate(rows)
+            invalid = (integers < 0) | (integers > max_value)
+            first_invalid_line = (np.repeat(np.arange(n), sizes)[invalid][:1]).tolist() + [n]
+        if first_incorrect_line[0] < n and first_incorrect_line[0] <= first_invalid_line[0]:
+            raise Exception("Format incorrect")
+        if first_invalid_line[0] < n:
+            raise Exception("Invalid color")
+        return np.array(rows, dtype=np.int64).reshape(n, m)
+
+    @classmethod
+    def grid_from_binary_file(cls, file_name, memory_map=True):
+        """
+        Creates a grid object from class Grid, initialized with the information from the binary file file_name (written by write_to_binary_file).
+
+        Parameters: 
+        -----------
+        file_name: str
+            Name of the file to load.
+        memory_map: bool
+            If True (default), the color and value planes are not read but mapped in memory with np.memmap (copy-on-write, so that the grid
+            can be modified without modifying the file): loading is near-instant, the pages of the file are only read when they are used.
+            If the values are not stored as int32, they are converted (and thus read) anyway.
+
+        Output: 
+        -------
+        grid: Grid
+            The grid
+        """
+        with open(file_name, "rb") as file:
+            header = file.read(BINARY_HEADER.size)
+        if len(header) != BINARY_HEADER.size:
+            raise Exception("Format incorrect")
+        magic, n, m, dtype = BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise Exception("Format incorrect")
+        try:
+            dtype = np.dtype(dtype.rstrip(b" ").decode())
+        except (TypeError, UnicodeDecodeError):
+            raise Exception("Format incorrect")
+        value_offset = BINARY_HEADER.size + -(-n*m // 8) * 8 # the color plane is padded to a multiple of 8 bytes
+        if os.path.getsize(file_name) < value_offset + n*m*dtype.itemsize:
+            raise Exception("Format incorrect")
+
+        if memory_map and n*m > 0:
+            color = np.memmap(file_name, dtype=np.int8, mode="c", offset=BINARY_HEADER.size, shape=(n, m))
+            value = np.memmap(file_name, dtype=dtype, mode="c", offset=value_offset, shape=(n, m))
+        else:
+            with open(file_name, "rb") as file:
+                file.seek(BINARY_HEADER.size)
+                color = np.fromfile(file, dtype=np.int8, count=n*m).reshape(n, m)
+                file.seek(value_offset)
+                value = np.fromfile(file, dtype=dtype, count=n*m).reshape(n, m)
+        if n*m > 0 and (color.min() < 0 or color.max() > 4):
+            raise Exception("Invalid color")
+        return Grid(n, m, color, value)
+
+    def write_to_file(self, file_name):
+        """
+        Writes the grid (colors and values) in the text format read by grid_from_file (with read_values=True).
+
+        Parameters: 
+        -----------
+        file_name: str
+        """
+        with open(file_name, "w") as file:
+            file.write(f"{self.n} {self.m}\n")
+            for array in [self.color_array, self.value_array]:
+                for line in array.tolist():
+                    file.write(" ".join(map(str, line)) + "\n")
+
+    def write_to_binary_file(self, file_name):
+        """
+        Writes the grid (colors and values) in the binary format read by grid_from_binary_file.
+
+        Parameters: 
+        -----------
+        file_name: str
+        """
+        with open(file_name, "wb") as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, self.n, self.m, self.value_array.dtype.str.encode().ljust(8)))
+            file.write(np.ascontiguousarray(self.color_array, dtype=np.int8).tobytes())
+            file.write(bytes(-(self.n*self.m) % 8)) # padding, so that the values are aligned
+            file.write(np.ascontiguousarray(self.value_array).tobytes())
@@ -0,0 +1,94 @@
+# This will work if ran from the root folder
+# Joel Khayat and Allan Pariente
+"""
+Generator of random grids, to test the solvers on grids larger than the ones of the input/ folder (1000x1000, 5000x5000...).
+
+The generation is seeded, so that a grid can be generated again. The grids can be written in the text format (.in) read by Grid.grid_from_file,
+or in the binary format read by Grid.grid_from_binary_file (any other extension).
+
+Usage example (from the root folder):
+    python code/grid_generator.py 1000 1000 --seed 0 --black-density 0.2 --values uniform --value-range 1 10 --output input/large/grid1000.in
+"""
+import argparse
+import numpy as np
+from grid import Grid
+
+VALUE_DISTRIBUTIONS = ["uniform", "geometric", "constant"]
+
+def generate_grid(n, m, seed=None, color_weights=(1, 1, 1, 1, 1), black_density=None, value_distribution="uniform", value_range=(1, 10)):
+    """
+    Generates a random grid.
+
+    Parameters: 
+    -----------
+    n: int
+        Number of lines in the grid
+    m: int
+        Number of columns in the grid
+    seed: int
+        Seed of the random generator (None for a random seed)
+    color_weights: tuple[float]
+        Relative weights of the 5 colors (white, red, blue, green, black)
+    black_density: float
+        Probability that a cell is black. If given, it replaces the weight of black, and the other colors keep their relative weights.
+    value_distribution: str
+        "uniform" (all values of value_range equally likely), "geometric" (small values more frequent) or "constant" (all values equal to value_range[0])
+    value_range: tuple[int]
+        Minimal and maximal values (both included)
+
+    Output: 
+    -------
+    grid: Grid
+    """
+    if len(color_weights) != 5 or min(color_weights) < 0 or sum(color_weights) == 0:
+        raise Exception("Invalid color weights")
+    if value_distribution not in VALUE_DISTRIBUTIONS:
+        raise Exception("Invalid value distribution")
+    low, high = value_range
+    if low > high:
+        raise Exception("Invalid value range")
+
+    probabilities = np.array(color_weights, dtype=float) / sum(color_weights)
+    if black_density is not None:
+        if not 0 <= black_density <= 1:
+            raise Exception("Invalid black density")
+        others = probabilities[:4].sum()
+        probabilities[:4] = (1 - black_density) * (probabilities[:4] / others if others > 0 else 0.25)
+        probabilities[4] = black_density
+
+    generator = np.random.default_rng(seed)
+    color = generator.choice(5, size=(n, m), p=probabilities).astype(np.int8)
+    if value_distribution == "uniform":
+        value = generator.integers(low, high + 1, size=(n, m), dtype=np.int32)
+    elif value_distribution == "geometric":
+        # mean value around low + (high - low) / 4, values above high are clipped
+        value = low - 1 + generator.geometric(min(1, 4 / (high - low + 4)), size=(n, m))
+        value = np.minimum(value, high).astype(np.int32)
+    else:
+        value = np.full((n, m), low, dtype=np.int32)
+    return Grid(n, m, color, value)
+
+def write_grid(grid, file_name):
+    "writes the grid in the text format if file_name ends with .in, in the binary format otherwise"
+    if file_name.endswith(".in"):
+        grid.write_to_file(file_name)
+    else:
+        grid.write_to_binary_file(file_name)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a random grid.")
+    parser.add_argument("n", type=int, help="number of lines")
+    parser.add_argument("m", type=int, help="number of columns")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--color-weights", type=float, nargs=5, default=[1, 1, 1, 1, 1], metavar=("W", "R", "B", "G", "K"))
+    parser.add_argument("--black-density", type=float)
+    parser.add_argument("--values", choices=VALUE_DISTRIBUTIONS, default="uniform", help="distribution of the values")
+    parser.add_argument("--value-range", type=int, nargs=2, default=[1, 10], metavar=("MIN", "MAX"))
+    parser.add_argument("--output", required=True, help="output file: text format if it ends with .in, binary format otherwise")
+    args = parser.parse_args()
+
+    grid = generate_grid(args.n, args.m, args.seed, args.color_weights, args.black_density, args.values, args.value_range)
+    write_grid(grid, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# Joel Khayat and Allan Pariente
+"""
+Rendering layer of the grids, imported only when a grid is displayed (so that pygame is not imported by the solvers):
+the persistent renderer used by Grid.plotStep, and plot_grid, used by Grid.plot.
+
+The window (or an offscreen surface), the fonts, the logo and the rendered values are created once. Each frame only redraws the cells whose state
+(hidden, normal or selected) changed since the previous frame, and the text panel if its text changed, and only these rectangles are sent to the screen.
+"""
+import os
+import pygame
+
+COLORS = {
+    'w': (255, 255, 255),
+    'r': (255, 0, 0),
+    'b': (0, 0, 255),
+    'g': (0, 255, 0),
+    'k': (0, 0, 0)
+}
+TEXT_COLOR = (200, 200, 200)
+BORDER_COLOR = (100, 150, 200)
+LOGO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "ensae_logo.png")
+FOOTER = "Programming project - ENSAE Paris Joël Khayat & Allan Parienté.\nPress 'f' or click the cross to close the window."
+
+# states of a cell on the screen
+HIDDEN, NORMAL, SELECTED = 0, 1, 2
+
+class GridRenderer:
+    """
+    Attributes:
+    -----------
+    grid: Grid
+    cell_size: float
+        The size of a cell in pixels
+    screen: pygame.Surface
+        The window, or the offscreen surface given to the constructor
+    offscreen: bool
+        True if the renderer draws on an offscreen surface (nothing is sent to the display)
+    hidden: set[tuple[int]]
+        The cells of grid.plot_removed drawn as HIDDEN
+    selected: set[tuple[int]]
+        The cells of grid.selected_cells drawn as SELECTED
+    """
+
+    def __init__(self, grid, surface=None):
+        """
+        Parameters:
+        -----------
+        grid: Grid
+        surface: pygame.Surface
+            An offscreen surface of size self.size(grid) to draw on. By default, a window is opened.
+        """
+        self.grid = grid
+        self.cell_size = min(100, 500/max(grid.n, grid.m)) # The grid should not be too large (max 500px)
+        self.width, self.height = self.size(grid)
+        self.offscreen = surface is not None
+        if self.offscreen:
+            self.screen = surface
+        else:
+            self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+            pygame.display.set_caption("Un jeu de paires")
+
+        pygame.font.init()
+        # the values are not drawn when the cells are too small to read them
+        self.font_values = pygame.font.Font(None, int(self.cell_size/2)) if self.cell_size >= 12 else None
+        self.font_text = pygame.font.Font(None, 16)
+        self.glyphs = {} # rendered values
+        logo = pygame.image.load(LOGO_FILE)
+        self.logo = pygame.transform.scale(logo, (int(3*self.cell_size/4), int(self.cell_size)))
+        self.panel = pygame.Rect(0, int(self.grid.n*self.cell_size), int(self.width) + 1, int(self.height - self.grid.n*self.cell_size) + 1)
+
+        self.hidden, self.selected = set(), set()
+        self.hidden_list, self.hidden_count = None, 0 # grid.plot_removed and its length at the previous frame
+        self.text = None
+        self.drawn = False
+
+        # the rectangles of the cells, for the hit test of the clicks (they do not change anymore)
+        grid.rect_list = [self.cell_rect(i, j) for i in range(grid.n) for j in range(grid.m)]
+        grid.cells_list = [(i, j) for i in range(grid.n) for j in range(grid.m)]
+
+    @staticmethod
+    def size(grid):
+        "returns the size (width, height) in pixels of the window of the grid"
+        cell_size = min(100, 500/max(grid.n, grid.m))
+        # We choose max(m*cell_size, 500) because the text occupates a width of minimum 500px. The factor 3/2 is only aestehtic.
+        return max(grid.m*cell_size, 500), grid.n*cell_size + cell_size*3/2
+
+    def is_valid(self):
+        "returns False if the window of the renderer has been closed or replaced (pygame.quit or another pygame.display.set_mode)"
+        return self.offscreen or (pygame.display.get_init() and pygame.display.get_surface() is self.screen)
+
+    def cell_rect(self, i, j):
+        return pygame.Rect(j*self.cell_size, i*self.cell_size, self.cell_size, self.cell_size)
+
+    def cell_at(self, position):
+        """
+        Parameters:
+        -----------
+        position: tuple[int]
+            A position (x, y) in pixels, for instance event.pos of a click
+
+        Output:
+        -------
+        tuple[int]
+            The cell (i, j) at this position, or None if the position is not on the grid (computed from the cell size, in O(1))
+        """
+        x, y = position
+        i, j = int(y // self.cell_size), int(x // self.cell_size)
+        if 0 <= i < self.grid.n and 0 <= j < self.grid.m and x >= 0 and y >= 0:
+            return (i, j)
+        return None
+
+    def glyph(self, value):
+        "returns the rendered value (rendered once for each value)"
+        if value not in self.glyphs:
+            self.glyphs[value] = self.font_values.render(str(value), True, TEXT_COLOR)
+        return self.glyphs[value]
+
+    def draw_cell(self, i, j, state):
+        "draws the cell (i, j) in the given state, and returns its rectangle"
+        rect = self.cell_rect(i, j)
+        if state == HIDDEN:
+            pygame.draw.rect(self.screen, COLORS['k'], rect)
+            return rect
+        pygame.draw.rect(self.screen, COLORS[self.grid.colors_list[self.grid.color[i][j]]], rect)
+        if self.font_values is not None:
+            glyph = self.glyph(self.grid.value[i][j])
+            self.screen.set_clip(rect)
+            self.screen.blit(glyph, glyph.get_rect(center=rect.center))
+            self.screen.set_clip(None)
+        if state == SELECTED:
+            pygame.draw.rect(self.screen, BORDER_COLOR, rect, 3)
+        return rect
+
+    def draw_panel(self, text):
+        "draws the text and the logo below the grid, and returns the rectangle of the panel"
+        self.screen.fill(COLORS['k'], self.panel)
+        for i, line in enumerate(text.split("\n")):
+            text_surface = self.font_text.render(line, True, TEXT_COLOR)
+            self.screen.blit(text_surface, text_surface.get_rect(topleft=(self.cell_size, self.height - self.cell_size*5/4 + i*16)))
+        self.screen.blit(self.logo, self.logo.get_rect(topleft=(self.cell_size/8, self.height - self.cell_size*5/4)))
+        return self.panel
+
+    def state(self, cell):
+        if cell in self.hidden:
+            return HIDDEN
+        return SELECTED if cell in self.selected else NORMAL
+
+    def changed_cells(self):
+        """
+        Updates self.hidden and self.selected, and returns the cells whose state changed since the previous frame.
+        grid.plot_removed usually only grows: then only its new cells are read.
+        """
+        plot_removed = self.grid.plot_removed
+        if plot_removed is self.hidden_list and len(plot_removed) >= self.hidden_count:
+            changed = set(plot_removed[self.hidden_count:]) - self.hidden
+            self.hidden |= changed
+        else:
+            hidden = set(plot_removed)
+            changed = hidden ^ self.hidden
+            self.hidden = hidden
+        self.hidden_list, self.hidden_count = plot_removed, len(plot_removed)
+        selected = set(self.grid.selected_cells)
+        changed |= selected ^ self.selected
+        self.selected = selected
+        return changed
+
+    def render(self, bot_explanation):
+        """
+        Parameters:
+        -----------
+        bot_explanation: str
+            The text displayed below the grid
+
+        Draws the grid (only what changed since the previous call) and the text, and updates the changed parts of the screen.
+
+        Output:
+        -------
+        list[pygame.Rect]
+            The rectangles which have been redrawn
+        """
+        text = bot_explanation + "\n\n" + FOOTER
+        changed = self.changed_cells()
+        if not self.drawn:
+            self.screen.fill(COLORS['k'])
+            for i in range(self.grid.n):
+                for j in range(self.grid.m):
+                    self.draw_cell(i, j, self.state((i, j)))
+            self.draw_panel(text)
+            dirty = [self.screen.get_rect()]
+            self.drawn = True
+        else:
+            dirty = [self.draw_cell(i, j, self.state((i, j))) for (i, j) in changed]
+            if text != self.text:
+                dirty.append(self.draw_panel(text))
+        self.text = text
+        if not self.offscreen and dirty:
+            pygame.display.update(dirty)
+        return dirty
+
+
+def plot_grid(grid):
+    """
+    Plots the graphic representation of the grid (Grid.plot), in a window which stays open until it is closed.
+
+    Press 'f' to close the window.
+    Warning : does not work when window is too large
+    """
+
+    cell_size = min(100, 500/max(grid.n, grid.m)) # The grid should not be too large (max 500px)
+    width, height = max(grid.m*cell_size, 500), grid.n*cell_size + cell_size*5/4 
+    # We choose max(grid.m*cell_size, 500) because the text occupates a width of minimum 500px. 
+    # The factor 5/4 is only aestehtic.
+    screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+    pygame.display.set_caption("Un jeu de paires")
+    
+    colorsDict = {
+        'w': (255, 255, 255),
+        'r': (255, 0, 0),
+        'b': (0, 0, 255),
+        'g': (0, 255, 0),
+        'k': (0, 0, 0)
+    }
+
+    pygame.font.init()
+    font_values = pygame.font.Font(None, int(cell_size/2))
+    font_text = pygame.font.Font(None, 16)
+    
+    # Drawing our grid
+    def draw_grid():
+        screen.fill(colorsDict['k'])
+        for i in range(grid.n):
+            for j in range(grid.m):
+                if (i,j) in grid.removed:
+                    continue
+                rect = pygame.Rect(j*cell_size, i*cell_size, cell_size, cell_size)
+                colorRect = grid.colors_list[grid.color[i][j]]
+                pygame.draw.rect(screen, colorsDict[colorRect], rect)
+
+                value_surface = font_values.render(str(grid.value[i][j]), True, (200, 200, 200))
+                value_rect = value_surface.get_rect(center=rect.center)
+                screen.blit(value_surface, value_rect)
+        pygame.display.update()
+    
+    draw_grid()
+
+    # Printing a logo and text
+    text = "Programming project - ENSAE Paris Joël Khayat & Allan Parienté.\nPress 'f' or click the cross to close the window."
+    textList = text.split("\n")
+
+    logo = pygame.image.load(LOGO_FILE)
+    logo = pygame.transform.scale(logo,(int(3*cell_size/4), cell_size))
+
+    logo_rect = logo.get_rect()
+    logo_rect.topleft = (cell_size/8, height - cell_size*9/8)
+
+    # The text has to be printed in several lines
+    for i in range(len(textList)):
+        rect_text = pygame.Rect(cell_size, height - cell_size + i*16, cell_size, cell_size)
+        text_surface = font_text.render(textList[i], True, (200, 200, 200))
+        text_rect = text_surface.get_rect(topleft=rect_text.topleft)
+        screen.blit(text_surface, text_rect)
+    
+    screen.blit(logo, logo_rect)
+    
+    pygame.display.update()
+
+    # Waiting for the user to close the window
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_f:
+                    running = False
+    pygame.quit()
@@ -0,0 +1,116 @@
+# Joel Khayat and Allan Pariente
+from collections import deque
+
+class HopcroftKarp:
+    """
+    Attributes:
+    -----------
+    adjency: list[list[int]]
+        adjency[u] is the list of the right vertices adjacent to the left vertex u
+    match_left: list[int]
+        match_left[u] is the right vertex matched with u (-1 if u is not matched)
+    match_right: list[int]
+        match_right[v] is the left vertex matched with v (-1 if v is not matched)
+
+    Maximum cardinality matching in a bipartite graph, using the Hopcroft-Karp algorithm: O(E sqrt(V)) time and O(V+E) memory.
+    """
+    def __init__(self, numLeft, numRight, edges):
+        """
+        Parameters:
+        -----------
+        numLeft: int
+        numRight: int
+        edges: list[(int, int)]
+            The edges (left vertex, right vertex)
+
+        Defines the adjency lists of the bipartite graph.
+        """
+        self.adjency = [[] for u in range(numLeft)]
+        for u, v in edges:
+            self.adjency[u].append(v)
+        self.match_left = [-1] * numLeft
+        self.match_right = [-1] * numRight
+        self.layer = [-1] * numLeft
+
+    def bfs(self):
+        """
+        No parameter.
+
+        Output:
+        -------
+        bool
+
+        Computes the layers of the left vertices (distance from the free left vertices in the alternating graph), using breadth-first algorithm.
+        Returns True if there is an augmenting path, False otherwise.
+        """
+        queue = deque()
+        for u in range(len(self.adjency)):
+            if self.match_left[u] == -1:
+                self.layer[u] = 0
+                queue.append(u)
+            else:
+                self.layer[u] = -1
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in self.adjency[u]:
+                w = self.match_right[v]
+                if w == -1:
+                    found = True
+                elif self.layer[w] == -1:
+                    self.layer[w] = self.layer[u] + 1
+                    queue.append(w)
+        return found
+
+    def dfs(self, root):
+        """
+        Parameters:
+        -----------
+        root: int
+            A free left vertex
+
+        Output:
+        -------
+        bool
+
+        Looks for an augmenting path from root following the layers (iterative depth-first search, to avoid the recursion limit on large grids),
+        and augments the matching along it (using side effect). Returns True if such a path has been found.
+        """
+        stack = [root]
+        position = {root: 0} # index of the next edge to explore for each vertex of the stack
+        while stack:
+            u = stack[-1]
+            if position[u] == len(self.adjency[u]):
+                self.layer[u] = -1 # dead end, this vertex will not be explored again in this phase
+                stack.pop()
+                continue
+            v = self.adjency[u][position[u]]
+            position[u] += 1
+            w = self.match_right[v]
+            if w == -1:
+                # augmenting path found: the vertices of the stack are matched with the next right vertex of their path
+                for u in reversed(stack):
+                    v = self.adjency[u][position[u] - 1]
+                    self.match_left[u], self.match_right[v] = v, u
+                return True
+            if self.layer[w] == self.layer[u] + 1:
+                stack.append(w)
+                position[w] = 0
+        return False
+
+    def max_matching(self):
+        """
+        No parameter.
+
+        Output:
+        -------
+        int
+
+        Returns the size of a maximum matching, and updates match_left and match_right (using side effect).
+        """
+        size = 0
+        while self.bfs():
+            for u in range(len(self.adjency)):
+                if self.match_left[u] == -1 and self.dfs(u):
+                    size += 1
+        return size
@@ -0,0 +1,141 @@
+# Joel Khayat and Allan Pariente
+from heapq import heappush, heappop
+
+class IncrementalAssignment:
+    """
+    Attributes:
+    -----------
+    adjency: list[list[(int, int)]]
+        adjency[row] is the list of the edges (column, cost) of row
+    row_dual: list[int]
+    column_dual: list[int]
+    column_for_row: list[int]
+    row_for_column: list[int]
+    changed_rows: set[int]
+        The rows whose column changed since this set was last cleared (by the user of the class)
+
+    Minimum cost perfect assignment (every row is assigned to a column), using successive shortest paths (Dijkstra with potentials), as MinCostMatching,
+    but whose edges can be changed after a solve: the rows whose edges changed are unassigned, their dual variables are lowered so that the reduced costs
+    stay non negative, and only these rows are assigned again. The other rows keep their assignment and their dual variables (warm start).
+    Costs must be integers so that the potentials are exact, and a perfect assignment must exist.
+    """
+    def __init__(self, num_rows, num_columns):
+        self.adjency = [[] for row in range(num_rows)]
+        self.row_dual = [0] * num_rows
+        self.column_dual = [0] * num_columns
+        self.column_for_row = [-1] * num_rows
+        self.row_for_column = [-1] * num_columns
+        self.changed_rows = set()
+
+    def set_row_edges(self, row, edges):
+        """
+        Parameters:
+        -----------
+        row: int
+        edges: list[(int, int)]
+            The new edges (column, cost) of row
+
+        Replaces the edges of row, and unassigns it (it will be assigned again by solve).
+        """
+        self.adjency[row] = edges
+        column = self.column_for_row[row]
+        if column != -1:
+            self.row_for_column[column] = -1
+            self.column_for_row[row] = -1
+            self.changed_rows.add(row)
+        # the largest dual variable for which every reduced cost of the row is non negative
+        self.row_dual[row] = min(cost - self.column_dual[column] for column, cost in edges)
+
+    def assign(self, row, column):
+        """
+        Assigns row to column, which must be free and tight (reduced cost 0), without any search (to start from a known assignment).
+        """
+        self.column_for_row[row], self.row_for_column[column] = column, row
+        self.changed_rows.add(row)
+
+    def find_augmenting_path(self, current_row):
+        """
+        Parameters:
+        -----------
+        current_row: int
+
+        Output:
+        -------
+        Same as MinCostMatching.find_augmenting_path: sink_column, min_value, shortest_path_costs, column_path, scanned_columns
+
+        Dijkstra algorithm from current_row on the reduced costs (which are all non negative), stopping at the first free column.
+        """
+        adjency, row_dual, column_dual, row_for_column = self.adjency, self.row_dual, self.column_dual, self.row_for_column
+
+        shortest_path_costs = {}
+        column_path = {}
+        scanned_columns = []
+        done = set()
+        heap = []
+
+        row, row_cost = current_row, 0
+        while True:
+            base = row_cost - row_dual[row]
+            for column, edge_cost in adjency[row]:
+                if column in done:
+                    continue
+                cost = base + edge_cost - column_dual[column]
+                if cost < shortest_path_costs.get(column, float("inf")):
+                    shortest_path_costs[column] = cost
+                    column_path[column] = row
+                    # On ties, free columns are popped first to stop the search as soon as possible
+                    heappush(heap, (cost, row_for_column[column] != -1, column))
+
+            while True:
+                cost, _, column = heappop(heap)
+                if column not in done and cost == shortest_path_costs[column]:
+                    break
+            done.add(column)
+
+            if row_for_column[column] == -1:
+                return column, cost, shortest_path_costs, column_path, scanned_columns
+            scanned_columns.append(column)
+            row, row_cost = row_for_column[column], cost
+
+    def assign_row(self, current_row):
+        """
+        Parameters:
+        -----------
+        current_row: int
+
+        Assigns current_row along its shortest augmenting path and updates the dual variables (using side effect).
+        """
+        sink_column, min_value, shortest_path_costs, column_path, scanned_columns = self.find_augmenting_path(current_row)
+
+        # Updating the dual variables, so that the reduced costs stay non negative and are 0 on the assignment
+        self.row_dual[current_row] += min_value
+        for column in scanned_columns:
+            delta = min_value - shortest_path_costs[column]
+            self.row_dual[self.row_for_column[column]] += delta
+            self.column_dual[column] -= delta
+
+        # Augmenting the assignment along the path
+        column = sink_column
+        while True:
+            row = column_path[column]
+            self.row_for_column[column] = row
+            self.column_for_row[row], column = column, self.column_for_row[row]
+            self.changed_rows.add(row)
+            if row == current_row:
+                break
+
+    def solve(self, rows=None):
+        """
+        Parameters:
+        -----------
+        rows: list[int]
+            The rows which may be unassigned (default: all the rows)
+
+        Assigns the unassigned rows among rows. Returns the number of rows which have been assigned.
+        """
+        assigned = 0
+        for row in range(len(self.adjency)) if rows is None else rows:
+            if self.column_for_row[row] == -1:
+                self.assign_row(row)
+                assigned += 1
+        return assigned
@@ -0,0 +1,203 @@
+# Joel Khayat and Allan Pariente
+from heapq import heappush, heappop
+
+class MinCostMatching:
+    """
+    Attributes:
+    -----------
+    num_left: int
+    num_right: int
+    row_start: list[int]
+    column_index: list[int]
+    edge_cost: list[int]
+    row_dual: list[int]
+    column_dual: list[int]
+    column_for_row: list[int]
+    row_for_column: list[int]
+
+    Sparse minimum cost bipartite matching, using successive shortest paths (Dijkstra with potentials) on a CSR edge list.
+    The matching does not have to be perfect: every left vertex i also owns a "dummy" right vertex num_right + i with cost 0,
+    which means that i stays unmatched. Hence only edges with a negative cost are worth being chosen.
+    """
+    def __init__(self, num_left, num_right, edges):
+        """
+        Parameters:
+        -----------
+        num_left: int
+        num_right: int
+        edges: list[(int, int, int)]
+            Edges (left vertex, right vertex, cost). Costs must be integers so that the potentials are exact.
+
+        Defines the CSR representation of the graph (one row per left vertex, dummy column included).
+        """
+        self.num_left = num_left
+        self.num_right = num_right
+
+        degree = [1] * num_left # 1 for the dummy column of each row
+        for edge in edges:
+            degree[edge[0]] += 1
+        self.row_start = [0] * (num_left + 1)
+        for i in range(num_left):
+            self.row_start[i+1] = self.row_start[i] + degree[i]
+
+        self.column_index = [0] * self.row_start[num_left]
+        self.edge_cost = [0] * self.row_start[num_left]
+        position = self.row_start[:-1] # next free slot of each row
+        for (i, j, cost) in edges:
+            self.column_index[position[i]] = j
+            self.edge_cost[position[i]] = cost
+            position[i] += 1
+        for i in range(num_left):
+            self.column_index[position[i]] = num_right + i
+
+        num_columns = num_right + num_left
+        self.row_dual = [0] * num_left
+        self.column_dual = [0] * num_columns
+        self.column_for_row = [-1] * num_left
+        self.row_for_column = [-1] * num_columns
+
+    @classmethod
+    def from_arrays(cls, num_left, num_right, rows, columns, costs):
+        """
+        Parameters:
+        -----------
+        num_left: int
+        num_right: int
+        rows, columns, costs: np.ndarray[int]
+            The edges (rows[k], columns[k]) and their costs, as arrays (no list of tuples is built)
+
+        Same as MinCostMatching(num_left, num_right, list(zip(rows, columns, costs))), with the CSR representation built by NumPy.
+        """
+        import numpy as np
+        matching = cls(num_left, num_right, [])
+        rows = np.asarray(rows, dtype=np.int64)
+        # each row keeps its edges in their order, followed by its dummy column
+        order = np.argsort(np.concatenate([rows, np.arange(num_left)]), kind="stable")
+        column_index = np.concatenate([np.asarray(columns, dtype=np.int64), num_right + np.arange(num_left)])
+        edge_cost = np.concatenate([np.asarray(costs, dtype=np.int64), np.zeros(num_left, dtype=np.int64)])
+        degree = np.bincount(rows, minlength=num_left) + 1
+        matching.row_start = np.concatenate([[0], np.cumsum(degree)]).tolist()
+        matching.column_index = column_index[order].tolist()
+        matching.edge_cost = edge_cost[order].tolist()
+        return matching
+
+    def find_augmenting_path(self, current_row):
+        """
+        Parameters:
+        -----------
+        current_row: int
+
+        Output:
+        -------
+        sink_column: int
+            The free column ending the shortest augmenting path starting from current_row.
+        min_value: int
+            The (reduced) cost of this path.
+        shortest_path_costs: dict[int, int]
+        column_path: dict[int, int]
+            The row from which each reached column has been reached.
+        scanned_columns: list[int]
+            The matched columns scanned before the sink, whose duals have to be updated.
+
+        Dijkstra algorithm from current_row on the reduced costs, stopping at the first free column.
+        """
+        row_start, column_index, edge_cost = self.row_start, self.column_index, self.edge_cost
+        row_dual, column_dual, row_for_column = self.row_dual, self.column_dual, self.row_for_column
+
+        shortest_path_costs = {}
+        column_path = {}
+        scanned_columns = []
+        done = set()
+        heap = []
+
+        row, row_cost = current_row, 0
+        while True:
+            # Reduced costs are non negative for every row already assigned, so Dijkstra algorithm is valid
+            # (only the edges of current_row can be negative, and they all start from the source)
+            base = row_cost - row_dual[row]
+            for k in range(row_start[row], row_start[row+1]):
+                column = column_index[k]
+                if column in done:
+                    continue
+                cost = base + edge_cost[k] - column_dual[column]
+                if cost < shortest_path_costs.get(column, float("inf")):
+                    shortest_path_costs[column] = cost
+                    column_path[column] = row
+                    # On ties, free columns are popped first to stop the search as soon as possible
+                    heappush(heap, (cost, row_for_column[column] != -1, column))
+
+            while True:
+                cost, _, column = heappop(heap)
+                if column not in done and cost == shortest_path_costs[column]:
+                    break
+            done.add(column)
+
+            if row_for_column[column] == -1:
+                return column, cost, shortest_path_costs, column_path, scanned_columns
+            scanned_columns.append(column)
+            row, row_cost = row_for_column[column], cost
+
+    def assign_row(self, current_row):
+        """
+        Parameters:
+        -----------
+        current_row: int
+
+        Assigns current_row along its shortest augmenting path and updates the dual variables (using side effect).
+        """
+        sink_column, min_value, shortest_path_costs, column_path, scanned_columns = self.find_augmenting_path(current_row)
+
+        # Updating the dual variables, so that the reduced costs stay non negative and are 0 on the matching
+        self.row_dual[current_row] += min_value
+        for column in scanned_columns:
+            delta = min_value - shortest_path_costs[column]
+            self.row_dual[self.row_for_column[column]] += delta
+            self.column_dual[column] -= delta
+
+        # Augmenting the matching along the path
+        column = sink_column
+        while True:
+            row = column_path[column]
+            self.row_for_column[column] = row
+            self.column_for_row[row], column = column, self.column_for_row[row]
+            if row == current_row:
+                break
+
+    def solve(self):
+        """
+        No parameter.
+
+        Output:
+        -------
+        tuple (matching, cost)
+          matching: list[tuple[int]]
+            The pairs (left vertex, right vertex) of the matching
+          cost: int
+            The total cost of the matching
+        """
+        for row in range(self.num_left):
+            if self.column_for_row[row] == -1:
+                self.assign_row(row)
+
+        matching = [(row, self.column_for_row[row]) for row in range(self.num_left) if self.column_for_row[row] < self.num_right]
+        return matching, self.matching_cost(matching)
+
+    def matching_cost(self, matching):
+        """
+        Parameters:
+        -----------
+        matching: list[tuple[int]]
+
+        Output:
+        -------
+        int
+
+        Returns the total cost of the edges of the matching.
+        """
+        cost = 0
+        for row, column in matching:
+            for k in range(self.row_start[row], self.row_start[row+1]):
+                if self.column_index[k] == column:
+                    cost += self.edge_cost[k]
+                    break
+        return cost
@@ -0,0 +1,205 @@
+# Joel Khayat and Allan Pariente
+"""
+Opt-in profiling of the solvers: time spent in each phase of a solve, number of calls of the Grid methods which enumerate the pairs, and peak memory.
+
+Profiling is disabled by default: each solver then has the shared NULL_PROFILER, whose phases are a reusable empty context manager, so that
+the instrumentation of the solvers costs one attribute lookup per phase. Once enable() has been called, each new solver gets its own Profiler,
+which watches the grid and traces the memory only while its run method runs: the report is built when run returns (solver.profiler.report),
+and written as one JSON line to the sink, if any. A solver which is never run leaves the grid and tracemalloc untouched.
+
+Usage example:
+    import profiling
+    profiling.enable(sink="profile.jsonl")
+    solver = SolverHungarianScipy(grid)
+    pairs, score = solver.run()
+    print(solver.profiler.report["phases"])
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# The methods of the grid whose calls are counted
+WATCHED_METHODS = ["all_pairs", "all_pairs_flat", "all_pairs_array", "is_forbidden", "forbidden_mask"]
+
+class NullProfiler:
+    "profiler of the solvers when profiling is disabled: it records nothing"
+    enabled = False
+    report = None
+    _phase = nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def count(self, name, calls=1):
+        pass
+
+    def start(self, grid):
+        pass
+
+    def finish(self):
+        return None
+
+NULL_PROFILER = NullProfiler()
+
+class Profiler:
+    """
+    Attributes:
+    -----------
+    name: str
+        The name of the profiled solver
+    sink: str or file
+        A file name or an open text file, to which the report is appended as one JSON line (None: no output)
+    measure_memory: bool
+        Whether the peak memory is measured with tracemalloc (which slows down the solve)
+    phases: dict[str, dict]
+        For each phase, its total time in seconds and its number of calls (nested phases are counted in their parent phase too)
+    counts: dict[str, int]
+        The number of calls of each watched method of the grid, and of the events counted by the solver
+    report: dict
+        The last report (None before the end of the first run)
+    """
+    enabled = True
+
+    def __init__(self, name, sink=None, measure_memory=True):
+        self.name = name
+        self.sink = sink
+        self.measure_memory = measure_memory
+        self.phases = {}
+        self.counts = {}
+        self.report = None
+        self.grid = None
+        self.wrapped = {} # for each method of the grid wrapped by this profiler, its wrapper and the previous attribute of the instance (if any)
+        self.start_time = None
+        self.own_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        "context manager which adds the time spent in it to the phase name"
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase = self.phases.setdefault(name, {"time": 0.0, "calls": 0})
+            phase["time"] += time.perf_counter() - start_time
+            phase["calls"] += 1
+
+    def count(self, name, calls=1):
+        self.counts[name] = self.counts.get(name, 0) + calls
+
+    def counted(self, name, method):
+        "returns method, counting its calls and adding its time to the phase grid.name"
+        def counted_method(*args, **kwargs):
+            if name not in self.wrapped: # left by finish under the wrapper of another profiler
+                return method(*args, **kwargs)
+            self.counts[name] = self.counts.get(name, 0) + 1
+            with self.phase("grid." + name):
+                return method(*args, **kwargs)
+        return counted_method
+
+    def start(self, grid):
+        """
+        Starts (or restarts, after finish) the profiling of a solve on grid: the watched methods of the grid are replaced by counting ones,
+        on the instance only, and the memory is traced.
+        """
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+        self.grid = grid
+        if not self.wrapped:
+            for name in WATCHED_METHODS:
+                if hasattr(grid, name):
+                    wrapper = self.counted(name, getattr(grid, name))
+                    self.wrapped[name] = (wrapper, grid.__dict__.get(name))
+                    setattr(grid, name, wrapper)
+        if self.measure_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.own_tracing = True
+
+    def finish(self):
+        """
+        Restores the methods of the grid wrapped by this profiler, stops tracing the memory (if this profiler started it), and returns the report
+        (also written to the sink):
+        dict with the keys "solver", "n", "m", "time" (since the first start), "phases", "counts" and "peak_memory" (in bytes, None if not measured).
+        """
+        for name, (wrapper, previous) in self.wrapped.items():
+            if self.grid.__dict__.get(name) is not wrapper: # wrapped again by another profiler, which restores this wrapper
+                continue
+            if previous is None:
+                del self.grid.__dict__[name]
+            else:
+                setattr(self.grid, name, previous)
+        self.wrapped = {}
+        peak_memory = None
+        if tracemalloc.is_tracing() and self.measure_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            if self.own_tracing:
+                tracemalloc.stop()
+                self.own_tracing = False
+        self.report = {
+            "solver": self.name,
+            "n": getattr(self.grid, "n", None),
+            "m": getattr(self.grid, "m", None),
+            "time": time.perf_counter() - self.start_time if self.start_time is not None else 0.0,
+            "phases": {name: dict(phase) for name, phase in self.phases.items()},
+            "counts": dict(self.counts),
+            "peak_memory": peak_memory,
+        }
+        if self.sink is not None:
+            write_record(self.sink, self.report)
+        return self.report
+
+def write_record(sink, record):
+    "appends record as one JSON line to sink (a file name or an open text file)"
+    line = json.dumps(record) + "\n"
+    if isinstance(sink, str):
+        with open(sink, "a") as file:
+            file.write(line)
+    else:
+        sink.write(line)
+
+def read_records(file_name):
+    "returns the records of a JSON lines file"
+    with open(file_name) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+# Settings of the profilers of the new solvers (None: profiling disabled)
+_settings = None
+
+def enable(sink=None, measure_memory=True):
+    """
+    Parameters:
+    -----------
+    sink: str or file
+        Where the reports are appended as JSON lines (None: the reports are only kept on the solvers)
+    measure_memory: bool
+        Whether the peak memory is measured with tracemalloc
+
+    Enables the profiling of the solvers created from now on.
+    """
+    global _settings
+    _settings = {"sink": sink, "measure_memory": measure_memory}
+
+def disable():
+    "disables the profiling of the solvers created from now on"
+    global _settings
+    _settings = None
+
+def is_enabled():
+    return _settings is not None
+
+@contextmanager
+def profiled(sink=None, measure_memory=True):
+    "context manager which enables the profiling of the solvers created in it"
+    global _settings
+    previous = _settings
+    enable(sink, measure_memory)
+    try:
+        yield
+    finally:
+        _settings = previous
+
+def new_profiler(name):
+    "returns the profiler of a new solver: NULL_PROFILER if profiling is disabled"
+    if _settings is None:
+        return NULL_PROFILER
+    return Profiler(name, **_settings)
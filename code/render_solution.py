@@ -0,0 +1,135 @@
+# This will work if ran from the root folder
+# Joel Khayat and Allan Pariente
+"""
+Headless rendering of the solutions of the solvers, without any window: the grid is drawn by a GridRenderer on an offscreen pygame.Surface,
+at full speed (no waiting between the steps), and saved as PNG images or as an animated GIF (which needs Pillow).
+
+Usage examples (from the root folder):
+    python code/render_solution.py input/grid0*.in --solver min_cost_matching --output-dir renders
+    python code/render_solution.py input/grid05.in --mode steps --output-dir renders
+    python code/render_solution.py input/grid1*.in --mode gif --every 5 --output-dir renders
+"""
+import argparse
+import os
+import pygame
+from grid import Grid
+from grid_renderer import GridRenderer
+from solver import SOLVERS
+from batch_solve import find_grid_files, load_grid
+
+MODES = ["final", "steps", "gif"]
+
+def render_frames(grid, pairs, text="", every=1):
+    """
+    Parameters:
+    -----------
+    grid: Grid
+        The grid (it is not modified)
+    pairs: list[tuple[tuple[int]]]
+        The pairs of a solution, in the order in which they are played
+    text: str
+        The text displayed below the grid
+    every: int
+        Only one step out of every is rendered
+
+    Output:
+    -------
+    Generator of pygame.Surface: the initial grid, the grid with the pair selected at each step, and the final grid.
+    The same surface is updated and yielded at each step (copy it to keep a frame).
+    """
+    board = Grid(grid.n, grid.m, grid.color_array, grid.value_array)
+    renderer = GridRenderer(board, pygame.Surface([int(size) for size in GridRenderer.size(board)]))
+    renderer.render(text)
+    yield renderer.screen
+    for step, (cell1, cell2) in enumerate(pairs):
+        board.selected_cells = [cell1, cell2]
+        if step % every == 0:
+            renderer.render(text)
+            yield renderer.screen
+        board.plot_removed += [cell1, cell2]
+    board.selected_cells = []
+    renderer.render(text)
+    yield renderer.screen
+
+def render_final(grid, pairs, file_name, text=""):
+    "saves the final grid (all the pairs removed) as a PNG image"
+    for surface in render_frames(grid, pairs, text, every=len(pairs) + 1):
+        pass
+    pygame.image.save(surface, file_name)
+
+def render_steps(grid, pairs, output_dir, prefix, text="", every=1):
+    """
+    Saves the frames of render_frames as PNG images output_dir/prefix_00000.png, output_dir/prefix_00001.png, ...
+
+    Output:
+    -------
+    list[str]
+        The names of the images
+    """
+    file_names = []
+    for index, surface in enumerate(render_frames(grid, pairs, text, every)):
+        file_names.append(os.path.join(output_dir, f"{prefix}_{index:05d}.png"))
+        pygame.image.save(surface, file_names[-1])
+    return file_names
+
+def render_gif(grid, pairs, file_name, text="", every=1, duration=200):
+    """
+    Saves the frames of render_frames as an animated GIF, with duration milliseconds per frame (the last frame lasts 10 times longer).
+    Needs Pillow.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Pillow is needed to save animated GIF images (pip install pillow)")
+    frames = [Image.frombytes("RGB", surface.get_size(), pygame.image.tobytes(surface, "RGB")) for surface in render_frames(grid, pairs, text, every)]
+    durations = [duration] * (len(frames) - 1) + [10 * duration]
+    frames[0].save(file_name, save_all=True, append_images=frames[1:], duration=durations, loop=0)
+
+def render_file(file_name, solver_name, output_dir, mode="final", every=1):
+    """
+    Parameters:
+    -----------
+    file_name: str
+        A grid file (.in or .bin)
+    solver_name: str
+        A key of SOLVERS
+    output_dir: str
+    mode: str
+        "final" (one PNG image of the final grid), "steps" (one PNG image per step) or "gif" (an animated GIF)
+    every: int
+        Only one step out of every is rendered (modes "steps" and "gif")
+
+    Output:
+    -------
+    tuple (score, output)
+        The score of the solver, and the name of the image (or the list of the names of the images in mode "steps")
+    """
+    pairs, score = SOLVERS[solver_name](load_grid(file_name)).run()
+    grid = load_grid(file_name)
+    text = f"{solver_name} on {os.path.basename(file_name)}: score {score}"
+    prefix = os.path.join(output_dir, os.path.splitext(os.path.basename(file_name))[0] + "_" + solver_name)
+    if mode == "steps":
+        return score, render_steps(grid, pairs, output_dir, os.path.basename(prefix), text, every)
+    if mode == "gif":
+        render_gif(grid, pairs, prefix + ".gif", text, every)
+        return score, prefix + ".gif"
+    render_final(grid, pairs, prefix + ".png", text)
+    return score, prefix + ".png"
+
+def main():
+    parser = argparse.ArgumentParser(description="Renders the solutions of a solver as images, without opening any window.")
+    parser.add_argument("paths", nargs="+", help="grid files (.in or .bin), folders or glob patterns")
+    parser.add_argument("--solver", default="min_cost_matching", choices=list(SOLVERS))
+    parser.add_argument("--mode", default="final", choices=MODES, help="final grid (PNG), every step (PNG images) or animation (GIF)")
+    parser.add_argument("--every", type=int, default=1, help="render only one step out of EVERY")
+    parser.add_argument("--output-dir", default=".", help="folder of the images")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    pygame.font.init()
+    for file_name in find_grid_files(args.paths):
+        score, output = render_file(file_name, args.solver, args.output_dir, args.mode, args.every)
+        print(file_name, score, "->", output if isinstance(output, str) else f"{len(output)} images", flush=True)
+
+if __name__ == "__main__":
+    main()
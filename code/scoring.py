@@ -0,0 +1,104 @@
+# Joel Khayat and Allan Pariente
+"""
+Vectorized scoring of lists of pairs.
+
+The score of a list of pairs is the sum of the costs |value1 - value2| of the pairs, plus the sum of the values of the unmatched cells,
+i.e. the cells which are not black, not removed and in no pair. Everything is computed with NumPy on the arrays of the grid, in O(cells + pairs).
+"""
+import numpy as np
+
+def pairs_to_array(pairs, m=None):
+    """
+    Parameters:
+    -----------
+    pairs: list[tuple[tuple[int]]] or np.ndarray
+        The pairs in the format ((i1, j1), (i2, j2)), or an integer array of shape (k, 4) whose rows are (i1, j1, i2, j2),
+        or an integer array of shape (k, 2) of flat indices (i1*m + j1, i2*m + j2)
+    m: int
+        Number of columns of the grid (only needed for flat indices)
+
+    Output:
+    -------
+    np.ndarray[int]
+        Array of shape (k, 4)
+    """
+    pairs = np.asarray(pairs, dtype=np.intp)
+    if pairs.ndim == 2 and pairs.shape[1] == 2:
+        rows, columns = np.divmod(pairs, m)
+        return np.stack([rows[:, 0], columns[:, 0], rows[:, 1], columns[:, 1]], axis=1)
+    return pairs.reshape(-1, 4)
+
+def flat_cells(pairs, m):
+    """
+    Returns the flat indices (cells1, cells2) of the two cells of the pairs (see pairs_to_array), without building the array of shape (k, 4)
+    for flat pairs.
+    """
+    pairs = np.asarray(pairs)
+    if pairs.ndim == 2 and pairs.shape[1] == 2:
+        return pairs[:, 0], pairs[:, 1]
+    pairs = pairs_to_array(pairs)
+    return pairs[:, 0] * m + pairs[:, 1], pairs[:, 2] * m + pairs[:, 3]
+
+def pairs_score(value, free, pairs):
+    """
+    Parameters:
+    -----------
+    value: np.ndarray[int]
+        The values of the cells, array of shape (n, m)
+    free: np.ndarray[bool]
+        free[i, j] is True if the cell (i, j) is neither black nor removed
+    pairs: list[tuple[tuple[int]]] or np.ndarray
+        The pairs (see pairs_to_array)
+
+    Output:
+    -------
+    int
+        The score of the pairs
+    """
+    cells1, cells2 = flat_cells(pairs, value.shape[1])
+    flat_value = value.ravel()
+    values1 = flat_value[cells1].astype(np.int64)
+    values2 = flat_value[cells2].astype(np.int64)
+    unmatched = free.ravel().copy()
+    unmatched[cells1] = False
+    unmatched[cells2] = False
+    return int(np.abs(values1 - values2).sum() + flat_value[unmatched].sum(dtype=np.int64))
+
+def batch_scores(value, free, pair_sets):
+    """
+    Scores several lists of pairs at once (for instance the candidate solutions of a search), with a single pass over all their pairs.
+
+    Parameters:
+    -----------
+    value: np.ndarray[int]
+        The values of the cells, array of shape (n, m)
+    free: np.ndarray[bool]
+        free[i, j] is True if the cell (i, j) is neither black nor removed
+    pair_sets: list of lists of pairs, or np.ndarray of shape (s, k, 4)
+        The lists of pairs. In each list, a cell must be in at most one pair
+
+    Output:
+    -------
+    np.ndarray[int]
+        scores[s] is the score of the s-th list of pairs
+    """
+    arrays = [pairs_to_array(pairs, value.shape[1]) for pairs in pair_sets]
+    if not arrays:
+        return np.zeros(0, dtype=np.int64)
+    pairs = np.concatenate(arrays)
+    values1 = value[pairs[:, 0], pairs[:, 1]].astype(np.int64)
+    values2 = value[pairs[:, 2], pairs[:, 3]].astype(np.int64)
+    # a pair adds its cost, and removes the values of its free cells from the unmatched cells
+    delta = np.abs(values1 - values2) - values1 * free[pairs[:, 0], pairs[:, 1]] - values2 * free[pairs[:, 2], pairs[:, 3]]
+    cumulated = np.concatenate(([0], np.cumsum(delta)))
+    lengths = np.array([len(array) for array in arrays])
+    ends = np.cumsum(lengths)
+    return value[free].sum(dtype=np.int64) + cumulated[ends] - cumulated[ends - lengths]
+
+def grid_score(grid, pairs):
+    "score of the pairs on the grid (the cells of the pairs may already be in grid.removed, as the solvers remove them)"
+    return pairs_score(grid.value_array, ~grid.forbidden_mask(), pairs)
+
+def grid_batch_scores(grid, pair_sets):
+    "scores of several lists of pairs on the grid (see batch_scores)"
+    return batch_scores(grid.value_array, ~grid.forbidden_mask(), pair_sets)
@@ -0,0 +1,161 @@
+# Joel Khayat and Allan Pariente
+"""
+Cache of the solutions (pairs, score) of the solvers, keyed by the content of the grid.
+
+The key is a SHA-256 hash of the size, the color plane, the value plane and the removed cells of the grid, and of the name of the solver:
+the same grid read from two files (or from a text and a binary file) has the same key.
+The solutions are stored in a SQLite database (the pairs as a compact int32 array), with an in-memory LRU layer in front of it.
+When the database is larger than max_bytes, the least recently used solutions are evicted. The size of the database is read once when it is opened,
+then kept up to date by each insertion and deletion (the solutions inserted by the other processes sharing the file are counted when it is opened again).
+"""
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+import numpy as np
+from solver import SOLVERS
+
+class SolutionCache:
+    """
+    Attributes:
+    -----------
+    path: str
+        The SQLite database (":memory:" for a cache which is not kept on disk)
+    memory_size: int
+        Maximum number of solutions kept in the in-memory LRU layer
+    max_bytes: int
+        Maximum total size of the pairs stored in the database
+    stats: dict[str, int]
+        Number of memory hits, disk hits, misses and evictions
+    total_bytes: int
+        Total size of the pairs stored in the database
+    """
+
+    def __init__(self, path=":memory:", memory_size=128, max_bytes=256 * 2**20):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, pairs BLOB, score INTEGER, size INTEGER, last_used REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+        self.connection.commit()
+        self.total_bytes = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+
+    @staticmethod
+    def key(grid, solver_name):
+        """
+        Parameters:
+        -----------
+        grid: Grid
+        solver_name: str
+
+        Output:
+        -------
+        str
+            The hexadecimal SHA-256 hash of the grid content and of the solver name
+        """
+        digest = hashlib.sha256()
+        digest.update(np.array([grid.n, grid.m], dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(grid.color_array, dtype=np.int8).tobytes())
+        digest.update(np.ascontiguousarray(grid.value_array, dtype=np.int64).tobytes())
+        digest.update(np.packbits(grid.removed.mask).tobytes())
+        digest.update(solver_name.encode())
+        return digest.hexdigest()
+
+    def get(self, grid, solver_name, key=None):
+        """
+        Returns the cached solution (pairs, score) of the solver on the grid, or None. The pairs are a new list on each call.
+        """
+        key = key or self.key(grid, solver_name)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            pairs, score = self.memory[key]
+            return list(pairs), score
+        row = self.connection.execute("SELECT pairs, score FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["disk_hits"] += 1
+        self.connection.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.connection.commit()
+        pairs = [((i1, j1), (i2, j2)) for i1, j1, i2, j2 in np.frombuffer(row[0], dtype=np.int32).reshape(-1, 4).tolist()]
+        self.remember(key, pairs, row[1])
+        return list(pairs), row[1]
+
+    def put(self, grid, solver_name, pairs, score, key=None):
+        "stores the solution (pairs, score) of the solver on the grid"
+        key = key or self.key(grid, solver_name)
+        score = int(score)
+        blob = np.array(pairs, dtype=np.int32).reshape(-1, 4).tobytes()
+        replaced = self.connection.execute("SELECT size FROM solutions WHERE key = ?", (key,)).fetchone()
+        self.total_bytes += len(blob) - (replaced[0] if replaced else 0)
+        self.connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?)", (key, blob, score, len(blob), time.time()))
+        self.evict()
+        self.connection.commit()
+        self.remember(key, list(pairs), score)
+
+    def remember(self, key, pairs, score):
+        "adds a solution to the in-memory LRU layer"
+        self.memory[key] = (pairs, score)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def evict(self):
+        "deletes the least recently used solutions of the database until its size is at most max_bytes"
+        while self.total_bytes > self.max_bytes:
+            # the oldest solutions are read by small batches, as only a few of them are usually evicted
+            rows = self.connection.execute("SELECT key, size FROM solutions ORDER BY last_used LIMIT 16").fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self.connection.execute("DELETE FROM solutions WHERE key = ?", (key,))
+                self.memory.pop(key, None)
+                self.stats["evictions"] += 1
+                self.total_bytes -= size
+
+    def solve(self, grid, solver_name):
+        """
+        Parameters:
+        -----------
+        grid: Grid
+        solver_name: str
+            A key of SOLVERS
+
+        Output:
+        -------
+        tuple (pairs, score)
+            The cached solution if there is one (the solver is not run, and the grid is not modified), otherwise the solution of the solver, which is cached
+        """
+        key = self.key(grid, solver_name)
+        solution = self.get(grid, solver_name, key)
+        if solution is None:
+            pairs, score = SOLVERS[solver_name](grid).run()
+            self.put(grid, solver_name, pairs, score, key)
+            solution = list(pairs), int(score)
+        return solution
+
+    def hit_rate(self):
+        "returns the proportion of the lookups which were hits (0 if there was no lookup)"
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return hits / lookups if lookups else 0.
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def clear(self):
+        "deletes all the cached solutions"
+        self.connection.execute("DELETE FROM solutions")
+        self.connection.commit()
+        self.memory.clear()
+        self.total_bytes = 0
+
+    def close(self):
+        self.connection.close()
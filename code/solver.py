@@ -3,9 +3,17 @@
 from grid import *
 from numpy import sort
 import numpy as np
-from scipy.optimize import linear_sum_assignment
+from functools import partial, wraps
+from array import array
 from ford_fulkerson_algo import Graph
+from hopcroft_karp_algo import HopcroftKarp
 from hungarian_algo import HungarianAlgorithm
+from bipartite_problem import BipartiteProblem
+from min_cost_matching_algo import MinCostMatching
+from incremental_matching_algo import IncrementalAssignment
+from decomposition import solve_by_components
+from scoring import grid_score, grid_batch_scores
+import profiling
 
 
 class Solver:
@@ -17,9 +25,15 @@ class Solver:
     grid: Grid
         The grid
     pairs: list[tuple[tuple[int]]]
-        A list of pairs, each being a tuple ((i1, j1), (i2, j2))
+        A list of pairs, each being a tuple ((i1, j1), (i2, j2)). When the solver computes flat_pairs, the list is only built when it is read.
+    flat_pairs: np.ndarray[int32]
+        The same pairs as an array of shape (k, 2) of flat indices i*m + j, when the solver computes them this way (None otherwise)
+    tuple_output: bool
+        Whether run returns the pairs as tuples (False during run_flat)
     bot: str
         The string that will be displayed in the plot to explain which bot is playing
+    profiler: profiling.Profiler or profiling.NullProfiler
+        Records the time of the phases of the solve, if profiling.enable has been called before the creation of the solver (see profiling.py)
     """
 
     def __init__(self, grid):
@@ -33,7 +47,65 @@ class Solver:
         """
         self.grid = grid
         self.pairs = list()
+        self.flat_pairs = None
         self.bot = str()
+        self.profiler = profiling.new_profiler(type(self).__name__)
+
+    tuple_output = True
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        The run method of each solver is profiled (when profiling is enabled): the grid is watched and the memory traced only during run,
+        and the report of its profiler is finished when run returns. The work done by the constructors is timed by their phase "build".
+        """
+        super().__init_subclass__(**kwargs)
+        if "run" in cls.__dict__:
+            run = cls.run
+            @wraps(run)
+            def profiled_run(self, *args, **kwargs):
+                if not self.profiler.enabled:
+                    return run(self, *args, **kwargs)
+                self.profiler.start(self.grid)
+                try:
+                    return run(self, *args, **kwargs)
+                finally:
+                    self.profiler.finish()
+            cls.run = profiled_run
+
+    @property
+    def pairs(self):
+        if self._pairs is None: # built from flat_pairs at the first read
+            self._pairs = pairs_from_flat(self.flat_pairs, self.grid.m)
+        return self._pairs
+
+    @pairs.setter
+    def pairs(self, pairs):
+        self._pairs = pairs
+        self.flat_pairs = None
+
+    def run_flat(self):
+        """
+        No parameter.
+
+        Output:
+        -------
+        tuple (flat_pairs, score)
+          flat_pairs: np.ndarray[int32]
+            The pairs of run, as an array of shape (k, 2) of flat indices i*m + j
+          score: int
+
+        Same as run, but the list of tuples of the pairs is not built (on large grids, it is most of the memory used by the solvers).
+        """
+        self.tuple_output = False
+        try:
+            pairs, score = self.run()
+        finally:
+            self.tuple_output = True
+        return (self.flat_pairs if self.flat_pairs is not None else pairs_to_flat(pairs, self.grid.m).astype(np.int32)), score
+
+    def result(self):
+        "returns the output of run: (pairs, score), where the pairs are not converted to tuples during run_flat"
+        return (self.pairs if self.tuple_output else self.flat_pairs), self.score()
 
     def score(self):
         """
@@ -45,14 +117,35 @@ class Solver:
 
         Computes the score of the list of pairs in self.pairs
         """
-        listScore = sum([self.grid.cost(self.pairs[i]) for i in range(len(self.pairs))])
-        remainingCellsScore = sum([self.grid.value[i][j] for i in range(self.grid.n) for j in range(self.grid.m) if not self.grid.is_forbidden(i,j)])
-        return listScore + remainingCellsScore
+        with self.profiler.phase("score"):
+            return self.calc_score(self.pairs if self.flat_pairs is None else self.flat_pairs)
+
+    def set_flat_pairs(self, flat_pairs, remove=False):
+        """
+        Parameters:
+        -----------
+        flat_pairs: np.ndarray[int]
+            The pairs found by the solver, as an array of shape (k, 2) of flat indices
+        remove: bool
+            Whether the cells of the pairs are added to grid.removed
+
+        Keeps the pairs as an array in self.flat_pairs, which are converted to the tuples of self.pairs when they are read.
+        """
+        self.flat_pairs = np.asarray(flat_pairs, dtype=np.int32).reshape(-1, 2)
+        self._pairs = None
+        if remove:
+            self.grid.removed.extend_flat(self.flat_pairs)
     
     def calc_score(self, pairs):
-        listScore = sum([self.grid.cost(pairs[i]) for i in range(len(pairs))])
-        remainingCellsScore = sum([self.grid.value[i][j] for i in range(self.grid.n) for j in range(self.grid.m) if not self.grid.is_forbidden(i,j)])
-        return listScore + remainingCellsScore
+        "computes the score of a list of pairs: the costs of the pairs, plus the values of the cells which are not black, not removed and in no pair"
+        return grid_score(self.grid, pairs)
+
+    def calc_scores(self, pair_sets):
+        "computes the scores of several lists of pairs at once (each cell at most once per list), see scoring.batch_scores"
+        return grid_batch_scores(self.grid, pair_sets)
+
+# Number of pairs converted at once to Python integers by SolverGreedy (the temporary lists stay small)
+GREEDY_BLOCK = 1 << 12
 
 class SolverGreedy(Solver):
     """
@@ -78,63 +171,101 @@ class SolverGreedy(Solver):
           score: int
 
         At each step, the algorithm chooses the pair with the smallest cost with the highest values.
-        """
-        all_pairs = self.grid.all_pairs()
-        
-        while all_pairs != []:
-            # We choose only the pairs with the smallest costs
-            all_pairs.sort(key=lambda pair: self.grid.cost(pair))
 
-            # We choose only the pairs with the highest sum of their values (in the set of the pairs with the smallest costs) because it is better to eliminate firstly the squares with the highest values
-            min_pair = max(all_pairs, key=lambda pair: (self.grid.value[pair[0][0]][pair[0][1]] + self.grid.value[pair[1][0]][pair[1][1]] - abs(self.grid.value[pair[0][0]][pair[0][1]] - self.grid.value[pair[1][0]][pair[1][1]])))
-            self.pairs.append(min_pair)
-            self.grid.removed.append(min_pair[0])
-            self.grid.removed.append(min_pair[1])
-            all_pairs = self.grid.all_pairs()
+        The criterion of a pair never changes, so the pairs are sorted once by (highest value1 + value2 - |value1 - value2|, smallest cost, order in all_pairs):
+        a pair is then skipped when one of its cells has already been removed, instead of computing all the pairs again after each step.
+        """
+        with self.profiler.phase("build"):
+            pairs = self.grid.all_pairs_flat()
+            values = self.grid.value_array.ravel()
+            # value1 + value2 - |value1 - value2| = 2 min(value1, value2), and for the same minimum the smallest cost has the smallest maximum:
+            # sorting by (highest minimum, smallest maximum) keeps the pairs in int32 arrays, which matters on large grids
+            low, high = np.minimum(values[pairs[:, 0]], values[pairs[:, 1]]), np.maximum(values[pairs[:, 0]], values[pairs[:, 1]])
+            # np.lexsort sorts by the last key first, and is stable (so ties keep the order of all_pairs)
+            order = np.lexsort((high, -low))
+            del low, high
+
+        used = bytearray(self.grid.n * self.grid.m) # used[c] is 1 if the cell of flat index c has already been chosen
+        chosen = array("i") # the flat indices of the cells of the chosen pairs
+        with self.profiler.phase("solve"):
+            # the sorted pairs are read by blocks, so that only one block at a time is converted to Python integers
+            for start in range(0, len(order), GREEDY_BLOCK):
+                for cell1, cell2 in pairs[order[start:start + GREEDY_BLOCK]].tolist():
+                    if used[cell1] or used[cell2]:
+                        continue
+                    used[cell1] = used[cell2] = 1
+                    chosen.append(cell1)
+                    chosen.append(cell2)
+        del pairs, order # freed before the pairs are scored
+        self.set_flat_pairs(np.frombuffer(chosen, dtype=np.int32) if chosen else [], remove=True)
 
-        return self.pairs, self.score()
+        return self.result()
 
 class SolverMaxMatching(Solver):
     """
     Matching algorithm using the Ford-Fulkerson algorithm to determine the best path to choose in an equivalent flow problem.
+    In "hopcroft_karp" mode, the maximum matching of the bipartite graph (even cells, odd cells) is directly computed with the Hopcroft-Karp algorithm instead.
     
     Attributes:
     -----------
     grid: Grid
     pairs: list[tuple[tuple[int]]]
     bot: str
-    graph: Graph
-    nodes: list[tuple[int]]
+    mode: str
+        "ford_fulkerson" or "hopcroft_karp"
+    graph: Graph or HopcroftKarp
+    num_nodes: int
+        The node 0 is the source, the node num_nodes - 1 is the target, and the node 1 + j*n + i is the cell (i, j)
 
     No plot
     """
-    def __init__(self, grid):
+    def __init__(self, grid, mode="ford_fulkerson"):
         """
         Parameters:
             grid: Grid
                 The grid
+            mode: str
+                "ford_fulkerson" (default) or "hopcroft_karp"
         
         Defines the bipartite graph that represents our matching problem.
         """
         super().__init__(grid)
-        self.nodes = [(-1,-1)] + [(i,j) for j in range(self.grid.m) for i in range(self.grid.n)] + [(self.grid.n, self.grid.m)]
-        # (-1,-1) is the source, and (self.grid.n, self.grid.m) is the target
-        
+        if mode not in ["ford_fulkerson", "hopcroft_karp"]:
+            raise Exception("Invalid mode")
+        self.mode = mode
+        with self.profiler.phase("build"):
+            self.build_graph()
+
+    def node_of_cell(self, cells):
+        "returns the nodes of the cells given by their flat indices (np.ndarray)"
+        return 1 + (cells % self.grid.m) * self.grid.n + cells // self.grid.m
+
+    def cell_of_node(self, nodes):
+        "returns the flat indices of the cells of the nodes (np.ndarray)"
+        return (nodes - 1) % self.grid.n * self.grid.m + (nodes - 1) // self.grid.n
+
+    def build_graph(self):
+        "defines the nodes and the edges of the graph"
+        n = self.grid.n
+        self.num_nodes = n * self.grid.m + 2
+        target = self.num_nodes - 1
+
         # We create the edges
-        edges = []
-        for i in range(1,len(self.nodes)-1):
-            if (self.nodes[i][0] + self.nodes[i][1])%2 == 0: # Source is connected to all the "even pairs" and target is connected to all the "odd pairs"
-                edges.append((0,i,1))
-            else:
-                edges.append((i,len(self.nodes)-1,1))
-        for i in range(1,len(self.nodes)-1): # Even pairs are connected to adjacent allowed odd pairs
-            for j in range(1,len(self.nodes)-1):
-                if (self.nodes[i],self.nodes[j]) in self.grid.all_pairs():
-                    if (self.nodes[i][0] + self.nodes[i][1])%2 == 0:
-                        edges.append((i,j,1))
-                    if (self.nodes[j][0] + self.nodes[j][1])%2 == 0:
-                        edges.append((j,i,1))
-        self.graph = Graph(len(self.nodes), edges)
+        nodes = np.arange(1, target)
+        even = ((nodes - 1) % n + (nodes - 1) // n) % 2 == 0
+        # Source is connected to all the "even pairs" and target is connected to all the "odd pairs"
+        edges = [(0, node, 1) if is_even else (node, target, 1) for node, is_even in zip(nodes.tolist(), even.tolist())]
+        pairs = self.grid.all_pairs_flat().astype(np.int64)
+        first_is_even = (pairs[:, 0] // self.grid.m + pairs[:, 0] % self.grid.m) % 2 == 0
+        # Even pairs are connected to adjacent allowed odd pairs
+        even_nodes = self.node_of_cell(np.where(first_is_even, pairs[:, 0], pairs[:, 1]))
+        odd_nodes = self.node_of_cell(np.where(first_is_even, pairs[:, 1], pairs[:, 0]))
+        pair_edges = zip(even_nodes.tolist(), odd_nodes.tolist())
+        if self.mode == "hopcroft_karp":
+            # Only the edges between even and odd cells are needed (no source nor target)
+            self.graph = HopcroftKarp(self.num_nodes, self.num_nodes, pair_edges)
+        else:
+            self.graph = Graph(self.num_nodes, edges + [(i,j,1) for i, j in pair_edges])
 
     def run(self):
         """
@@ -146,20 +277,33 @@ class SolverMaxMatching(Solver):
           pairs: list[tuple[tuple[int]]]
           score: int
         """
+        if self.mode == "hopcroft_karp":
+            with self.profiler.phase("solve"):
+                self.graph.max_matching()
+            match = np.array(self.graph.match_left[:self.num_nodes - 1], dtype=np.int64)
+            left = np.flatnonzero(match[1:] != -1) + 1
+            self.set_flat_pairs(np.stack([self.cell_of_node(left), self.cell_of_node(match[left])], axis=1), remove=True)
+            return self.result()
+
         source = 0
         target = len(self.graph.adjency) - 1
-        max_flow = self.graph.ford_fulkerson(source, target)
+        with self.profiler.phase("solve"):
+            max_flow = self.graph.ford_fulkerson(source, target)
 
-        # We recover the matching pairs from the graph
+        # We recover the matching pairs from the graph, going through the edges starting from even cells
+        n = self.grid.n
+        matched = array("i")
         for i in range(1, len(self.graph.adjency) - 1):
-            for j in range(1, len(self.graph.adjency) - 1):
+            if ((i - 1) % n + (i - 1) // n) % 2 != 0:
+                continue
+            for j in self.graph.adjency[i]:
                 # We only choose the reversed edges (to find the best matching, equivalent to the maximal flow) because it means that flow went through that edge
-                if self.graph.adjency[j][i] > 0 and ((self.nodes[i], self.nodes[j]) in self.grid.all_pairs() or (self.nodes[j], self.nodes[i]) in self.grid.all_pairs()) and (self.nodes[i][0] + self.nodes[i][1]) % 2 == 0:
-                    self.pairs.append((self.nodes[i], self.nodes[j]))
-                    self.grid.removed.append(self.nodes[i])
-                    self.grid.removed.append(self.nodes[j])
+                if j != source and self.graph.capacity(j, i) > 0:
+                    matched.append(i)
+                    matched.append(j)
+        self.set_flat_pairs(self.cell_of_node(np.array(matched, dtype=np.int64)).reshape(-1, 2), remove=True)
 
-        return self.pairs, self.score()
+        return self.result()
 
 class SolverHungarian(Solver):
     "solver using hungarian algorithm without using scipy"
@@ -168,244 +312,300 @@ class SolverHungarian(Solver):
         super().__init__(grid)
         self.grid = grid
 
-    def compute_score(self, pairs):
-        "compute the total score of a list of pairs"
-        # because the call to self.score() didn't work and we didn't have time to fix it
-        used_cells = set()
-        score = 0
+    def run(self):
+        "solve the problem using the hungarian algorithm"
+        # build the cost matrix (even cells against odd cells)
+        with self.profiler.phase("build"):
+            problem = BipartiteProblem(self.grid)
+            cost_matrix = problem.dense_matrix()
 
-        # sum of absolute differences for the pairs
-        for (i1, j1), (i2, j2) in pairs:
-            score += abs(self.grid.value[i1][j1] - self.grid.value[i2][j2])
-            used_cells.add((i1, j1))
-            used_cells.add((i2, j2))
+        # apply hungarian algorithm
+        with self.profiler.phase("solve"):
+            assignment = HungarianAlgorithm().my_linear_sum_assignment(cost_matrix)
 
-        # sum of values of unmatched cells (except if black !)
-        for i in range(self.grid.n):
-            for j in range(self.grid.m):
-                if (i, j) not in used_cells and not self.grid.is_forbidden(i, j):
-                    score += self.grid.value[i][j]
+        # build the pairs and compute the score
+        with self.profiler.phase("pairs"):
+            self.set_flat_pairs(problem.flat_pairs(*assignment))
+        return self.result()
 
-        return score
+
+class SolverHungarianScipy(Solver):
+    """
+    solver using the hungarian algorithm linear_sum_assignment from scipy.optimize, to compare with our own implementation.
+    With sparse=True, the sparse matrix of the pairs is solved by min_weight_full_bipartite_matching from scipy.sparse.csgraph instead
+    (the dense matrix is never built, which is much lighter on large grids).
+    """
+
+    def __init__(self, grid, sparse=False):
+        super().__init__(grid)
+        self.grid = grid
+        self.sparse = sparse
 
     def run(self):
         "solve the problem using the hungarian algorithm"
-        # build the cost matrix
-        n, m = self.grid.n, self.grid.m
-        pairs = self.grid.all_pairs()
-        even_cells = []
-        odd_cells = []
-        for pair in pairs:
-            cell1, cell2 = pair
-            # separate cells into even and odd based on coordinates
-            if (cell1[0] + cell1[1]) % 2 == 0:
-                if cell1 not in even_cells:
-                    even_cells.append(cell1)
-                if cell2 not in odd_cells:
-                    odd_cells.append(cell2)
+        with self.profiler.phase("build"):
+            problem = BipartiteProblem(self.grid)
+            matrix = problem.sparse_matrix() if self.sparse else problem.dense_matrix()
+        with self.profiler.phase("solve"):
+            # scipy is only imported by the solvers which use it
+            if self.sparse:
+                from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+                assignment = min_weight_full_bipartite_matching(matrix) if len(problem.costs) else ([], [])
             else:
-                if cell1 not in odd_cells:
-                    odd_cells.append(cell1)
-                if cell2 not in even_cells:
-                    even_cells.append(cell2)
-
-        # create indices for even and odd cells
-        even_cells_indices = {cell: idx for idx, cell in enumerate(even_cells)}
-        odd_cells_indices = {cell: idx for idx, cell in enumerate(odd_cells)}
-
-        # initialize the cost matrix
-        cost_matrix = np.full((len(even_cells), len(odd_cells)), 0)
-        for (i1, j1) in even_cells:
-            for (i2, j2) in odd_cells:
-                # check if cells are neighbors
-                if max(abs(i1 - i2), abs(j1 - j2)) == 1 and min(abs(i1 - i2), abs(j1 - j2)) == 0:
-                    if ((i1, j1), (i2, j2)) in pairs or ((i2, j2), (i1, j1)) in pairs:
-                        # compute cost for the pair
-                        cost = -self.grid.value[i1][j1] - self.grid.value[i2][j2] + abs(self.grid.value[i1][j1] - self.grid.value[i2][j2])
-                        cost_matrix[even_cells_indices[(i1, j1)], odd_cells_indices[(i2, j2)]] = cost
-
-        # apply hungarian algorithm
-        assignment = HungarianAlgorithm().my_linear_sum_assignment(cost_matrix)
+                # apply the hungarian algorithm using scipy
+                from scipy.optimize import linear_sum_assignment
+                assignment = linear_sum_assignment(matrix)
 
         # build the pairs and compute the score
-        pairs = []
-        used_cells = set()
+        with self.profiler.phase("pairs"):
+            self.set_flat_pairs(problem.flat_pairs(*assignment))
+        return self.result()
 
-        for r, c in zip(assignment[0],assignment[1]):
-            if cost_matrix[r, c] != 0:
-                cell1 = even_cells[r]
-                cell2 = odd_cells[c]
-                if cell1 not in used_cells and cell2 not in used_cells:
-                    pairs.append((cell1, cell2))
-                    used_cells.add(cell1)
-                    used_cells.add(cell2)
-        self.pairs = pairs.copy()
-        return self.pairs, self.compute_score(self.pairs)
+class SolverMinCostMatching(Solver):
+    """
+    Matching algorithm using a sparse minimum cost matching (successive shortest paths with Dijkstra and potentials) on the edges given by Grid.all_pairs_flat.
+    Contrary to SolverHungarian, no dense cost matrix is built: memory and time scale with the number of pairs, i.e. O(cells).
 
+    Attributes:
+    -----------
+    grid: Grid
+    pairs: list[tuple[tuple[int]]]
+    bot: str
+    """
 
-class SolverHungarianScipy(Solver):
-    "solver using the hungarian algorithm linear_sum_assignment from scipy.optimize, to compare with our own implementation"
+    def run(self):
+        """
+        No parameter.
 
-    def __init__(self, grid):
-        super().__init__(grid)
-        self.grid = grid
+        Output:
+        -------
+        tuple (pairs, score)
+          pairs: list[tuple[tuple[int]]]
+          score: int
+        """
+        with self.profiler.phase("build"):
+            # choosing a pair decreases the score by value1 + value2 - |value1 - value2| (see BipartiteProblem)
+            problem = BipartiteProblem(self.grid)
+            engine = MinCostMatching.from_arrays(*problem.shape, problem.rows, problem.columns, problem.costs)
 
-    def compute_score(self, pairs):
-        "compute the total score of a list of pairs"
-        used_cells = set()
-        score = 0
+        with self.profiler.phase("solve"):
+            matching, _ = engine.solve()
 
-        # sum of absolute differences of the pairs
-        for (i1, j1), (i2, j2) in pairs:
-            score += abs(self.grid.value[i1][j1] - self.grid.value[i2][j2])
-            used_cells.add((i1, j1))
-            used_cells.add((i2, j2))
+        matching = np.array(matching, dtype=np.int64).reshape(-1, 2)
+        self.set_flat_pairs(np.stack([problem.even_cells[matching[:, 0]], problem.odd_cells[matching[:, 1]]], axis=1))
+        return self.result()
 
-        # sum of values of unmatched cells (except black cells !)
-        for i in range(self.grid.n):
-            for j in range(self.grid.m):
-                if (i, j) not in used_cells and not self.grid.is_forbidden(i, j):
-                    score += self.grid.value[i][j]
+class SolverComponents(Solver):
+    """
+    Solves separately each connected component of the graph of the pairs (the components are split by black cells and incompatible colors)
+    with another solver, in a pool of processes, and merges the pairs and the scores.
 
-        return score
+    Attributes:
+    -----------
+    grid: Grid
+    pairs: list[tuple[tuple[int]]]
+    bot: str
+    solver_class: class
+        The solver used on each component
+    max_workers: int
+        Number of processes (default: number of CPUs, 1 to solve the components in the current process, as in a daemonic process)
+    """
+
+    def __init__(self, grid, solver_class=SolverMinCostMatching, max_workers=None):
+        super().__init__(grid)
+        self.solver_class = solver_class
+        self.max_workers = max_workers
 
     def run(self):
-        "solve the problem using the hungarian algorithm"
-        # build the cost matrix
-        n, m = self.grid.n, self.grid.m
-        pairs = self.grid.all_pairs()
-        even_cells = []
-        odd_cells = []
-        for pair in pairs:
-            cell1, cell2 = pair
-            # separate cells into even and odd based on coordinates
-            if (cell1[0] + cell1[1]) % 2 == 0:
-                if cell1 not in even_cells:
-                    even_cells.append(cell1)
-                if cell2 not in odd_cells:
-                    odd_cells.append(cell2)
-            else:
-                if cell1 not in odd_cells:
-                    odd_cells.append(cell1)
-                if cell2 not in even_cells:
-                    even_cells.append(cell2)
-
-        # create indices for even and odd cells
-        even_cells_indices = {cell: idx for idx, cell in enumerate(even_cells)}
-        odd_cells_indices = {cell: idx for idx, cell in enumerate(odd_cells)}
-
-        # initialize cost matrix
-        cost_matrix = np.full((len(even_cells), len(odd_cells)), 0)
-        for (i1, j1) in even_cells:
-            for (i2, j2) in odd_cells:
-                # check if cells are neighbors
-                if max(abs(i1 - i2), abs(j1 - j2)) == 1 and min(abs(i1 - i2), abs(j1 - j2)) == 0:
-                    if ((i1, j1), (i2, j2)) in pairs or ((i2, j2), (i1, j1)) in pairs:
-                        # compute the cost for this pair
-                        cost = -self.grid.value[i1][j1] - self.grid.value[i2][j2] + abs(self.grid.value[i1][j1] - self.grid.value[i2][j2])
-                        cost_matrix[even_cells_indices[(i1, j1)], odd_cells_indices[(i2, j2)]] = cost
-
-        # apply the hungarian algorithm using scipy
-        assignment = linear_sum_assignment(cost_matrix)
+        """
+        No parameter.
 
-        # build the pairs and compute the score
-        pairs = []
-        used_cells = set()
-        for r, c in zip(assignment[0], assignment[1]):
-            if cost_matrix[r, c] != 0:
-                cell1 = even_cells[r]
-                cell2 = odd_cells[c]
-                if cell1 not in used_cells and cell2 not in used_cells:
-                    pairs.append((cell1, cell2))
-                    used_cells.add(cell1)
-                    used_cells.add(cell2)
-        self.pairs = pairs.copy()
-        return self.pairs, self.compute_score(self.pairs)
-
-class PlayerGame(Solver):
-    "class to allow player to play the game with a graphical interface"
+        Output:
+        -------
+        tuple (pairs, score)
+          pairs: list[tuple[tuple[int]]]
+          score: int
+        """
+        with self.profiler.phase("solve"):
+            self.pairs, score = solve_by_components(self.grid, self.solver_class, self.max_workers)
+        return self.pairs, score
+
+class SolverIncremental(Solver):
+    """
+    Minimum cost matching which can be solved again quickly after a few cells of the grid have been edited (update_cells, then resolve).
+
+    The matching is written as a perfect assignment, solved by IncrementalAssignment: the rows are the even cells and a copy of each odd cell,
+    the columns are the odd cells and a copy of each even cell. An even cell is assigned to an odd cell (a pair) or to its own copy (unmatched),
+    and the copy of an odd cell is assigned to the odd cell (unmatched) or, when the odd cell is in a pair, to the copy of an even cell it can be
+    paired with (cost 0). After an edit, only the rows of the edited cells and of their neighbours are assigned again, with the dual variables
+    of the previous solve: an edit of one cell costs a few local shortest paths instead of a full solve.
+
+    Attributes:
+    -----------
+    grid: Grid
+    pairs: list[tuple[tuple[int]]]
+    bot: str
+    assignment: IncrementalAssignment
+    row_of_cell: list[int]
+        row_of_cell[i*m + j] is the row of the cell (i, j) if it is even, or the row of its copy if it is odd
+    column_of_cell: list[int]
+        column_of_cell[i*m + j] is the column of the cell (i, j) if it is odd, or the column of its copy if it is even
+    pair_of_row: dict[int, tuple[tuple[int]]]
+        The pair of each even cell which is matched, by row
+    matching_cost: int
+        The sum of the costs of the pairs (the score is the sum of the values of the free cells plus matching_cost)
+    """
 
     def __init__(self, grid):
         super().__init__(grid)
-        self.grid = grid
-        self.running = True  #  if the game is running
-
-    def button(self, screen, text, x, y, button_size, font_text, button_color, button_text_color):
-        # create a button with text and display on screen
-        rect = pygame.Rect(x, y, button_size[0], button_size[1])
-        pygame.draw.rect(screen, button_color, rect)
-        text_surface = font_text.render(text, True, button_text_color)
-        text_rect = text_surface.get_rect(center=rect.center)
-        screen.blit(text_surface, text_rect)
-        pygame.display.update()
-        return rect
-
-    def run_game(self):
-        "manage the game in player mode"
-
-        # message to display in player mode
-        bot = "Player Mode - Click on two cells to match them. Click 'z' to deselect all cells."
-        pygame.font.init()
-        self.grid.plotStep(bot)  # display all the grid with the message
-
-        while self.running:
-            # handle events in the window
-            for event in pygame.event.get():
-                bot = "Player Mode - Click on two cells to match them. Click 'z' to deselect all cells."
-                if event.type == pygame.QUIT:
-                    # close the window of the game
-                    self.running = False
-
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_f:
-                        # close the game when 'f' is pressed
-                        self.running = False
-                    if event.key == pygame.K_z:
-                        # deselect all cells when 'z' pressed
-                        self.grid.selected_cells = []
-                        self.grid.plotStep(bot)
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-
-                    # cell selection with one mouse click
-                    clicked_on_cell = False
-                    for rect in self.grid.rect_list:
-                        if rect.collidepoint(event.pos):
-                            # find the cell clicked
-                            cell = self.grid.cells_list[self.grid.rect_list.index(rect)]
-                            clicked_on_cell = True
-                            break
-                    if not clicked_on_cell:
-                        continue
+        with self.profiler.phase("build"):
+            n, m = grid.n, grid.m
+            parity = np.add.outer(np.arange(n), np.arange(m)).ravel() % 2
+            self.even_cells = np.flatnonzero(parity == 0).tolist()
+            self.odd_cells = np.flatnonzero(parity == 1).tolist()
+            num_even, num_odd = len(self.even_cells), len(self.odd_cells)
+            self.row_of_cell = np.empty(n * m, dtype=np.int64)
+            self.column_of_cell = np.empty(n * m, dtype=np.int64)
+            self.row_of_cell[self.even_cells] = np.arange(num_even)
+            self.row_of_cell[self.odd_cells] = num_even + np.arange(num_odd)
+            self.column_of_cell[self.odd_cells] = np.arange(num_odd)
+            self.column_of_cell[self.even_cells] = num_odd + np.arange(num_even)
+            self.row_of_cell, self.column_of_cell = self.row_of_cell.tolist(), self.column_of_cell.tolist()
+            self.assignment = IncrementalAssignment(num_even + num_odd, num_odd + num_even)
+
+            # the pairs of each cell, computed at once
+            neighbours = [[] for cell in range(n * m)]
+            for cell1, cell2 in self.grid.all_pairs_flat().tolist():
+                neighbours[cell1].append(cell2)
+                neighbours[cell2].append(cell1)
+            for cell in self.even_cells:
+                self.assignment.set_row_edges(self.row_of_cell[cell], self.row_edges(cell, neighbours[cell]))
+            for cell in self.odd_cells:
+                row = self.row_of_cell[cell]
+                self.assignment.set_row_edges(row, self.row_edges(cell, neighbours[cell]))
+                self.assignment.assign(row, self.column_of_cell[cell]) # the odd cells start unmatched (tight, as all the duals are 0)
+            self.pending_rows = [self.row_of_cell[cell] for cell in self.even_cells]
+            self.pair_of_row, self.cost_of_row, self.matching_cost = {}, {}, 0 # pairs of the matching, with their costs
+
+    def neighbours(self, cell):
+        "returns the cells (flat indices) which can be paired with cell (flat index)"
+        n, m = self.grid.n, self.grid.m
+        i, j = divmod(cell, m)
+        color, removed = self.grid.color_array, self.grid.removed.mask
+        if color[i, j] == 4 or removed[i, j]:
+            return []
+        neighbours = []
+        for i2, j2 in [(i - 1, j), (i, j - 1), (i, j + 1), (i + 1, j)]:
+            if 0 <= i2 < n and 0 <= j2 < m and color[i2, j2] != 4 and not removed[i2, j2] and COLOR_COMPATIBILITY[color[i, j], color[i2, j2]]:
+                neighbours.append(i2 * m + j2)
+        return neighbours
+
+    def row_edges(self, cell, neighbours):
+        """
+        Returns the edges (column, cost) of the row of cell (flat index): the even cells can be paired with their neighbours or stay unmatched,
+        the copies of the odd cells are assigned to the copies of their neighbours (the odd cell is in a pair) or to the odd cell (unmatched).
+        """
+        row_of_cell, column_of_cell = self.row_of_cell, self.column_of_cell
+        if row_of_cell[cell] < len(self.even_cells):
+            values = self.grid.value_array.ravel()
+            value = int(values[cell])
+            edges = [(column_of_cell[other], -value - int(values[other]) + abs(value - int(values[other]))) for other in neighbours]
+        else:
+            edges = [(column_of_cell[other], 0) for other in neighbours]
+        edges.append((column_of_cell[cell], 0))
+        return edges
+
+    def update_cells(self, cells, colors=None, values=None):
+        """
+        Parameters:
+        -----------
+        cells: list[tuple[int]]
+            The edited cells (i, j)
+        colors: list[int]
+            The new colors of the cells (default: unchanged)
+        values: list[int]
+            The new values of the cells (default: unchanged)
+
+        Edits the grid, and updates the edges of the rows of the edited cells and of their neighbours, which are unassigned.
+        The matching is computed again by resolve.
+        """
+        if colors is not None:
+            for (i, j), color in zip(cells, colors):
+                self.grid.color_array[i, j] = color
+        if values is not None:
+            for (i, j), value in zip(cells, values):
+                self.grid.value_array[i, j] = value
+        self.update_rows(cells)
+
+    def update_rows(self, cells):
+        "updates the edges of the rows of the cells (i, j) and of their neighbours (after the grid has been edited)"
+        n, m = self.grid.n, self.grid.m
+        affected = set()
+        for i, j in cells:
+            affected.add(i * m + j)
+            for i2, j2 in [(i - 1, j), (i, j - 1), (i, j + 1), (i + 1, j)]:
+                if 0 <= i2 < n and 0 <= j2 < m:
+                    affected.add(i2 * m + j2)
+        for cell in affected:
+            row = self.row_of_cell[cell]
+            self.assignment.set_row_edges(row, self.row_edges(cell, self.neighbours(cell)))
+            self.pending_rows.append(row)
+
+    def resolve(self):
+        """
+        No parameter.
+
+        Output:
+        -------
+        tuple (pairs, score)
+          pairs: list[tuple[tuple[int]]]
+          score: int
 
-                    # check if the clicked cell is OK for selection
-                    if cell and cell not in self.grid.selected_cells and (not self.grid.is_forbidden(cell[0], cell[1]) or self.grid.color[cell[0]][cell[1]] == 4):
-                        self.grid.selected_cells.append(cell)  # add the cell to the selected list
-                        self.grid.plotStep(bot)  # update the grid display
-
-                        if len(self.grid.selected_cells) == 2:
-                            # if two cells are selected, check if they can be matched
-                            cell1, cell2 = self.grid.selected_cells
-                            if (cell1, cell2) in self.grid.all_pairs() or (cell2, cell1) in self.grid.all_pairs():
-                                # if the cells can be matched, remove them from the grid
-                                self.grid.removed.append(cell1)
-                                self.grid.removed.append(cell2)
-                                self.grid.plotStep(bot)
-                                pygame.time.wait(500)  # wait a bit
-                                self.grid.plot_removed.append(cell1)
-                                self.grid.plot_removed.append(cell2)
-                                self.grid.plotStep(bot)
-                                self.pairs.append((cell1, cell2))  # add the pair to the list of pairs
-                            else:
-                                # if the cells cannot be matched, show a message
-                                bot += "\nThe selected cells cannot be matched."
-                            # reset selection
-                            self.grid.selected_cells = []
-                            self.grid.plotStep(bot)
-
-            # if there are no more pairs then end the game
-            if self.grid.all_pairs() == []:
-                pygame.quit()
-                return self.pairs, self.score()
-
-        pygame.quit()
+        Assigns the rows which have been unassigned since the previous solve, and returns the pairs ((even cell), (odd cell)).
+        """
+        with self.profiler.phase("solve"):
+            self.assignment.solve(self.pending_rows)
+        self.pending_rows = []
+
+        # only the pairs of the rows whose column changed are updated
+        m, num_even, num_odd = self.grid.m, len(self.even_cells), len(self.odd_cells)
+        for row in self.assignment.changed_rows:
+            if row >= num_even:
+                continue
+            self.matching_cost -= self.cost_of_row.pop(row, 0)
+            self.pair_of_row.pop(row, None)
+            column = self.assignment.column_for_row[row]
+            if 0 <= column < num_odd:
+                self.pair_of_row[row] = (divmod(self.even_cells[row], m), divmod(self.odd_cells[column], m))
+                self.cost_of_row[row] = next(cost for other, cost in self.assignment.adjency[row] if other == column)
+                self.matching_cost += self.cost_of_row[row]
+        self.assignment.changed_rows.clear()
+
+        self.pairs = list(self.pair_of_row.values())
+        # the cost of a pair is the change of the score when it is taken
+        return self.pairs, int(self.grid.value_array[~self.grid.forbidden_mask()].sum(dtype=np.int64)) + self.matching_cost
+
+    def run(self):
+        return self.resolve()
+
+# The solvers that can be chosen by name (in the benchmark and batch scripts)
+SOLVERS = {
+    "greedy": SolverGreedy,
+    "max_matching": SolverMaxMatching,
+    "hungarian": SolverHungarian,
+    "hungarian_scipy": SolverHungarianScipy,
+    "hungarian_scipy_sparse": partial(SolverHungarianScipy, sparse=True),
+    "min_cost_matching": SolverMinCostMatching,
+    "components": SolverComponents,
+    "incremental": SolverIncremental,
+}
+
+# The solvers whose score is always the best score (any optimal solution can replace theirs)
+EXACT_SOLVERS = ["hungarian", "hungarian_scipy", "hungarian_scipy_sparse", "min_cost_matching", "components", "incremental"]
+
+def __getattr__(name):
+    # PlayerGame is part of the rendering layer (graphic_version.py), so that pygame is only imported by the graphical interface
+    if name == "PlayerGame":
+        from graphic_version import PlayerGame
+        return PlayerGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
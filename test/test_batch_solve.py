@@ -0,0 +1,79 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+import unittest 
+import solver
+import code.batch_solve as batch_solve_module
+from code.batch_solve import find_grid_files, solve_file, batch_solve
+
+class FaultySolver:
+    "solver which kills its process on the grids of 10 rows, and blocks SIGALRM then sleeps on the grids of 4 rows (as a long compiled call)"
+    def __init__(self, grid):
+        self.grid = grid
+
+    def run(self):
+        if self.grid.n == 10:
+            os._exit(3)
+        if self.grid.n == 4:
+            signal.signal(signal.SIGALRM, signal.SIG_IGN)
+            time.sleep(60)
+        return [], 0
+
+class Test_BatchSolve(unittest.TestCase):
+    def test_find_grid_files(self):
+        file_names = find_grid_files(["input", "input/grid0*.in"])
+        self.assertEqual(len(file_names), len(set(file_names)))
+        self.assertIn(os.path.join("input", "grid01.in"), file_names)
+
+    def test_solve_file(self):
+        result = solve_file("input/grid01.in", "greedy")
+        self.assertEqual((result["status"], result["score"], result["pairs"]), ("ok", 8, 2))
+
+    def test_error_and_timeout(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "bad.in")
+            with open(file_name, "w") as file:
+                file.write("2 2\n0 0\n")
+            self.assertTrue(solve_file(file_name, "greedy")["status"].startswith("error"))
+        self.assertEqual(solve_file("input/grid21.in", "hungarian", timeout=0.5)["status"], "timeout")
+
+    def test_batch_solve(self):
+        file_names = ["input/grid01.in", "input/grid05.in", "input/grid17.in"]
+        results = list(batch_solve(file_names, "min_cost_matching", workers=2, timeout=30))
+        self.assertEqual(sorted(result["file"] for result in results), file_names)
+        self.assertEqual({result["file"]: result["score"] for result in results}, {"input/grid01.in": 8, "input/grid05.in": 35, "input/grid17.in": 256})
+
+    def test_crash_and_kill(self):
+        # the workers are forked explicitly (whatever the default start method), so that they see the solver added to SOLVERS
+        file_names = ["input/grid01.in", "input/grid11.in", "input/grid02.in", "input/grid03.in"] # 2, 10, 2 and 4 rows
+        solver.SOLVERS["faulty"], kill_delay = FaultySolver, batch_solve_module.KILL_DELAY
+        batch_solve_module.KILL_DELAY = 0.5
+        try:
+            start_time = time.perf_counter()
+            results = list(batch_solve(file_names, "faulty", workers=1, chunksize=4, timeout=0.5, context=multiprocessing.get_context("fork")))
+            self.assertLess(time.perf_counter() - start_time, 30)
+        finally:
+            del solver.SOLVERS["faulty"]
+            batch_solve_module.KILL_DELAY = kill_delay
+        statuses = {result["file"]: result["status"] for result in results}
+        self.assertEqual(statuses, {"input/grid01.in": "ok", "input/grid11.in": "crashed: exit code 3", "input/grid02.in": "ok", "input/grid03.in": "timeout"})
+
+    def test_restores_signal_handler(self):
+        handler = lambda signum, frame: None
+        previous = signal.signal(signal.SIGALRM, handler)
+        try:
+            solve_file("input/grid01.in", "greedy", timeout=10)
+            self.assertIs(signal.getsignal(signal.SIGALRM), handler)
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys
+sys.path.append("code/")
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+import solver
+from code.benchmark import benchmark, compare, read_results, write_results
+
+class CrashingSolver:
+    "solver which kills its process"
+    def __init__(self, grid):
+        self.grid = grid
+
+    def run(self):
+        os._exit(3)
+
+def new_result(solver_name, file_name, status="ok", time=1.0, score=10):
+    return {"solver": solver_name, "grid": file_name, "n": 2, "m": 3, "status": status, "time": time, "peak_memory": None, "score": score}
+
+class Test_Benchmark(unittest.TestCase):
+    def test_benchmark(self):
+        # the child processes are forked explicitly (whatever the default start method), so that they see the solver added to SOLVERS
+        solver.SOLVERS["crashing"] = CrashingSolver
+        try:
+            results = benchmark(["greedy", "crashing"], ["input/grid01.in"], {"greedy": 30, "crashing": 30}, context=multiprocessing.get_context("fork"))
+        finally:
+            del solver.SOLVERS["crashing"]
+        greedy, crashing = results
+        self.assertEqual((greedy["status"], greedy["score"]), ("ok", 8))
+        self.assertGreater(greedy["peak_memory"], 0)
+        self.assertEqual((crashing["status"], crashing["score"]), ("crashed: exit code 3", None))
+        greedy = benchmark(["greedy"], ["input/grid01.in"], {"greedy": 30}, measure_memory=False)[0]
+        self.assertEqual((greedy["status"], greedy["peak_memory"]), ("ok", None))
+
+    def test_compare(self):
+        baseline = [new_result("greedy", "a"), new_result("greedy", "b"), new_result("greedy", "c"), new_result("greedy", "d"),
+                    new_result("greedy", "e", status="timeout", time=None, score=None), new_result("greedy", "f", time=0.001)]
+        results = [new_result("greedy", "a", time=1.1), new_result("greedy", "b", time=1.5), new_result("greedy", "c", score=9),
+                   new_result("greedy", "d", status="timeout", time=None, score=None), new_result("greedy", "e", time=100),
+                   new_result("greedy", "f", time=0.005), new_result("greedy", "g", time=100)]
+        self.assertEqual(compare(results, baseline, 0.2), ["greedy on b: 1.5000s instead of 1.0000s", "greedy on c: score 9 instead of 10",
+                                                            "greedy on d: timeout (baseline ok)"])
+        self.assertEqual(len(compare(results, baseline, 0.2, min_delta=0.001)), 4)
+
+    def test_read_results(self):
+        results = [new_result("greedy", "a"), new_result("hungarian", "a", status="timeout", time=None, score=None)]
+        results[0]["peak_memory"] = 1024
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ["results.json", "results.csv"]:
+                file_name = os.path.join(folder, name)
+                write_results(results, file_name)
+                self.assertEqual(read_results(file_name), results)
+
+
+if __name__ == '__main__':
+    unittest.main()
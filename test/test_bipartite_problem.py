@@ -0,0 +1,66 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys
+sys.path.append("code/")
+import unittest
+import numpy as np
+from code.grid import Grid
+from code.bipartite_problem import BipartiteProblem
+from code.solver import SolverHungarianScipy, SolverMinCostMatching
+
+class Test_BipartiteProblem(unittest.TestCase):
+    def test_edges(self):
+        grid = Grid(2, 3, [[0, 0, 0], [0, 0, 0]], [[5, 8, 4], [11, 2, 1]])
+        problem = BipartiteProblem(grid)
+        self.assertEqual(problem.even_cells.tolist(), [0, 2, 4])
+        self.assertEqual(problem.odd_cells.tolist(), [1, 3, 5])
+        self.assertEqual(problem.shape, (3, 3))
+        self.assertEqual(len(problem.costs), len(grid.all_pairs()))
+        dense = problem.dense_matrix()
+        self.assertEqual(dense[0, 0], -10) # (0, 0) with (0, 1)
+        self.assertEqual(dense[0, 1], -10) # (0, 0) with (1, 0)
+        self.assertEqual(dense[0, 2], 0) # not a pair
+        self.assertEqual(dense[2, 2], -2) # (1, 1) with (1, 2)
+
+    def test_sparse_matrix(self):
+        grid = Grid(2, 3, [[0, 0, 0], [0, 0, 0]], [[5, 8, 4], [11, 2, 1]])
+        problem = BipartiteProblem(grid)
+        sparse = problem.sparse_matrix()
+        self.assertEqual(sparse.shape, (3, 6))
+        self.assertEqual(sparse.nnz, len(problem.costs) + 3)
+        self.assertTrue((sparse.data > 0).all())
+        # the weights are the costs shifted by the same constant, and the dummy columns weigh the constant
+        self.assertEqual((sparse.toarray()[:, :3] - sparse.toarray()[:, 3:].sum(axis=1, keepdims=True))[problem.rows, problem.columns].tolist(), problem.costs.tolist())
+
+    def test_pairs(self):
+        grid = Grid(2, 3, [[0, 0, 0], [0, 0, 0]], [[5, 8, 4], [11, 2, 1]])
+        problem = BipartiteProblem(grid)
+        # dummy column 4 and missing pair (0, 2) are dropped
+        self.assertEqual(problem.pairs([0, 1, 2], [2, 4, 2]), [((1, 1), (1, 2))])
+        self.assertEqual(problem.pairs([0, 1], [1, 0]), [((0, 0), (1, 0)), ((0, 2), (0, 1))])
+        self.assertEqual(problem.pairs([], []), [])
+
+    def test_no_pairs(self):
+        grid = Grid(1, 2, [[0, 4]], [[1, 1]])
+        problem = BipartiteProblem(grid)
+        self.assertEqual(problem.shape, (0, 0))
+        self.assertEqual(SolverHungarianScipy(grid).run(), ([], 1)) # the black cell is not counted
+        self.assertEqual(SolverHungarianScipy(grid, sparse=True).run(), ([], 1)) # the black cell is not counted
+
+    def test_sparse_solver(self):
+        for file_name, score in [("grid00", 12), ("grid01", 8), ("grid05", 35), ("grid11", 26), ("grid15", 21), ("grid18", 259)]:
+            grid = Grid.grid_from_file(f"input/{file_name}.in", read_values=True)
+            self.assertEqual(SolverHungarianScipy(grid, sparse=True).run()[1], score)
+            self.assertEqual(SolverHungarianScipy(grid).run()[1], score)
+
+    def test_random_grids(self):
+        rng = np.random.default_rng(3)
+        for _ in range(30):
+            n, m = rng.integers(1, 8, 2)
+            grid = Grid(n, m, rng.integers(0, 5, (n, m)).tolist(), rng.integers(1, 10, (n, m)).tolist())
+            score = SolverMinCostMatching(grid).run()[1]
+            self.assertEqual(SolverHungarianScipy(grid, sparse=True).run()[1], score)
+            self.assertEqual(SolverHungarianScipy(grid).run()[1], score)
+
+if __name__ == '__main__':
+    unittest.main()
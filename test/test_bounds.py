@@ -0,0 +1,53 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import unittest 
+import numpy as np
+from code.grid import Grid
+from code.solver import SolverMinCostMatching
+from code.bounds import score_bounds, lower_bound
+from code.batch_solve import solve_file
+
+class Test_Bounds(unittest.TestCase):
+    def test_grids(self):
+        for i in [0, 1, 4, 5, 17, 21]:
+            file_name = "input/grid%02d.in" % i
+            grid = Grid.grid_from_file(file_name, read_values=True)
+            lower, upper, pairs = score_bounds(grid)
+            self.assertEqual(grid.removed, []) # the grid is not modified
+            score = SolverMinCostMatching(grid).run()[1]
+            self.assertTrue(lower <= score <= upper)
+
+    def test_random_grids(self):
+        for _ in range(200):
+            n, m = np.random.randint(1, 7, size=2)
+            color = np.random.randint(0, 5, size=(n, m)).tolist()
+            value = np.random.randint(1, 10, size=(n, m)).tolist()
+            lower, upper, pairs = score_bounds(Grid(n, m, color, value))
+            score = SolverMinCostMatching(Grid(n, m, color, value)).run()[1]
+            self.assertTrue(lower <= score <= upper)
+
+    def test_no_pair(self):
+        grid = Grid(2, 2, [[4, 1], [3, 4]], [[5, 6], [7, 8]])
+        self.assertEqual(lower_bound(grid), 13)
+
+    def test_batch_solve(self):
+        result = solve_file("input/grid01.in", "min_cost_matching", bounds=True)
+        self.assertEqual((result["score"], result["gap"], result["skipped"]), (8, 0, True))
+        # the lower bound is the best score, but the greedy solution is not optimal: the exact solver is run
+        result = solve_file("input/grid05.in", "min_cost_matching", bounds=True)
+        self.assertEqual((result["score"], result["lower_bound"], result["skipped"]), (35, 35, False))
+
+    def test_tight_on_large_grids(self):
+        # the covers alone are far from the best score, the subgradient method comes within 1%
+        for i in [17, 19, 21]:
+            grid = Grid.grid_from_file("input/grid%02d.in" % i, read_values=True)
+            score = SolverMinCostMatching(Grid.grid_from_file("input/grid%02d.in" % i, read_values=True)).run()[1]
+            self.assertLessEqual(lower_bound(grid, rounds=0), lower_bound(grid))
+            self.assertTrue(0.99 * score <= lower_bound(grid) <= score)
+
+
+if __name__ == '__main__':
+    unittest.main()
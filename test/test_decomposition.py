@@ -0,0 +1,59 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import multiprocessing
+import unittest 
+import numpy as np
+from code.grid import Grid
+from code.solver import SolverComponents, SolverMinCostMatching, SolverGreedy
+from code.decomposition import split_grid, solve_by_components
+from code.batch_solve import solve_file, batch_solve
+
+class Test_Decomposition(unittest.TestCase):
+    def test_split_grid(self):
+        # two components separated by a black column, and an isolated green cell (1, 3)
+        grid = Grid(2, 5, [[0, 0, 4, 1, 2], [0, 0, 4, 3, 4]], [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]])
+        subgrids, isolated_score = split_grid(grid)
+        self.assertEqual(isolated_score, 9)
+        self.assertEqual(sorted((i0, j0, color.shape) for i0, j0, color, value in subgrids), [(0, 0, (2, 2)), (0, 3, (1, 2))])
+        subgrids, isolated_score = split_grid(grid, min_cells=10)
+        self.assertEqual(len(subgrids), 1)
+
+    def test_grids(self):
+        for i in [1, 5, 17, 19, 21]:
+            file_name = "input/grid%02d.in" % i
+            score = SolverMinCostMatching(Grid.grid_from_file(file_name, read_values=True)).run()[1]
+            for max_workers in [1, 2]:
+                pairs, score_components = SolverComponents(Grid.grid_from_file(file_name, read_values=True), max_workers=max_workers).run()
+                self.assertEqual(score_components, score)
+                cells = [cell for pair in pairs for cell in pair]
+                self.assertEqual(len(cells), len(set(cells)))
+
+    def test_random_grids(self):
+        for _ in range(50):
+            n, m = np.random.randint(1, 8, size=2)
+            color = np.random.randint(0, 5, size=(n, m)).tolist()
+            value = np.random.randint(1, 10, size=(n, m)).tolist()
+            self.assertEqual(SolverComponents(Grid(n, m, color, value), max_workers=1).run()[1], SolverMinCostMatching(Grid(n, m, color, value)).run()[1])
+            self.assertEqual(SolverComponents(Grid(n, m, color, value), SolverGreedy, max_workers=1).run()[1], SolverGreedy(Grid(n, m, color, value)).run()[1])
+
+    def test_daemonic_process(self):
+        # the workers of a multiprocessing.Pool cannot start a ProcessPoolExecutor: the components are then solved in the worker
+        grid = Grid.grid_from_file("input/grid21.in", read_values=True)
+        score = SolverMinCostMatching(grid).run()[1]
+        with multiprocessing.Pool(1) as pool:
+            pairs, score_components = pool.apply(solve_by_components, (grid, SolverMinCostMatching, 2))
+        self.assertEqual(score_components, score)
+
+    def test_batch_solve(self):
+        file_names = ["input/grid05.in", "input/grid21.in"]
+        results = {result["file"]: result for result in batch_solve(file_names, "components", workers=2)}
+        for file_name in file_names:
+            self.assertEqual(results[file_name]["status"], "ok")
+            self.assertEqual(results[file_name]["score"], solve_file(file_name, "min_cost_matching")["score"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import unittest 
+import numpy as np
+from code.grid import Grid
+from code.game_state import GameState
+from code.solver import Solver, SolverGreedy
+
+class Test_GameState(unittest.TestCase):
+    def test_play(self):
+        grid = Grid.grid_from_file("input/grid01.in", read_values=True)
+        state = GameState(grid)
+        self.assertEqual(state.moves_left, len(grid.all_pairs()))
+        cell1, cell2 = grid.all_pairs()[0]
+        self.assertTrue(state.can_match(cell2, cell1))
+        self.assertTrue(state.play(cell2, cell1))
+        self.assertFalse(state.play(cell1, cell2))
+        self.assertEqual(set(grid.all_pairs()), state.available)
+        self.assertEqual(state.score, Solver(grid).calc_score(state.pairs))
+
+    def test_large_values(self):
+        "the score is exact even when it does not fit in an int32"
+        values = [1100000000, 1100000000, 1000000000, 1]
+        state = GameState(Grid(1, 4, [[0, 0, 0, 0]], [values]))
+        self.assertEqual(state.score, sum(values))
+        self.assertTrue(state.play((0, 0), (0, 1)))
+        self.assertTrue(state.play((0, 2), (0, 3)))
+        self.assertEqual(state.score, 999999999)
+        self.assertIsInstance(state.score, int)
+
+    def test_random_games(self):
+        "plays random pairs until the end, and compares with the full computations"
+        for _ in range(20):
+            n, m = np.random.randint(1, 8, size=2)
+            color = np.random.randint(0, 5, size=(n, m)).tolist()
+            value = np.random.randint(1, 10, size=(n, m)).tolist()
+            grid = Grid(n, m, color, value)
+            state = GameState(grid)
+            while not state.is_over():
+                available = sorted(state.available)
+                state.play(*available[np.random.randint(len(available))])
+                self.assertEqual(state.available, set(grid.all_pairs()))
+                self.assertEqual(state.score, Solver(grid).calc_score(state.pairs))
+            self.assertEqual(state.moves_left, 0)
+
+    def test_solver_pairs(self):
+        "replaying the pairs of a solver gives its score"
+        pairs, score = SolverGreedy(Grid.grid_from_file("input/grid17.in", read_values=True)).run()
+        state = GameState(Grid.grid_from_file("input/grid17.in", read_values=True))
+        for cell1, cell2 in pairs:
+            self.assertTrue(state.play(cell1, cell2))
+        self.assertEqual(state.score, score)
+
+
+if __name__ == '__main__':
+    unittest.main()
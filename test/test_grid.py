@@ -0,0 +1,162 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import os
+import tempfile
+import unittest 
+import numpy as np
+from code.grid import Grid, CellList, pairs_to_flat, pairs_from_flat
+
+class Test_GridArrays(unittest.TestCase):
+    def test_arrays(self):
+        grid = Grid.grid_from_file("input/grid01.in", read_values=True)
+        self.assertEqual(grid.color_array.dtype, np.int8)
+        self.assertEqual(grid.value_array.dtype, np.int32)
+        self.assertEqual(grid.color_array.tolist(), grid.color)
+        self.assertEqual(grid.value_array.tolist(), grid.value)
+
+    def test_write_through(self):
+        # writing in grid.color and grid.value is seen by the methods which use the arrays
+        grid = Grid(1, 3, [[0, 0, 0]], [[1, 5, 2]])
+        self.assertEqual(len(grid.all_pairs()), 2)
+        grid.color[0][1] = 4
+        grid.value[0][2] = 9
+        self.assertEqual(grid.color_array.tolist(), [[0, 4, 0]])
+        self.assertTrue(grid.is_forbidden(0, 1))
+        self.assertEqual(grid.forbidden_mask().tolist(), [[False, True, False]])
+        self.assertEqual(grid.all_pairs(), [])
+        self.assertEqual(grid.cost(((0, 0), (0, 2))), 8)
+        self.assertEqual(grid.pair_costs([((0, 0), (0, 2))]).tolist(), [8])
+        # the elements are Python integers, as in lists of lists
+        self.assertIs(type(grid.value[0][2]), int)
+        self.assertIs(type(grid.color[0][1]), int)
+        self.assertEqual(grid.value[0], [1, 5, 9])
+        self.assertEqual([list(row) for row in grid.color], [[0, 4, 0]])
+
+    def test_removed(self):
+        grid = Grid(2, 3, [[0, 4, 0], [0, 0, 0]])
+        grid.removed.append((1, 2))
+        grid.removed.append((0, 0))
+        self.assertTrue((1, 2) in grid.removed)
+        self.assertFalse((1, 1) in grid.removed)
+        self.assertFalse((-1, -1) in grid.removed)
+        self.assertTrue(grid.is_forbidden(0, 1))
+        self.assertTrue(grid.is_forbidden(0, 0))
+        self.assertFalse(grid.is_forbidden(1, 1))
+        self.assertEqual(grid.forbidden_mask().tolist(), [[True, True, False], [False, False, True]])
+        grid.removed.remove((0, 0))
+        self.assertFalse(grid.is_forbidden(0, 0))
+        grid.removed = []
+        self.assertFalse(grid.is_forbidden(1, 2))
+
+    def test_pair_costs(self):
+        grid = Grid(2, 3, [], [[5, 8, 4], [11, 1, 3]])
+        pairs = [((0, 0), (0, 1)), ((0, 1), (1, 1)), ((1, 1), (1, 2))]
+        self.assertEqual(grid.pair_costs(pairs).tolist(), [grid.cost(pair) for pair in pairs])
+        self.assertEqual(grid.pair_costs([]).tolist(), [])
+
+    def test_all_pairs(self):
+        grid = Grid(2, 3, [[0, 4, 3], [2, 1, 0]])
+        self.assertEqual(grid.all_pairs(), [((0, 0), (1, 0)), ((0, 2), (1, 2)), ((1, 0), (1, 1)), ((1, 1), (1, 2))])
+        grid.removed.append((1, 1))
+        self.assertEqual(grid.all_pairs(), [((0, 0), (1, 0)), ((0, 2), (1, 2))])
+
+    def test_all_pairs_arrays(self):
+        grid = Grid.grid_from_file("input/grid13.in", read_values=True)
+        pairs = grid.all_pairs()
+        self.assertEqual(grid.all_pairs_array().shape, (len(pairs), 4))
+        self.assertEqual([((i1, j1), (i2, j2)) for i1, j1, i2, j2 in grid.all_pairs_array().tolist()], pairs)
+        self.assertEqual([((c1 // grid.m, c1 % grid.m), (c2 // grid.m, c2 % grid.m)) for c1, c2 in grid.all_pairs_flat().tolist()], pairs)
+
+    def test_binary_file(self):
+        grid = Grid.grid_from_file("input/grid18.in", read_values=True)
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid.bin")
+            grid.write_to_binary_file(file_name)
+            for memory_map in [False, True]:
+                grid_read = Grid.grid_from_binary_file(file_name, memory_map=memory_map)
+                self.assertEqual(grid_read.color, grid.color)
+                self.assertEqual(grid_read.value, grid.value)
+            grid_read.value_array[0, 0] += 1 # copy-on-write: the file is not modified
+            del grid_read
+            self.assertEqual(Grid.grid_from_binary_file(file_name).value_array[0, 0], grid.value_array[0, 0])
+
+            with open(file_name, "rb") as file:
+                content = file.read()
+            with open(file_name, "wb") as file:
+                file.write(content[:-1])
+            with self.assertRaises(Exception) as context:
+                Grid.grid_from_binary_file(file_name)
+            self.assertEqual(str(context.exception), "Format incorrect")
+
+
+class Test_CellList(unittest.TestCase):
+    def test_cells(self):
+        cells = CellList(3, 4, [(0, 1), (2, 3)])
+        self.assertEqual(list(cells.ids), [1, 11])
+        self.assertEqual(list(cells), [(0, 1), (2, 3)])
+        self.assertEqual(cells, [(0, 1), (2, 3)])
+        self.assertEqual(cells[1], (2, 3))
+        self.assertEqual(cells[-1:], [(2, 3)])
+        self.assertTrue((2, 3) in cells)
+        self.assertFalse((3, 2) in cells)
+        cells += [(1, 0)]
+        cells.extend_flat(np.array([5, 6]))
+        self.assertEqual(cells, [(0, 1), (2, 3), (1, 0), (1, 1), (1, 2)])
+        self.assertEqual(cells.pop(), (1, 2))
+        cells.remove((0, 1))
+        del cells[0]
+        self.assertEqual(cells, [(1, 0), (1, 1)])
+        cells.clear()
+        self.assertEqual(len(cells), 0)
+
+    def test_grid_lists(self):
+        grid = Grid(2, 3)
+        plot_removed = grid.plot_removed
+        grid.plot_removed += [(0, 0), (1, 2)]
+        self.assertIs(grid.plot_removed, plot_removed) # += keeps the same list
+        grid.selected_cells = [(1, 1)]
+        self.assertIsInstance(grid.selected_cells, CellList)
+        self.assertEqual(grid.selected_cells, [(1, 1)])
+        cell1, = grid.selected_cells
+        self.assertEqual(cell1, (1, 1))
+
+    def test_removed_flat(self):
+        grid = Grid(2, 3)
+        grid.removed.extend_flat(np.array([[0, 3], [4, 5]], dtype=np.int32))
+        grid.removed.append((0, 0)) # removed twice
+        self.assertEqual(grid.forbidden_mask().tolist(), [[True, False, False], [True, True, True]])
+        grid.removed.remove((0, 0))
+        self.assertTrue(grid.is_forbidden(0, 0))
+        grid.removed.remove((0, 0))
+        self.assertFalse(grid.is_forbidden(0, 0))
+        grid.removed.clear()
+        self.assertFalse(grid.forbidden_mask().any())
+
+    def test_removed_counts(self):
+        removed = Grid(2, 3).removed
+        removed.extend([(0, 0), (0, 1), (0, 0), (1, 2)])
+        self.assertEqual(removed.counts.tolist(), [[2, 1, 0], [0, 0, 1]])
+        del removed[:2] # (0, 0) is still in the list once
+        self.assertEqual(removed.mask.tolist(), [[True, False, False], [False, False, True]])
+        removed[0:1] = [(1, 1)]
+        self.assertEqual(removed, [(1, 1), (1, 2)])
+        self.assertEqual(removed.mask.tolist(), [[False, False, False], [False, True, True]])
+        removed.pop()
+        removed[0] = (0, 2)
+        self.assertEqual(removed.mask.tolist(), [[False, False, True], [False, False, False]])
+        self.assertEqual(int(removed.counts.sum()), len(removed))
+
+    def test_pair_converters(self):
+        pairs = [((0, 0), (1, 0)), ((1, 1), (1, 2))]
+        self.assertEqual(pairs_to_flat(pairs, 3).tolist(), [[0, 3], [4, 5]])
+        self.assertEqual(pairs_from_flat(pairs_to_flat(pairs, 3), 3), pairs)
+        self.assertEqual(pairs_from_flat(np.zeros((0, 2), dtype=np.int32), 3), [])
+        grid = Grid.grid_from_file("input/grid13.in", read_values=True)
+        self.assertEqual(pairs_from_flat(grid.all_pairs_flat(), grid.m), grid.all_pairs())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,8 @@
 import sys 
 sys.path.append("code/")
 
+import os
+import tempfile
 import unittest 
 from code.grid import Grid
 
@@ -28,6 +30,19 @@ class Test_GridLoading(unittest.TestCase):
         self.assertEqual(grid.color, [[0, 4, 3], [2, 1, 0]])
         self.assertEqual(grid.value, [[5, 8, 4], [11, 1, 3]])
 
+    def test_errors(self):
+        "Malformed files raise the same errors as before"
+        contents = {"2 3\n0 0 0\n0 0\n": "Format incorrect", "2 3\n0 0 5\n0 0 0\n": "Invalid color", "2 3\n0 0 9\n0 0\n": "Invalid color",
+                    "2 3\n0 0\n0 0 9\n": "Format incorrect", "2 3\n0 0 0\n": "Format incorrect"}
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid.in")
+            for content, message in contents.items():
+                with open(file_name, "w") as file:
+                    file.write(content)
+                with self.assertRaises(Exception) as context:
+                    Grid.grid_from_file(file_name)
+                self.assertEqual(str(context.exception), message)
+
 
 if __name__ == '__main__':
     unittest.main()
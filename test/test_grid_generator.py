@@ -0,0 +1,43 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import os
+import tempfile
+import unittest 
+import numpy as np
+from code.grid import Grid
+from code.grid_generator import generate_grid, write_grid
+
+class Test_GridGenerator(unittest.TestCase):
+    def test_seed(self):
+        grid1 = generate_grid(20, 30, seed=4)
+        grid2 = generate_grid(20, 30, seed=4)
+        self.assertEqual((grid1.n, grid1.m), (20, 30))
+        self.assertEqual(grid1.color, grid2.color)
+        self.assertEqual(grid1.value, grid2.value)
+
+    def test_distributions(self):
+        grid = generate_grid(50, 50, seed=0, black_density=1)
+        self.assertTrue((grid.color_array == 4).all())
+        grid = generate_grid(50, 50, seed=0, color_weights=(1, 0, 0, 0, 1), black_density=0)
+        self.assertTrue((grid.color_array == 0).all())
+        grid = generate_grid(50, 50, seed=0, value_distribution="geometric", value_range=(2, 7))
+        self.assertTrue(grid.value_array.min() >= 2 and grid.value_array.max() <= 7)
+        grid = generate_grid(50, 50, seed=0, value_distribution="constant", value_range=(1, 1))
+        self.assertTrue((grid.value_array == 1).all())
+
+    def test_write(self):
+        grid = generate_grid(7, 9, seed=1, value_range=(1, 100))
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name, read in [("grid.in", lambda name: Grid.grid_from_file(name, read_values=True)), ("grid.bin", Grid.grid_from_binary_file)]:
+                file_name = os.path.join(directory, file_name)
+                write_grid(grid, file_name)
+                grid_read = read(file_name)
+                self.assertEqual(grid_read.color, grid.color)
+                self.assertEqual(grid_read.value, grid.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import unittest 
+import pygame
+from code.grid import Grid
+from code.grid_renderer import GridRenderer
+from code.solver import SolverGreedy
+
+class Test_GridRenderer(unittest.TestCase):
+    def draw_from_scratch(self, grid, text):
+        "draws the grid at once on a new surface"
+        surface = pygame.Surface([int(x) for x in GridRenderer.size(grid)])
+        GridRenderer(grid, surface).render(text)
+        return pygame.image.tobytes(surface, "RGB")
+
+    def test_incremental_rendering(self):
+        "the frames drawn incrementally are the same as the frames drawn from scratch"
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        pairs = SolverGreedy(Grid.grid_from_file("input/grid05.in", read_values=True)).run()[0]
+        renderer = GridRenderer(grid, pygame.Surface([int(x) for x in GridRenderer.size(grid)]))
+        self.assertEqual(len(renderer.render("start")), 1) # the whole surface
+        self.assertEqual(len(renderer.render("step")), 1) # the text panel
+        for cell1, cell2 in pairs:
+            grid.selected_cells = [cell1, cell2]
+            self.assertEqual(len(renderer.render("step")), 2)
+            self.assertEqual(pygame.image.tobytes(renderer.screen, "RGB"), self.draw_from_scratch(grid, "step"))
+            grid.plot_removed += [cell1, cell2]
+            grid.selected_cells = []
+            self.assertEqual(len(renderer.render("step")), 2)
+        self.assertEqual(pygame.image.tobytes(renderer.screen, "RGB"), self.draw_from_scratch(grid, "step"))
+        grid.plot_removed = []
+        renderer.render("step")
+        self.assertEqual(pygame.image.tobytes(renderer.screen, "RGB"), self.draw_from_scratch(grid, "step"))
+
+    def test_cell_at(self):
+        "the cell at a position is the cell whose rectangle contains the position"
+        for file_name in ["input/grid05.in", "input/grid21.in"]:
+            grid = Grid.grid_from_file(file_name, read_values=True)
+            renderer = GridRenderer(grid, pygame.Surface([int(x) for x in GridRenderer.size(grid)]))
+            for (i, j), rect in zip(grid.cells_list, grid.rect_list):
+                if rect.width > 0 and rect.height > 0:
+                    self.assertEqual(renderer.cell_at(rect.center), (i, j))
+            self.assertIsNone(renderer.cell_at((1, int(grid.n * renderer.cell_size) + 1)))
+            self.assertIsNone(renderer.cell_at((-1, 1)))
+
+    def test_rect_list(self):
+        "the rectangles of the cells are computed once"
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        grid.plotStep("step")
+        grid.plotStep("step")
+        self.assertEqual(len(grid.rect_list), grid.n * grid.m)
+        pygame.quit()
+
+
+if __name__ == '__main__':
+    unittest.main()
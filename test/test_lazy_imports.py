@@ -0,0 +1,30 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys
+sys.path.append("code/")
+
+import subprocess
+import unittest
+
+def imported_modules(statement):
+    "runs statement in a new interpreter (from the code/ folder) and returns which of pygame and scipy it imported"
+    check = "import sys; print(' '.join(name for name in ['pygame', 'scipy'] if name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", statement + "\n" + check], cwd="code", capture_output=True, text=True, check=True).stdout
+    return output.split("\n")[-2].split()
+
+class Test_LazyImports(unittest.TestCase):
+    def test_headless_solvers(self):
+        statement = "from grid import Grid\nfrom solver import SOLVERS\nfor name in ['greedy', 'hungarian', 'min_cost_matching', 'incremental']:\n    SOLVERS[name](Grid.grid_from_file('../input/grid05.in', read_values=True)).run()"
+        self.assertEqual(imported_modules(statement), [])
+        self.assertEqual(imported_modules("import batch_solve, bounds, solution_cache"), [])
+
+    def test_scipy_solver(self):
+        statement = "from grid import Grid\nfrom solver import SolverHungarianScipy\nSolverHungarianScipy(Grid.grid_from_file('../input/grid05.in', read_values=True)).run()"
+        self.assertEqual(imported_modules(statement), ["scipy"])
+
+    def test_rendering_layer(self):
+        self.assertEqual(imported_modules("from solver import PlayerGame"), ["pygame"])
+        self.assertEqual(imported_modules("from graphic_version import PlotResolution"), ["pygame"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys
+sys.path.append("code/")
+
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+from code.grid import Grid
+from code.solver import SolverGreedy, SolverHungarianScipy, SolverMaxMatching, SolverMinCostMatching
+import profiling # the module used by the solvers (code.profiling would be another copy)
+
+class Test_Profiling(unittest.TestCase):
+    def tearDown(self):
+        profiling.disable()
+
+    def test_disabled(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        solver = SolverMinCostMatching(grid)
+        self.assertIs(solver.profiler, profiling.NULL_PROFILER)
+        self.assertEqual(solver.run()[1], 35)
+        self.assertIsNone(solver.profiler.report)
+        self.assertNotIn("all_pairs", grid.__dict__)
+
+    def test_report(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        with profiling.profiled():
+            solver = SolverHungarianScipy(grid)
+        self.assertFalse(profiling.is_enabled())
+        self.assertEqual(solver.run()[1], 35)
+        report = solver.profiler.report
+        self.assertEqual((report["solver"], report["n"], report["m"]), ("SolverHungarianScipy", grid.n, grid.m))
+        self.assertEqual(set(["build", "solve", "pairs", "score"]) - set(report["phases"]), set())
+        self.assertEqual(report["phases"]["solve"]["calls"], 1)
+        self.assertGreaterEqual(report["time"], report["phases"]["build"]["time"])
+        self.assertEqual(report["counts"]["all_pairs_flat"], 1)
+        self.assertGreater(report["peak_memory"], 0)
+        # the methods of the grid are restored after the run
+        self.assertNotIn("all_pairs_flat", grid.__dict__)
+
+    def test_build_in_constructor(self):
+        # the graph of SolverMaxMatching is built by its constructor, which is timed by the phase build (the grid is only watched during run)
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        profiling.enable(measure_memory=False)
+        solver = SolverMaxMatching(grid, mode="hopcroft_karp")
+        self.assertNotIn("all_pairs_flat", grid.__dict__)
+        solver.run()
+        report = solver.profiler.report
+        self.assertEqual(report["phases"]["build"]["calls"], 1)
+        self.assertNotIn("all_pairs_flat", report["counts"])
+        self.assertIsNone(report["peak_memory"])
+
+    def test_solver_not_run(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        profiling.enable()
+        SolverGreedy(grid)
+        profiling.disable()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertNotIn("all_pairs_flat", grid.__dict__)
+
+    def test_two_solvers(self):
+        # each report only counts the calls of its own run
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        profiling.enable(measure_memory=False)
+        greedy, min_cost = SolverGreedy(grid), SolverMinCostMatching(grid)
+        min_cost.run()
+        greedy.run()
+        self.assertEqual(min_cost.profiler.report["counts"]["all_pairs_flat"], 1)
+        self.assertEqual(greedy.profiler.report["counts"]["all_pairs_flat"], 1)
+        self.assertNotIn("all_pairs_flat", grid.__dict__)
+
+    def test_sink(self):
+        buffer = io.StringIO()
+        with profiling.profiled(sink=buffer, measure_memory=False):
+            for file_name in ["input/grid00.in", "input/grid01.in"]:
+                SolverGreedy(Grid.grid_from_file(file_name, read_values=True)).run()
+        records = [json.loads(line) for line in buffer.getvalue().splitlines()]
+        self.assertEqual([record["solver"] for record in records], ["SolverGreedy", "SolverGreedy"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "profile.jsonl")
+            profiling.enable(sink=file_name, measure_memory=False)
+            SolverGreedy(Grid.grid_from_file("input/grid00.in", read_values=True)).run()
+            SolverGreedy(Grid.grid_from_file("input/grid01.in", read_values=True)).run()
+            records = profiling.read_records(file_name)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1]["n"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import os
+import tempfile
+import unittest 
+import pygame
+from code.grid import Grid
+from code.solver import SolverGreedy
+from code.render_solution import render_frames, render_steps, render_file
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+class Test_RenderSolution(unittest.TestCase):
+    def test_render_frames(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        pairs = SolverGreedy(Grid.grid_from_file("input/grid05.in", read_values=True)).run()[0]
+        self.assertEqual(len(list(render_frames(grid, pairs))), len(pairs) + 2)
+        self.assertEqual(len(list(render_frames(grid, pairs, every=3))), (len(pairs) + 2) // 3 + 2)
+        self.assertEqual((grid.plot_removed, grid.selected_cells), ([], [])) # the grid is not modified
+
+    def test_render_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            score, file_name = render_file("input/grid05.in", "min_cost_matching", folder)
+            self.assertEqual(score, 35)
+            self.assertEqual(pygame.image.load(file_name).get_size(), (500, 343))
+            score, file_names = render_file("input/grid01.in", "greedy", folder, mode="steps")
+            self.assertEqual(len(file_names), 4)
+            self.assertTrue(all(os.path.exists(file_name) for file_name in file_names))
+
+    @unittest.skipIf(PIL is None, "Pillow is not installed")
+    def test_render_gif(self):
+        with tempfile.TemporaryDirectory() as folder:
+            score, file_name = render_file("input/grid05.in", "greedy", folder, mode="gif")
+            self.assertTrue(os.path.getsize(file_name) > 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import unittest 
+import numpy as np
+from code.grid import Grid, pairs_to_flat
+from code.solver import Solver, SolverGreedy, SolverMinCostMatching, SolverComponents
+from code.scoring import pairs_score, batch_scores
+
+def naive_score(grid, pairs):
+    "score computed cell by cell"
+    used_cells = set(cell for pair in pairs for cell in pair)
+    score = sum(abs(grid.value[i1][j1] - grid.value[i2][j2]) for (i1, j1), (i2, j2) in pairs)
+    for i in range(grid.n):
+        for j in range(grid.m):
+            if (i, j) not in used_cells and not grid.is_forbidden(i, j):
+                score += grid.value[i][j]
+    return score
+
+class Test_Scoring(unittest.TestCase):
+    def test_pairs_score(self):
+        grid = Grid(2, 3, [[0, 4, 0], [0, 0, 0]], [[5, 8, 1], [2, 2, 3]])
+        free = grid.color_array != 4
+        self.assertEqual(pairs_score(grid.value_array, free, []), 13)
+        self.assertEqual(pairs_score(grid.value_array, free, [((0, 0), (1, 0))]), 3 + 1 + 2 + 3)
+        self.assertEqual(pairs_score(grid.value_array, free, np.array([[0, 0, 1, 0], [0, 2, 1, 2]])), 3 + 2 + 2)
+        # flat indices i*m + j
+        self.assertEqual(pairs_score(grid.value_array, free, np.array([[0, 3], [2, 5]])), 3 + 2 + 2)
+
+    def test_flat_pairs(self):
+        "the solvers keep their pairs as flat indices too"
+        for solver_class in [SolverGreedy, SolverMinCostMatching]:
+            grid = Grid.grid_from_file("input/grid15.in", read_values=True)
+            solver = solver_class(grid)
+            pairs, score = solver.run()
+            self.assertEqual(solver.flat_pairs.shape, (len(pairs), 2))
+            self.assertEqual([divmod(cell, grid.m) for cell in solver.flat_pairs.ravel().tolist()], [cell for pair in pairs for cell in pair])
+            self.assertEqual(score, naive_score(Grid.grid_from_file("input/grid15.in", read_values=True), pairs))
+
+    def test_run_flat(self):
+        "run_flat returns the pairs of run as flat indices, without building the tuples"
+        for solver_class in [SolverGreedy, SolverMinCostMatching, SolverComponents]:
+            pairs, score = solver_class(Grid.grid_from_file("input/grid15.in", read_values=True)).run()
+            solver = solver_class(Grid.grid_from_file("input/grid15.in", read_values=True))
+            flat_pairs, flat_score = solver.run_flat()
+            self.assertEqual(flat_score, score)
+            self.assertEqual(flat_pairs.tolist(), pairs_to_flat(pairs, solver.grid.m).tolist())
+            self.assertEqual(solver.pairs, pairs) # built when it is read
+
+    def test_removed(self):
+        "the cells of the pairs may already be removed, as after a solver"
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        solver = SolverGreedy(grid)
+        pairs, score = solver.run()
+        self.assertEqual(score, naive_score(Grid.grid_from_file("input/grid05.in", read_values=True), pairs))
+        self.assertEqual(solver.calc_score(pairs), score)
+
+    def test_batch_scores(self):
+        for _ in range(20):
+            n, m = np.random.randint(1, 8, size=2)
+            color = np.random.randint(0, 5, size=(n, m)).tolist()
+            value = np.random.randint(1, 10, size=(n, m)).tolist()
+            grid = Grid(n, m, color, value)
+            all_pairs = grid.all_pairs()
+            pair_sets = [SolverMinCostMatching(Grid(n, m, color, value)).run()[0], SolverGreedy(Grid(n, m, color, value)).run()[0], []]
+            pair_sets += [all_pairs[k:k + 1] for k in range(len(all_pairs))]
+            scores = Solver(grid).calc_scores(pair_sets)
+            self.assertEqual(scores.tolist(), [naive_score(grid, pairs) for pairs in pair_sets])
+        self.assertEqual(len(batch_scores(grid.value_array, grid.color_array != 4, [])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import os
+import tempfile
+import unittest 
+from code.grid import Grid
+from code.solution_cache import SolutionCache
+from code.batch_solve import solve_file
+
+class Test_SolutionCache(unittest.TestCase):
+    def test_key(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        key = SolutionCache.key(grid, "greedy")
+        self.assertEqual(SolutionCache.key(Grid.grid_from_file("input/grid05.in", read_values=True), "greedy"), key)
+        self.assertNotEqual(SolutionCache.key(grid, "min_cost_matching"), key)
+        grid.removed.append((0, 0))
+        self.assertNotEqual(SolutionCache.key(grid, "greedy"), key)
+
+    def test_solve(self):
+        cache = SolutionCache()
+        pairs, score = cache.solve(Grid.grid_from_file("input/grid05.in", read_values=True), "min_cost_matching")
+        self.assertEqual(score, 35)
+        self.assertEqual(cache.stats["misses"], 1)
+        cached_pairs, cached_score = cache.solve(Grid.grid_from_file("input/grid05.in", read_values=True), "min_cost_matching")
+        self.assertEqual((cached_pairs, cached_score), (pairs, score))
+        self.assertEqual(cache.stats["memory_hits"], 1)
+        cached_pairs.pop() # the cached solution is not modified
+        self.assertEqual(cache.solve(Grid.grid_from_file("input/grid05.in", read_values=True), "min_cost_matching")[0], pairs)
+
+    def test_disk_and_eviction(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "cache.sqlite")
+            cache = SolutionCache(path)
+            pairs, score = cache.solve(Grid.grid_from_file("input/grid17.in", read_values=True), "greedy")
+            cache.close()
+            cache = SolutionCache(path, max_bytes=16 * len(pairs))
+            self.assertEqual(cache.total_bytes, 16 * len(pairs)) # read when the database is opened
+            self.assertEqual(cache.get(Grid.grid_from_file("input/grid17.in", read_values=True), "greedy"), (pairs, score))
+            self.assertEqual(cache.stats["disk_hits"], 1)
+            # the new solution does not fit with the first one: the least recently used is evicted
+            cache.solve(Grid.grid_from_file("input/grid18.in", read_values=True), "greedy")
+            self.assertEqual(cache.stats["evictions"], 1)
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.total_bytes, cache.connection.execute("SELECT SUM(size) FROM solutions").fetchone()[0])
+            # replacing a solution does not count it twice
+            grid = Grid.grid_from_file("input/grid18.in", read_values=True)
+            total_bytes = cache.total_bytes
+            cache.put(grid, "greedy", *cache.get(grid, "greedy"))
+            self.assertEqual(cache.total_bytes, total_bytes)
+            cache.clear()
+            self.assertEqual(cache.total_bytes, 0)
+            cache.close()
+
+    def test_batch_solve(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "cache.sqlite")
+            first = solve_file("input/grid05.in", "min_cost_matching", cache_path=path)
+            second = solve_file("input/grid05.in", "min_cost_matching", cache_path=path)
+            self.assertEqual((first["cached"], second["cached"]), (False, True))
+            self.assertEqual(first["score"], second["score"])
+
+
+if __name__ == '__main__':
+    unittest.main()
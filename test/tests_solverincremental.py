@@ -0,0 +1,46 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import unittest 
+import numpy as np
+from code.grid import Grid
+from code.solver import SolverIncremental, SolverMinCostMatching
+
+class Test_SolverIncremental(unittest.TestCase):
+    def test_grids(self):
+        for file_name, score in [("input/grid01.in", 8), ("input/grid05.in", 35), ("input/grid17.in", 256), ("input/grid21.in", 1686)]:
+            grid = Grid.grid_from_file(file_name, read_values=True)
+            self.assertEqual(SolverIncremental(grid).run()[1], score)
+
+    def test_update_cells(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        solver = SolverIncremental(grid)
+        solver.run()
+        solver.update_cells([(0, 0), (1, 2)], colors=[4, 0], values=[3, 7])
+        pairs, score = solver.resolve()
+        self.assertEqual((grid.color[0][0], grid.value[1][2]), (4, 7))
+        self.assertEqual(score, SolverMinCostMatching(Grid(grid.n, grid.m, grid.color_array.copy(), grid.value_array.copy())).run()[1])
+        self.assertEqual(solver.calc_score(pairs), score)
+
+    def test_random_edits(self):
+        "compares with a full solve after each edit"
+        for _ in range(50):
+            n, m = np.random.randint(1, 8, size=2)
+            grid = Grid(n, m, np.random.randint(0, 5, size=(n, m)).tolist(), np.random.randint(1, 10, size=(n, m)).tolist())
+            solver = SolverIncremental(grid)
+            solver.run()
+            for _ in range(5):
+                cells = [(np.random.randint(n), np.random.randint(m)) for _ in range(np.random.randint(1, 4))]
+                solver.update_cells(cells, colors=np.random.randint(0, 5, size=len(cells)).tolist(), values=np.random.randint(1, 10, size=len(cells)).tolist())
+                pairs, score = solver.resolve()
+                cells = [cell for pair in pairs for cell in pair]
+                self.assertEqual(len(cells), len(set(cells)))
+                all_pairs = grid.all_pairs()
+                self.assertTrue(all(pair in all_pairs or pair[::-1] in all_pairs for pair in pairs))
+                self.assertEqual(score, SolverMinCostMatching(Grid(n, m, grid.color_array.copy(), grid.value_array.copy())).run()[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
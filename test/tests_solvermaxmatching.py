@@ -9,6 +9,7 @@ import sys
 sys.path.append("code/")
 
 import unittest 
+import numpy as np
 from code.grid import Grid
 from code.solver import SolverGreedy, SolverMaxMatching
 
@@ -58,6 +59,19 @@ class Test_SolverMaxMatching(unittest.TestCase):
         grid = Grid(4,5,[[1,2,3,0,1],[0,3,1,3,1],[0,3,4,1,4],[2,1,1,3,1]],[[1,1,1,1,1],[1,1,1,1,1],[1,1,1,1,1],[1,1,1,1,1]])
         self.assertEqual(SolverMaxMatching(grid).run()[1], 6)
     
+    def test_hopcroft_karp(self):
+        "The Hopcroft-Karp mode gives the same scores as the Ford-Fulkerson one"
+        for file_name in ["input/grid02.in", "input/grid03.in", "input/grid04.in"]:
+            grid = Grid.grid_from_file(file_name)
+            scoreFordFulkerson = SolverMaxMatching(grid).run()[1]
+            grid = Grid.grid_from_file(file_name)
+            self.assertEqual(SolverMaxMatching(grid, mode="hopcroft_karp").run()[1], scoreFordFulkerson)
+        for i in range(50):
+            n, m = np.random.randint(1, 6, size=2)
+            color = np.random.randint(0, 5, size=(n, m)).tolist()
+            scoreFordFulkerson = SolverMaxMatching(Grid(n, m, color)).run()[1]
+            self.assertEqual(SolverMaxMatching(Grid(n, m, color), mode="hopcroft_karp").run()[1], scoreFordFulkerson)
+
     def test_compare_max_matching_greedy(self):
         grid = Grid(5,3,[[1,4,4],[0,0,0],[1,0,4],[1,4,3],[0,4,0]],[[1,1,1],[1,1,1],[1,1,1],[1,1,1],[1,1,1]])
         scoreGreedy = SolverGreedy(grid).run()[1] # 2
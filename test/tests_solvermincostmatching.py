@@ -0,0 +1,54 @@
+# This will work if ran from the root folder (the folder in which there is the subfolder code/)
+# Joel Khayat and Allan Pariente
+import sys 
+sys.path.append("code/")
+
+import unittest 
+import numpy as np
+from code.grid import Grid
+from code.solver import SolverMinCostMatching, SolverHungarianScipy
+
+class Test_SolverMinCostMatching(unittest.TestCase):
+    def test_grid01(self):
+        grid = Grid.grid_from_file("input/grid01.in", read_values=True)
+        self.assertEqual(SolverMinCostMatching(grid).run()[1], 8)
+
+    def test_grid05(self):
+        grid = Grid.grid_from_file("input/grid05.in", read_values=True)
+        self.assertEqual(SolverMinCostMatching(grid).run()[1], 35)
+
+    def test_grid17(self):
+        grid = Grid.grid_from_file("input/grid17.in", read_values=True)
+        self.assertEqual(SolverMinCostMatching(grid).run()[1], 256)
+
+    def test_grid21(self):
+        grid = Grid.grid_from_file("input/grid21.in", read_values=True)
+        self.assertEqual(SolverMinCostMatching(grid).run()[1], 1686)
+
+    def test_grid25(self):
+        grid = Grid.grid_from_file("input/grid25.in", read_values=True)
+        self.assertEqual(SolverMinCostMatching(grid).run()[1], 2434)
+
+    def test_pairs(self):
+        "Each cell is used at most once, and only in allowed pairs"
+        grid = Grid.grid_from_file("input/grid19.in", read_values=True)
+        pairs, score = SolverMinCostMatching(grid).run()
+        all_pairs = grid.all_pairs()
+        cells = [cell for pair in pairs for cell in pair]
+        self.assertEqual(len(cells), len(set(cells)))
+        for (cell1, cell2) in pairs:
+            self.assertTrue((cell1, cell2) in all_pairs or (cell2, cell1) in all_pairs)
+
+    def test_random_grids(self):
+        "Brute force comparison with the scipy solver"
+        for _ in range(100):
+            n, m = np.random.randint(1, 8, size=2)
+            color = np.random.randint(0, 5, size=(n, m)).tolist()
+            value = np.random.randint(1, 10, size=(n, m)).tolist()
+            score = SolverMinCostMatching(Grid(n, m, color, value)).run()[1]
+            score_scipy = SolverHungarianScipy(Grid(n, m, color, value)).run()[1]
+            self.assertEqual(score, score_scipy)
+
+
+if __name__ == '__main__':
+    unittest.main()